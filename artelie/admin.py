@@ -1,6 +1,6 @@
 from django.contrib import admin
 from .models import Brand, Category, User, Address, Supplier, Product
-from .models import Order, OrderItem, Cart, CartItem, Review
+from .models import Order, OrderItem, Cart, CartItem, Review, OutgoingEmail
 
 
 class OrderItemInline(admin.TabularInline):
@@ -15,6 +15,15 @@ class OrderAdmin(admin.ModelAdmin):
     ordering = ('-created_at',)
     readonly_fields = ('created_at', 'updated_at')
     inlines = [OrderItemInline]
+    list_select_related = ('user',)
+
+    def get_queryset(self, request):
+        # total calculado no banco: a listagem não percorre itens/produtos
+        return super().get_queryset(request).with_total()
+
+    @admin.display(description='Total', ordering='total_amount')
+    def total_amount(self, obj):
+        return obj.total_amount
 
     def has_add_permission(self, request):
         return request.user.is_superuser
@@ -163,3 +172,21 @@ class ReviewAdmin(admin.ModelAdmin):
 
     def has_delete_permission(self, request, obj=None):
         return request.user.is_superuser
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ('id', 'to', 'subject', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('to', 'subject')
+    ordering = ('-created_at',)
+    readonly_fields = ('created_at', 'sent_at', 'attempts', 'last_error')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return request.user.is_superuser
+
+    def has_delete_permission(self, request, obj=None):
+        return request.user.is_superuser
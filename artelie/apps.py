@@ -3,3 +3,10 @@ from django.apps import AppConfig
 class ArtelieConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'artelie'
+
+    def ready(self):
+        from artelie import checks, signals  # noqa: F401
+        from artelie.mail_templates import load_email_templates
+
+        # compila os templates de email uma vez, na subida do processo
+        load_email_templates()
@@ -0,0 +1,62 @@
+import atexit
+import logging
+
+from django.utils import timezone
+
+from artelie.batching import BatchInsertBuffer
+from artelie.models import AuditEvent
+
+logger = logging.getLogger(__name__)
+
+# eventos de auditoria: INSERT em lote na tabela AuditEvent
+audit_events = BatchInsertBuffer(AuditEvent, 'AUDIT_BATCH_SIZE', 'AUDIT_FLUSH_INTERVAL')
+atexit.register(audit_events.flush)
+
+
+def field_diff(before, instance, fields):
+    """
+    {campo: [antes, depois]} dos campos que mudaram. `before` vem de
+    snapshot() do mesmo objeto já carregado, antes do save: nenhuma query.
+    """
+    changes = {}
+    for field in fields:
+        old, new = before.get(field), getattr(instance, field, None)
+        if old != new:
+            changes[field] = [old, new]
+    return changes
+
+
+def snapshot(instance, fields):
+    return {field: getattr(instance, field, None) for field in fields}
+
+
+def jsonable(value):
+    return value if isinstance(value, (str, int, float, bool, type(None))) else str(value)
+
+
+def audit(action, target, actor=None, changes=None, ip='', message=None, level=logging.INFO):
+    """
+    Registra um evento de auditoria: um registro JSON no logger
+    artelie.audit (escrito fora da requisição) e uma linha de AuditEvent
+    no lote da tabela.
+    """
+    actor_id = getattr(actor, 'pk', None) if getattr(actor, 'is_authenticated', False) else None
+    changes = {field: [jsonable(old), jsonable(new)] for field, (old, new) in (changes or {}).items()}
+    event = AuditEvent(
+        action=action,
+        actor_id=actor_id,
+        target_type=target._meta.model_name,
+        target_id=str(target.pk),
+        changes=changes,
+        ip=ip or '',
+        created_at=timezone.now(),
+    )
+    audit_events.add(event)
+    logger.log(level, message or action, extra={
+        'action': action,
+        'actor_id': str(actor_id) if actor_id else None,
+        'target': f"{event.target_type}:{event.target_id}",
+        'changes': changes,
+        'ip': ip,
+    })
+    return event
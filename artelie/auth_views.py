@@ -2,17 +2,36 @@ from django.conf import settings
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.permissions import AllowAny
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from artelie.lockout import client_ip, login_lockout
+from artelie.tokens import ArtelieTokenObtainPairSerializer, ArtelieTokenRefreshSerializer, RefreshToken
 
 
 class LoginView(APIView):
     permission_classes = [AllowAny]
 
     def post(self, request):
-        serializer = TokenObtainPairSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        email = str(request.data.get("email", "")).strip().lower()
+        ip = client_ip(request)
+        # conta ou IP com falhas demais na janela: nem tenta autenticar
+        retry_after = login_lockout.retry_after(email=email, ip=ip)
+        if retry_after:
+            return Response(
+                {"error": "Muitas tentativas de login. Tente novamente mais tarde.", "retry_after": retry_after},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={"Retry-After": str(retry_after)},
+            )
+
+        serializer = ArtelieTokenObtainPairSerializer(data=request.data)
+        try:
+            serializer.is_valid(raise_exception=True)
+        except AuthenticationFailed:
+            login_lockout.register_failure(email=email, ip=ip)
+            raise
+        login_lockout.reset(email)
         access = serializer.validated_data["access"]
         refresh = serializer.validated_data["refresh"]
         response = Response({"access": access}, status=status.HTTP_200_OK)
@@ -36,8 +55,12 @@ class RefreshView(APIView):
         raw_refresh = request.COOKIES.get(cookie_name)
         if not raw_refresh:
             return Response({"detail": "Refresh token cookie not provided."}, status=status.HTTP_401_UNAUTHORIZED)
-        serializer = TokenRefreshSerializer(data={"refresh": raw_refresh})
-        serializer.is_valid(raise_exception=True)
+        serializer = ArtelieTokenRefreshSerializer(data={"refresh": raw_refresh})
+        try:
+            serializer.is_valid(raise_exception=True)
+        except TokenError as exc:
+            # token expirado, inválido ou já usado (blacklist)
+            raise InvalidToken(exc.args[0])
         data = {"access": serializer.validated_data["access"]}
         if "refresh" in serializer.validated_data:
             new_refresh = serializer.validated_data["refresh"]
@@ -0,0 +1,98 @@
+import time
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from artelie.cache import cache_is_shared
+
+# colunas guardadas no cache; o resto (senha etc.) fica deferido e só é lido
+# do banco se alguém acessar
+SNAPSHOT_FIELDS = (
+    'id', 'username', 'email', 'full_name',
+    'is_active', 'is_staff', 'is_superuser', 'is_verified',
+    'address_id', 'profile_image_id',
+    'last_login', 'created_at', 'updated_at',
+)
+
+
+def snapshot_fields(model):
+    """SNAPSHOT_FIELDS na ordem dos campos do modelo, como Model.from_db espera."""
+    return [f.attname for f in model._meta.concrete_fields if f.attname in SNAPSHOT_FIELDS]
+
+
+def user_cache_keys(user_id, iat):
+    return f"auth:user:{user_id}:{iat}", f"auth:user:{user_id}:version"
+
+
+def new_version():
+    # aleatória, sem relógio: workers com horários diferentes não confundem
+    # versões, e uma chave despejada nunca volta a um valor antigo
+    return uuid.uuid4().hex
+
+
+def current_version(version_key):
+    """Versão atual dos dados do usuário; criada se ainda não existe."""
+    version = cache.get(version_key)
+    if version is None:
+        cache.add(version_key, new_version(), timeout=int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()))
+        version = cache.get(version_key)
+    return version
+
+
+def invalidate_cached_user(user_id):
+    """
+    Descarta os snapshots do usuário (de todos os tokens) após o commit:
+    troca a versão, e snapshots gravados com a anterior passam a ser ignorados.
+    """
+    def invalidate():
+        _, version_key = user_cache_keys(user_id, None)
+        cache.set(version_key, new_version(), timeout=int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()))
+
+    transaction.on_commit(invalidate)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication que guarda um snapshot compacto do usuário no cache,
+    por user_id + iat do token, até o token expirar. Requisições
+    autenticadas montam request.user sem o SELECT em artelie_user.
+
+    Salvar o usuário (inclusive desativar e trocar a senha) invalida os
+    snapshots (artelie.signals). A invalidação precisa chegar a todos os
+    workers: sem cache compartilhado (settings.CACHE_SHARED) o snapshot não
+    é usado e cada requisição lê o usuário do banco.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        iat = validated_token.get('iat')
+        if user_id is None or iat is None or api_settings.CHECK_REVOKE_TOKEN or not cache_is_shared():
+            # CHECK_REVOKE_TOKEN compara o hash da senha, que não vai para o cache
+            return super().get_user(validated_token)
+
+        snapshot_key, version_key = user_cache_keys(user_id, iat)
+        cached = cache.get_many([snapshot_key, version_key])
+        snapshot = cached.get(snapshot_key)
+        version = cached.get(version_key)
+        if snapshot is not None and version is not None and snapshot['version'] == version:
+            user = self.user_model.from_db('default', snapshot_fields(self.user_model), snapshot['values'])
+            if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+                raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+            return user
+
+        # lida antes do SELECT: uma invalidação concorrente troca a versão e
+        # o snapshot gravado abaixo já nasce vencido
+        version = version or current_version(version_key)
+        user = super().get_user(validated_token)
+        timeout = int(validated_token.get('exp', 0) - time.time())
+        if timeout > 0:
+            cache.set(snapshot_key, {
+                'version': version,
+                'values': [getattr(user, name) for name in snapshot_fields(self.user_model)],
+            }, timeout=timeout)
+        return user
@@ -0,0 +1,88 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+
+class BatchInsertBuffer:
+    """
+    Acumula instâncias de `model` e grava em lote: um bulk_create a cada
+    `batch_size` linhas ou `flush_interval` segundos (nomes de settings,
+    lidos a cada add para respeitar override_settings). O lote cheio é
+    gravado no commit da transação corrente, então um rollback da
+    requisição não o perde. O intervalo é cumprido por um timer (thread
+    daemon) disparado pela primeira linha do lote: um worker ocioso não
+    segura linhas na memória. As pendentes também são gravadas na saída do
+    processo (atexit, registrado por quem cria o buffer).
+    """
+
+    # todos os buffers do processo (os testes limpam entre um caso e outro)
+    instances = []
+
+    def __init__(self, model, batch_size, flush_interval):
+        self.model = model
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.timer = None
+        self.clear()
+        BatchInsertBuffer.instances.append(self)
+
+    def clear(self):
+        """Descarta o lote pendente sem gravar."""
+        with self.lock:
+            self.rows = []
+            self.first_added_at = None
+            self._cancel_timer()
+
+    def add(self, row):
+        with self.lock:
+            self.rows.append(row)
+            if self.first_added_at is None:
+                self.first_added_at = time.monotonic()
+                self._start_timer()
+            due = (
+                len(self.rows) >= getattr(settings, self.batch_size)
+                or time.monotonic() - self.first_added_at >= getattr(settings, self.flush_interval)
+            )
+        if due:
+            transaction.on_commit(self.flush)
+
+    def _start_timer(self):
+        # chamado com o lock; grava o lote mesmo se nenhum outro add chegar
+        self.timer = threading.Timer(getattr(settings, self.flush_interval), self._flush_on_timer)
+        self.timer.daemon = True
+        self.timer.start()
+
+    def _cancel_timer(self):
+        timer, self.timer = self.timer, None
+        if timer is not None:
+            timer.cancel()
+
+    def _flush_on_timer(self):
+        try:
+            self.flush()
+        finally:
+            # a thread do timer abriu a própria conexão
+            connection.close()
+
+    def flush(self):
+        """Grava o lote pendente; devolve quantas linhas foram enviadas."""
+        with self.lock:
+            rows, self.rows, self.first_added_at = self.rows, [], None
+            self._cancel_timer()
+        if not rows:
+            return 0
+        try:
+            self.model.objects.bulk_create(rows, ignore_conflicts=True)
+        except Exception as exc:
+            logger.warning(
+                f"Falha ao gravar {len(rows)} linha(s) de {self.model._meta.label}: {exc}",
+                extra={'error_type': type(exc).__name__},
+            )
+            return 0
+        return len(rows)
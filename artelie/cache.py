@@ -0,0 +1,115 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.http import parse_http_date_safe
+from rest_framework.response import Response
+
+from artelie.conditional import conditional_response
+
+VERSION_KEY = "catalog:version:{label}"
+# guardados junto com os dados para responder 304 direto do cache
+VALIDATOR_HEADERS = ('ETag', 'Last-Modified')
+
+
+def cache_is_shared():
+    """
+    True quando uma escrita no cache vale para todos os workers
+    (settings.CACHE_SHARED); invalidações dependem disso.
+    """
+    return settings.CACHE_SHARED
+
+
+def catalog_cache_enabled():
+    return cache_is_shared() or settings.DEBUG
+
+
+def _version_key(model):
+    return VERSION_KEY.format(label=model._meta.label_lower)
+
+
+def _fresh_version():
+    # nunca volta a um valor antigo, mesmo se a chave de versão for despejada
+    return time.time_ns()
+
+
+def get_catalog_versions(models):
+    """Versão atual de cada model; chaves ausentes são inicializadas."""
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _fresh_version())
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_catalog_version(model):
+    """
+    Invalida tudo que foi cacheado para o model. Roda após o commit: se
+    rodasse antes, uma leitura concorrente poderia cachear dados antigos já
+    com a versão nova.
+    """
+    def bump():
+        key = _version_key(model)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _fresh_version(), None)
+
+    transaction.on_commit(bump)
+
+
+class CatalogCacheMixin:
+    """
+    Cacheia list/retrieve para requisições anônimas.
+
+    A chave combina a URL completa (com os query params) e a versão dos
+    models em `cache_models`; salvar ou apagar qualquer um deles incrementa a
+    versão (artelie.signals), então uma edição no admin nunca devolve dado
+    velho. Usuários autenticados sempre leem do banco.
+
+    A nova versão precisa chegar a todos os workers: sem cache compartilhado
+    (settings.CACHE_SHARED) o cache fica desligado, exceto com DEBUG, em que
+    o servidor de desenvolvimento roda num processo só.
+    """
+    cache_models = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if request.method != 'GET' or request.user.is_authenticated or not catalog_cache_enabled():
+            return handler(request, *args, **kwargs)
+
+        versions = get_catalog_versions(self.cache_models)
+        # query params ordenados: ?a=1&b=2 e ?b=2&a=1 usam a mesma entrada
+        query = urlencode(sorted(request.query_params.lists()), doseq=True)
+        url = f"{request.get_host()}{request.path}?{query}"
+        digest = hashlib.sha256(url.encode()).hexdigest()
+        key = (
+            f"catalog:{self.basename}:{self.action}:{request.accepted_renderer.format}:"
+            f"{'.'.join(map(str, versions))}:{digest}"
+        )
+
+        cached = cache.get(key)
+        if cached is not None:
+            data, headers = cached
+            not_modified = conditional_response(
+                request, headers.get('ETag'), parse_http_date_safe(headers.get('Last-Modified', ''))
+            )
+            if not_modified is not None:
+                return not_modified
+            return Response(data, headers=headers)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            headers = {name: response[name] for name in VALIDATOR_HEADERS if response.has_header(name)}
+            cache.set(key, (response.data, headers), settings.CATALOG_CACHE_TIMEOUT)
+        return response
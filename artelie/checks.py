@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.checks import Warning, register  # pylint: disable=redefined-builtin
+
+
+@register()
+def shared_cache_check(app_configs, **kwargs):
+    """Avisa quando os caches que dependem de invalidação entre workers estão desligados."""
+    if settings.CACHE_SHARED or settings.DEBUG:
+        return []
+    return [
+        Warning(
+            "O cache não é compartilhado entre os workers: o cache do catálogo e o snapshot "
+            "de usuário do JWT estão desligados, e o bloqueio de login conta as falhas no banco.",
+            hint="Defina REDIS_URL (ou CACHE_SHARED=true se houver um único processo).",
+            id="artelie.W001",
+        )
+    ]
@@ -0,0 +1,201 @@
+import hashlib
+import json
+from functools import cached_property
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.response import Response
+
+PRECONDITION_HEADERS = ('HTTP_IF_MATCH', 'HTTP_IF_NONE_MATCH', 'HTTP_IF_UNMODIFIED_SINCE')
+
+
+def validator_headers(etag, last_modified=None):
+    """Cabeçalhos ETag/Last-Modified (last_modified em segundos desde a época)."""
+    headers = {'ETag': etag}
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(last_modified)
+    return headers
+
+
+def conditional_response(request, etag, last_modified=None):
+    """
+    Avalia If-Match, If-None-Match, If-Unmodified-Since e If-Modified-Since
+    (RFC 9110). Devolve 304 (GET/HEAD) ou 412 quando a requisição não deve
+    seguir, ou None para processá-la normalmente.
+    """
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        return None
+    if response.status_code == status.HTTP_304_NOT_MODIFIED:
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=validator_headers(etag, last_modified))
+    return Response(
+        {'error': 'O recurso foi alterado desde a última leitura.'},
+        status=status.HTTP_412_PRECONDITION_FAILED,
+        headers=validator_headers(etag, last_modified),
+    )
+
+
+class ConditionalRequestMixin:
+    """
+    Mixin para ModelViewSets: emite ETag (e Last-Modified no detalhe) e
+    responde 304 sem serializar quando o cliente já tem a versão atual.
+
+    O ETag vem do que já foi carregado para montar a resposta, sem queries
+    extras: no detalhe, `updated_at` do objeto; na listagem, `updated_at` e
+    pk das linhas da página mais o total e o link da próxima página (assim
+    inclusões e remoções também mudam o ETag). Anotações (ex. product_count)
+    e as relações em `etag_related` entram no carimbo de cada linha; o
+    Last-Modified do detalhe é o maior `updated_at` entre objeto e relações.
+
+    Listagens não emitem Last-Modified: uma remoção não aumenta o maior
+    updated_at, então If-Modified-Since sozinho devolveria 304 errado.
+
+    Em PUT/PATCH/DELETE, If-Match e If-None-Match funcionam como controle de
+    concorrência otimista: a linha fica travada (select_for_update) entre a
+    checagem e a gravação, e uma versão diferente devolve 412.
+
+    Models sem `conditional_field` (ex. Cart) passam direto pelo mixin.
+    """
+    conditional_field = 'updated_at'
+    # relações (select_related) cujo updated_at também aparece na resposta
+    etag_related = ()
+
+    def conditional_enabled(self):
+        try:
+            self.get_queryset().model._meta.get_field(self.conditional_field)
+        except FieldDoesNotExist:
+            return False
+        return True
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        loaded_fields, defer = queryset.query.deferred_loading
+        if (
+            loaded_fields and not defer
+            and self.action in ('list', 'retrieve')
+            and self.conditional_enabled()
+        ):
+            # querysets com .only() (SparseQuerysetMixin) precisam do updated_at
+            queryset = queryset.only(*loaded_fields, self.conditional_field)
+        return queryset
+
+    @cached_property
+    def etag_annotations(self):
+        return sorted(self.get_queryset().query.annotations)
+
+    def get_loaded_related(self, instance):
+        """Objetos de `etag_related` que já vieram no SELECT (None se a relação está vazia)."""
+        for name in self.etag_related:
+            field = instance._meta.get_field(name)
+            # relação fora da resposta não é carregada
+            if field.is_cached(instance):
+                yield field.get_cached_value(instance)
+
+    def get_etag_stamp(self, instance):
+        """Valores que, se mudarem, mudam a representação da instância."""
+        stamp = [instance.pk, getattr(instance, self.conditional_field)]
+        stamp.extend(getattr(instance, name, None) for name in self.etag_annotations)
+        for related in self.get_loaded_related(instance):
+            stamp.append(related and (related.pk, getattr(related, self.conditional_field, None)))
+        return stamp
+
+    def get_last_modified(self, instance):
+        """A versão mais recente entre a instância e as relações de `etag_related`."""
+        versions = [getattr(instance, self.conditional_field)]
+        versions.extend(
+            getattr(related, self.conditional_field, None) for related in self.get_loaded_related(instance)
+        )
+        return max(version for version in versions if version is not None)
+
+    def make_etag(self, stamp):
+        request = self.request
+        payload = json.dumps([
+            self.get_queryset().model._meta.label_lower,
+            request.user.pk,
+            request.accepted_renderer.format,
+            sorted(request.query_params.lists()),
+            stamp,
+        ], default=str)
+        return f'"{hashlib.sha1(payload.encode()).hexdigest()}"'
+
+    def get_object_validators(self, instance):
+        last_modified = self.get_last_modified(instance)
+        return self.make_etag(self.get_etag_stamp(instance)), int(last_modified.timestamp())
+
+    def list(self, request, *args, **kwargs):
+        if not self.conditional_enabled():
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        rows = list(queryset) if page is None else page
+        stamp = [self.get_etag_stamp(instance) for instance in rows]
+        if page is not None:
+            paginator_page = getattr(self.paginator, 'page', None)
+            count = paginator_page.paginator.count if paginator_page is not None else None
+            stamp.append([count, self.paginator.get_next_link()])
+        etag = self.make_etag(stamp)
+
+        not_modified = conditional_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        serializer = self.get_serializer(rows, many=True)
+        if page is None:
+            response = Response(serializer.data)
+        else:
+            response = self.get_paginated_response(serializer.data)
+        for header, value in validator_headers(etag).items():
+            response[header] = value
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.conditional_enabled():
+            return super().retrieve(request, *args, **kwargs)
+
+        instance = self.get_object()
+        etag, last_modified = self.get_object_validators(instance)
+        not_modified = conditional_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data, headers=validator_headers(etag, last_modified))
+
+    def has_preconditions(self, request):
+        return self.conditional_enabled() and any(header in request.META for header in PRECONDITION_HEADERS)
+
+    def check_preconditions(self, request):
+        instance = self.get_object()
+        # trava a linha e relê a versão: ninguém grava entre a checagem e o save
+        current = type(instance)._default_manager.select_for_update().filter(pk=instance.pk)
+        setattr(instance, self.conditional_field, current.values_list(self.conditional_field, flat=True).get())
+        return conditional_response(request, *self.get_object_validators(instance))
+
+    def update(self, request, *args, **kwargs):
+        if not self.has_preconditions(request):
+            return super().update(request, *args, **kwargs)
+
+        with transaction.atomic():
+            failed = self.check_preconditions(request)
+            if failed is not None:
+                return failed
+            response = super().update(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            # devolve a versão nova para o próximo If-Match
+            for header, value in validator_headers(*self.get_object_validators(self.get_object())).items():
+                response[header] = value
+        return response
+
+    def destroy(self, request, *args, **kwargs):
+        if not self.has_preconditions(request):
+            return super().destroy(request, *args, **kwargs)
+
+        with transaction.atomic():
+            failed = self.check_preconditions(request)
+            if failed is not None:
+                return failed
+            return super().destroy(request, *args, **kwargs)
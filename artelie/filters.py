@@ -0,0 +1,49 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F
+from rest_framework.filters import SearchFilter
+
+# configuração criada na migration 0006 (portuguese + unaccent)
+SEARCH_CONFIG = 'portuguese_unaccent'
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def build_prefix_tsquery(terms):
+    """
+    Monta um tsquery em que todos os termos são obrigatórios e o último
+    aceita prefixo, para busca enquanto o usuário digita:
+    ['pincel', 'chat'] -> 'pincel & chat:*'.
+
+    Só letras/dígitos passam, então a entrada do usuário nunca quebra a
+    sintaxe do to_tsquery.
+    """
+    words = [word for term in terms for word in _WORD_RE.findall(term)]
+    if not words:
+        return ''
+    return ' & '.join(words[:-1] + [f'{words[-1]}:*'])
+
+
+class ProductSearchFilter(SearchFilter):
+    """
+    ?search= com full-text do PostgreSQL (tsvector + índice GIN) e ranking
+    por relevância. Em outros bancos usa o SearchFilter padrão (ILIKE) sobre
+    os search_fields da view.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if connection.vendor != 'postgresql':
+            return super().filter_queryset(request, queryset, view)
+
+        raw_query = build_prefix_tsquery(self.get_search_terms(request))
+        if not raw_query:
+            return queryset
+
+        query = SearchQuery(raw_query, search_type='raw', config=SEARCH_CONFIG)
+        queryset = queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F('search_vector'), query)
+        )
+        # ?ordering= (OrderingFilter) continua tendo prioridade
+        return queryset.order_by('-search_rank', 'name', 'id')
@@ -0,0 +1,287 @@
+"""
+Importação em massa de imagens do catálogo (manage.py import_images).
+
+A origem é um diretório ou um .zip com as imagens e um manifesto CSV/JSON
+que liga cada arquivo a um produto. Validação e hash rodam em um pool de
+processos; arquivos com o mesmo conteúdo viram uma única Image, e conteúdo
+que ainda não está no storage (uploader.models.Blob) é gravado por um pool
+de threads. As linhas entram com bulk_create.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import magic
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from PIL import Image as PILImage
+
+from artelie.cache import bump_catalog_version
+from artelie.models import Product
+from uploader.helpers.files import CONTENT_TYPE_JPG, CONTENT_TYPE_PNG, SNIFF_BYTES, guess_extension
+from uploader.models import Blob, Image
+from uploader.variants import schedule_variants
+
+VALID_CONTENT_TYPES = (CONTENT_TYPE_JPG, CONTENT_TYPE_PNG)
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class ImageImportError(Exception):
+    """Manifesto ou origem inválidos; aborta a importação inteira."""
+
+
+@dataclass(frozen=True)
+class ManifestRow:
+    line: int
+    file: str
+    product_id: int
+    description: str = ""
+
+
+@dataclass(frozen=True)
+class ScannedFile:
+    file: str
+    digest: str = ""
+    content_type: str = ""
+    size: int = 0
+    error: str = ""
+
+
+def read_manifest(path):
+    """Linhas do manifesto (CSV com cabeçalho ou lista JSON) com file, product e description."""
+    try:
+        with open(path, encoding="utf-8-sig", newline="") as manifest:
+            if path.lower().endswith(".json"):
+                entries = json.load(manifest)
+            else:
+                entries = list(csv.DictReader(manifest))
+    except (OSError, ValueError) as exc:
+        raise ImageImportError(f"Manifesto ilegível: {exc}") from exc
+    if not isinstance(entries, list):
+        raise ImageImportError("O manifesto JSON deve ser uma lista de objetos.")
+
+    rows = []
+    for line, entry in enumerate(entries, start=1):
+        try:
+            rows.append(ManifestRow(
+                line=line,
+                file=str(entry["file"]).strip(),
+                product_id=int(entry["product"]),
+                description=str(entry.get("description") or "").strip()[:255],
+            ))
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ImageImportError(f"Linha {line} do manifesto inválida: precisa de file e product ({exc}).") from exc
+    return rows
+
+
+class ImageSource:
+    """Lê os arquivos de um diretório ou de um .zip pelo caminho relativo do manifesto."""
+
+    def __init__(self, path):
+        self.path = path
+        self.archive = None
+        if os.path.isfile(path) and zipfile.is_zipfile(path):
+            # ZipFile serializa as leituras internamente: pode ser lido por várias threads
+            self.archive = zipfile.ZipFile(path)
+        elif not os.path.isdir(path):
+            raise ImageImportError(f"{path} não é um diretório nem um arquivo .zip.")
+
+    def close(self):
+        if self.archive is not None:
+            self.archive.close()
+
+    def open(self, name):
+        if self.archive is not None:
+            return self.archive.open(name)
+        root = os.path.realpath(self.path)
+        full_path = os.path.realpath(os.path.join(root, name))
+        # o manifesto não pode apontar para fora da origem
+        if os.path.commonpath([root, full_path]) != root:
+            raise FileNotFoundError(name)
+        return open(full_path, "rb")
+
+    def read(self, name):
+        with self.open(name) as file:
+            return file.read()
+
+
+# uma ImageSource por processo do pool, aberta no initializer
+_worker_source = None
+
+
+def _init_worker(path):
+    global _worker_source
+    _worker_source = ImageSource(path)
+
+
+def scan_file(name, source=None):
+    """Valida e calcula o SHA-256 de um arquivo; roda nos processos do pool."""
+    source = source or _worker_source
+    try:
+        digest = hashlib.sha256()
+        size = 0
+        with source.open(name) as file:
+            header = file.read(SNIFF_BYTES)
+            content_type = magic.from_buffer(header, mime=True)
+            if content_type not in VALID_CONTENT_TYPES:
+                return ScannedFile(name, error=f"tipo não suportado ({content_type})")
+            chunk = header
+            while chunk:
+                digest.update(chunk)
+                size += len(chunk)
+                chunk = file.read(HASH_CHUNK_SIZE)
+        with source.open(name) as file, PILImage.open(file) as image:
+            image.verify()
+    except (OSError, KeyError, SyntaxError, ValueError) as exc:
+        # KeyError: membro ausente no .zip; SyntaxError/ValueError: imagem corrompida
+        return ScannedFile(name, error=f"arquivo inválido ({exc.__class__.__name__}: {exc})")
+    return ScannedFile(name, digest=digest.hexdigest(), content_type=content_type, size=size)
+
+
+def scan_files(source, names, workers, progress=None):
+    """{nome: ScannedFile}; com workers > 1 usa um pool de processos."""
+    results = {}
+    if workers <= 1:
+        scanned = (scan_file(name, source) for name in names)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(source.path,))
+        chunksize = max(1, min(64, len(names) // (workers * 4)))
+        scanned = executor.map(scan_file, names, chunksize=chunksize)
+    try:
+        for index, result in enumerate(scanned, start=1):
+            results[result.file] = result
+            if progress:
+                progress("validação", index, len(names))
+    finally:
+        if workers > 1:
+            executor.shutdown()
+    return results
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    files: int = 0
+    images_created: int = 0
+    duplicates: int = 0
+    reused: int = 0
+    products_linked: int = 0
+    errors: list = field(default_factory=list)
+
+
+def import_images(source_path, manifest_path, workers=1, batch_size=500, dry_run=False, progress=None):
+    """
+    Importa as imagens do manifesto e liga cada uma ao seu produto.
+
+    Linhas com arquivo inválido ou produto inexistente são puladas e listadas
+    em report.errors; as demais são gravadas. Com dry_run só valida.
+    """
+    rows = read_manifest(manifest_path)
+    source = ImageSource(source_path)
+    try:
+        return _import(source, rows, workers, batch_size, dry_run, progress)
+    finally:
+        source.close()
+
+
+def _import(source, rows, workers, batch_size, dry_run, progress):
+    report = ImportReport(rows=len(rows))
+
+    product_ids = {row.product_id for row in rows}
+    existing = set(Product.objects.filter(pk__in=product_ids).values_list("pk", flat=True))
+    names = list(dict.fromkeys(row.file for row in rows))
+    report.files = len(names)
+    scanned = scan_files(source, names, workers, progress)
+
+    # um Image por conteúdo; a descrição vem da primeira linha que o usa
+    by_digest = {}
+    links = {}
+    valid_files = set()
+    for row in rows:
+        result = scanned[row.file]
+        if result.error:
+            report.errors.append(f"linha {row.line} ({row.file}): {result.error}")
+            continue
+        if row.product_id not in existing:
+            report.errors.append(f"linha {row.line} ({row.file}): produto {row.product_id} não existe")
+            continue
+        valid_files.add(row.file)
+        by_digest.setdefault(result.digest, (result, row.description))
+        links[row.product_id] = result.digest
+    # arquivos diferentes com o mesmo conteúdo
+    report.duplicates = len(valid_files) - len(by_digest)
+    if dry_run:
+        return report
+
+    # conteúdo já guardado (uploads ou importações anteriores) não é regravado
+    stored = Blob.objects.in_bulk(list(by_digest), field_name="digest")
+    report.reused = len(stored)
+    new_blobs = store_blobs(source, [by_digest[digest][0] for digest in by_digest if digest not in stored],
+                            workers, progress)
+    try:
+        save_images(by_digest, stored, new_blobs, links, batch_size, report)
+    except Exception:
+        # sem as linhas no banco os arquivos gravados ficariam órfãos; um nome
+        # que um Blob já usa (storage que nomeia pelo conteúdo, como o
+        # Cloudinary, e um upload concorrente) é o arquivo dele
+        names = [blob.file.name for blob in new_blobs]
+        in_use = set(Blob.objects.filter(file__in=names).values_list("file", flat=True))
+        for name in names:
+            if name not in in_use:
+                default_storage.delete(name)
+        raise
+    return report
+
+
+def save_images(by_digest, stored, new_blobs, links, batch_size, report):
+    with transaction.atomic():
+        Blob.objects.bulk_create(new_blobs, batch_size=batch_size)
+        # cada conteúdo ganha uma Image nova, isto é, uma referência a mais
+        Blob.objects.filter(digest__in=list(stored)).update(ref_count=F("ref_count") + 1)
+        blobs = {**stored, **{blob.digest: blob for blob in new_blobs}}
+
+        images = [
+            Image(blob=blobs[digest], file=blobs[digest].file.name, description=description)
+            for digest, (_, description) in by_digest.items()
+        ]
+        Image.objects.bulk_create(images, batch_size=batch_size)
+        report.images_created = len(images)
+
+        image_by_digest = dict(zip(by_digest, images))
+        now = timezone.now()
+        products = list(Product.objects.filter(pk__in=links).only("pk"))
+        for product in products:
+            product.image = image_by_digest[links[product.pk]]
+            product.updated_at = now
+        report.products_linked = Product.objects.bulk_update(products, ["image", "updated_at"], batch_size=batch_size)
+
+        # bulk_create/bulk_update não disparam os signals do cache do catálogo
+        bump_catalog_version(Image)
+        bump_catalog_version(Product)
+        for image in images:
+            schedule_variants(image)
+
+
+def store_blobs(source, results, workers, progress=None):
+    """Grava cada conteúdo novo no storage (I/O: pool de threads) e devolve os Blob ainda não salvos."""
+    def store(result):
+        # mesmo caminho do upload_to (image_file_path): images/<digest><ext>
+        name = f"images/{result.digest}{guess_extension(result.content_type)}"
+        name = default_storage.save(name, ContentFile(source.read(result.file)))
+        return Blob(digest=result.digest, file=name, content_type=result.content_type, size=result.size, ref_count=1)
+
+    blobs = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for index, blob in enumerate(executor.map(store, results), start=1):
+            blobs.append(blob)
+            if progress:
+                progress("gravação", index, len(results))
+    return blobs
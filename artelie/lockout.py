@@ -0,0 +1,150 @@
+import hashlib
+import logging
+import math
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+
+from artelie.cache import cache_is_shared
+from artelie.models import LoginFailure
+
+logger = logging.getLogger(__name__)
+
+
+def counter_key(scope, identifier):
+    """Chave curta e sem dado pessoal: 'account:<sha256>' ou 'ip:<sha256>'."""
+    digest = hashlib.sha256(str(identifier).strip().lower().encode()).hexdigest()
+    return f"{scope}:{digest}"
+
+
+class CacheCounterStore:
+    """
+    Janela deslizante em buckets: cada falha incrementa (incr atômico) o
+    bucket do instante atual, e a contagem soma os buckets da janela.
+    """
+
+    def __init__(self, window, buckets=15):
+        self.window = window
+        self.buckets = buckets
+        self.bucket_size = window / buckets
+
+    def bucket_keys(self, key, now):
+        current = int(now // self.bucket_size)
+        return {
+            # o bucket sai da janela `window` segundos depois de começar
+            f"lockout:{key}:{bucket}": bucket * self.bucket_size + self.window
+            for bucket in range(current - self.buckets + 1, current + 1)
+        }
+
+    def hit(self, key, now):
+        bucket_key = f"lockout:{key}:{int(now // self.bucket_size)}"
+        cache.add(bucket_key, 0, timeout=math.ceil(self.window + self.bucket_size))
+        cache.incr(bucket_key)
+
+    def events(self, key, now):
+        """(instante em que a falha sai da janela, quantidade) de cada bucket."""
+        keys = self.bucket_keys(key, now)
+        counts = cache.get_many(list(keys))
+        return [(keys[bucket_key], count) for bucket_key, count in counts.items() if count]
+
+    def reset(self, key, now):
+        cache.delete_many(list(self.bucket_keys(key, now)))
+
+
+class DatabaseCounterStore:
+    """Fallback: uma linha de LoginFailure por falha, contadas pelo índice (key, created_at)."""
+
+    def __init__(self, window):
+        self.window = window
+
+    def hit(self, key, now):
+        created_at = datetime.fromtimestamp(now, tz=dt_timezone.utc)
+        # aproveita a escrita para descartar o que já saiu da janela
+        LoginFailure.objects.filter(key=key, created_at__lt=created_at - timedelta(seconds=self.window)).delete()
+        LoginFailure.objects.create(key=key, created_at=created_at)
+
+    def events(self, key, now):
+        start = datetime.fromtimestamp(now - self.window, tz=dt_timezone.utc)
+        failures = LoginFailure.objects.filter(key=key, created_at__gt=start).values_list('created_at', flat=True)
+        return [(created_at.timestamp() + self.window, 1) for created_at in failures]
+
+    def reset(self, key, now):
+        LoginFailure.objects.filter(key=key).delete()
+
+
+class LoginLockout:
+    """
+    Bloqueio de login por conta e por IP, sem escrever em artelie_user.
+
+    Uma conta com LOGIN_LOCKOUT_ACCOUNT_LIMIT falhas (ou um IP com
+    LOGIN_LOCKOUT_IP_LIMIT) dentro de LOGIN_LOCKOUT_WINDOW segundos fica
+    bloqueada até as falhas mais antigas saírem da janela. O estado vive no
+    cache; se o cache falhar, as operações caem para a tabela LoginFailure.
+    Sem cache compartilhado (settings.CACHE_SHARED) cada worker contaria
+    só as próprias falhas, multiplicando o limite: a tabela é usada direto.
+    """
+
+    def call(self, method, *args):
+        window = settings.LOGIN_LOCKOUT_WINDOW
+        if not cache_is_shared():
+            return getattr(DatabaseCounterStore(window), method)(*args)
+        try:
+            return getattr(CacheCounterStore(window), method)(*args)
+        except Exception as exc:
+            logger.warning(
+                f"Cache indisponível para o bloqueio de login, usando o banco: {exc}",
+                extra={'error_type': type(exc).__name__},
+            )
+            return getattr(DatabaseCounterStore(window), method)(*args)
+
+    def limits(self, email, ip):
+        if email:
+            yield counter_key('account', email), settings.LOGIN_LOCKOUT_ACCOUNT_LIMIT
+        if ip:
+            yield counter_key('ip', ip), settings.LOGIN_LOCKOUT_IP_LIMIT
+
+    def retry_after(self, email=None, ip=None, now=None):
+        """Segundos até poder tentar de novo; 0 quando não há bloqueio."""
+        now = now or time.time()
+        wait = 0
+        for key, limit in self.limits(email, ip):
+            events = sorted(self.call('events', key, now))
+            total = sum(count for _, count in events)
+            for expires_at, count in events:
+                if total < limit:
+                    break
+                # a falha mais antiga sai da janela em expires_at
+                total -= count
+                wait = max(wait, math.ceil(expires_at - now))
+        return wait
+
+    def is_account_locked(self, email, now=None):
+        return self.retry_after(email=email, now=now) > 0
+
+    def register_failure(self, email=None, ip=None, now=None):
+        now = now or time.time()
+        for key, _ in self.limits(email, ip):
+            self.call('hit', key, now)
+
+    def reset(self, email, now=None):
+        """Login bem-sucedido zera a conta (o contador do IP continua)."""
+        self.call('reset', counter_key('account', email), now or time.time())
+
+
+login_lockout = LoginLockout()
+
+
+def client_ip(request):
+    """
+    IP do cliente. O X-Forwarded-For só é lido atrás de settings.NUM_PROXIES
+    proxies confiáveis, na entrada que o proxy mais externo acrescentou: as
+    anteriores vêm do cliente, que trocaria de chave a cada tentativa.
+    """
+    remote_addr = request.META.get('REMOTE_ADDR', 'unknown')
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if not settings.NUM_PROXIES or not x_forwarded_for:
+        return remote_addr
+    addresses = [address.strip() for address in x_forwarded_for.split(',')]
+    return addresses[-min(settings.NUM_PROXIES, len(addresses))]
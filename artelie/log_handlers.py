@@ -0,0 +1,109 @@
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+from datetime import datetime, timezone as dt_timezone
+
+# atributos padrão do LogRecord; o resto veio de `extra` e vai para o JSON
+RESERVED_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Uma linha JSON por registro, com os campos de `extra` no topo."""
+
+    def format(self, record):
+        data = {
+            'timestamp': datetime.fromtimestamp(record.created, tz=dt_timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in RESERVED_ATTRS and not key.startswith('_'):
+                data[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data['exception'] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class SizedTimedRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
+    """
+    Rotaciona por tempo (`when`) ou quando o arquivo passa de `max_bytes`.
+    Várias rotações no mesmo intervalo ganham sufixo .1, .2... em vez de
+    sobrescrever o arquivo anterior.
+    """
+
+    def __init__(self, filename, max_bytes=0, **kwargs):
+        self.max_bytes = max_bytes
+        super().__init__(filename, **kwargs)
+
+    def shouldRollover(self, record):
+        if super().shouldRollover(record):
+            return True
+        if self.max_bytes and self.stream is not None:
+            self.stream.seek(0, os.SEEK_END)
+            return self.stream.tell() + len(self.format(record)) + 1 >= self.max_bytes
+        return False
+
+    def rotation_filename(self, default_name):
+        name, index = default_name, 0
+        while os.path.exists(name):
+            index += 1
+            name = f"{default_name}.{index}"
+        return name
+
+
+class QueuedFileHandler(logging.handlers.QueueHandler):
+    """
+    Handler para o dictConfig do LOGGING: a requisição só coloca o registro
+    numa fila; uma thread (QueueListener) formata em JSON e escreve no
+    arquivo com rotação. Com a fila cheia o registro é descartado e
+    contado em `dropped`, sem bloquear a requisição.
+    """
+
+    def __init__(self, filename, max_bytes=10 * 1024 * 1024, when='midnight', backup_count=14, queue_size=10000):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self.target = SizedTimedRotatingFileHandler(
+            filename, max_bytes=max_bytes, when=when, backupCount=backup_count, encoding='utf-8', delay=True
+        )
+        self.target.setFormatter(JsonFormatter())
+        self.dropped = 0
+        self.listener = logging.handlers.QueueListener(self.queue, self.target, respect_handler_level=True)
+        self.listener.start()
+        atexit.register(self.close)
+
+    def setFormatter(self, fmt):
+        # quem formata é a thread de escrita
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        # só resolve a mensagem e o traceback; a formatação fica para a thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self):
+        """Espera a thread escrever o que já está na fila."""
+        if self.listener._thread is not None:
+            self.queue.join()
+
+    def close(self):
+        if self.listener._thread is not None:
+            self.listener.stop()
+        self.target.close()
+        super().close()
@@ -0,0 +1,177 @@
+import logging
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from artelie.mail_templates import render_email, render_email_batch
+from artelie.models import EmailVerificationToken, OutgoingEmail
+from artelie.models.verification_token import VERIFICATION_TOKEN_LIFETIME
+
+logger = logging.getLogger(__name__)
+
+# teto do backoff entre tentativas
+MAX_RETRY_DELAY = timedelta(hours=6)
+# tempo que um lote fica reservado para o worker; se ele morrer no meio, os
+# emails voltam para a fila depois disso
+CLAIM_LEASE = timedelta(minutes=10)
+
+
+def enqueue_email(to, subject, body_text, body_html='', from_email=None):
+    """Grava o email na caixa de saída; o envio fica com send_queued_emails."""
+    return OutgoingEmail.objects.create(
+        to=to,
+        subject=subject,
+        body_text=body_text,
+        body_html=body_html,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+    )
+
+
+def retry_delay(attempts):
+    """Backoff exponencial: EMAIL_OUTBOX_RETRY_DELAY × 2^(tentativas - 1)."""
+    delay = timedelta(seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1))
+    return min(delay, MAX_RETRY_DELAY)
+
+
+def claim_batch(batch_size):
+    """
+    Reserva até `batch_size` emails vencidos. skip_locked deixa vários
+    workers drenarem a fila em paralelo sem pegar o mesmo email.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            OutgoingEmail.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                status__in=[OutgoingEmail.PENDING, OutgoingEmail.SENDING],
+                next_attempt_at__lte=now,
+            )
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        if batch:
+            OutgoingEmail.objects.filter(pk__in=[email.pk for email in batch]).update(
+                status=OutgoingEmail.SENDING, next_attempt_at=now + CLAIM_LEASE
+            )
+    return batch
+
+
+def build_message(email, connection):
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.body_text,
+        from_email=email.from_email or None,
+        to=[email.to],
+        connection=connection,
+    )
+    if email.body_html:
+        message.attach_alternative(email.body_html, 'text/html')
+    return message
+
+
+def deliver_batch(batch, max_attempts=None):
+    """
+    Envia o lote por uma única conexão SMTP. Falhas voltam para a fila com
+    backoff; depois de `max_attempts` o email fica como FALHOU.
+
+    Devolve (enviados, reagendados, falhos).
+    """
+    max_attempts = max_attempts or settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+    errors = {}
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as exc:
+        # servidor fora do ar: o lote inteiro volta para a fila
+        errors = {email.pk: exc for email in batch}
+    else:
+        try:
+            for email in batch:
+                try:
+                    connection.send_messages([build_message(email, connection)])
+                except Exception as exc:
+                    errors[email.pk] = exc
+        finally:
+            connection.close()
+
+    now = timezone.now()
+    counts = {OutgoingEmail.SENT: 0, OutgoingEmail.PENDING: 0, OutgoingEmail.FAILED: 0}
+    for email in batch:
+        email.attempts += 1
+        error = errors.get(email.pk)
+        if error is None:
+            email.status = OutgoingEmail.SENT
+            email.sent_at = now
+            email.last_error = ''
+        else:
+            email.last_error = f"{type(error).__name__}: {error}"
+            if email.attempts >= max_attempts:
+                email.status = OutgoingEmail.FAILED
+            else:
+                email.status = OutgoingEmail.PENDING
+                email.next_attempt_at = now + retry_delay(email.attempts)
+            logger.warning(
+                f"Falha ao enviar email {email.pk} para {email.to}: {email.last_error}",
+                extra={'email_id': email.pk, 'attempts': email.attempts},
+            )
+        counts[email.status] += 1
+
+    OutgoingEmail.objects.bulk_update(
+        batch, ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at']
+    )
+    return counts[OutgoingEmail.SENT], counts[OutgoingEmail.PENDING], counts[OutgoingEmail.FAILED]
+
+
+def drain_outbox(batch_size=50, max_attempts=None):
+    """Envia lotes até não sobrar email vencido. Devolve os totais de deliver_batch."""
+    totals = [0, 0, 0]
+    while True:
+        batch = claim_batch(batch_size)
+        if not batch:
+            return tuple(totals)
+        for index, count in enumerate(deliver_batch(batch, max_attempts)):
+            totals[index] += count
+
+
+def queue_templated_email(name, to, context, locale=None):
+    """Renderiza um template de artelie.mail_templates e coloca o email na fila."""
+    rendered = render_email(name, context, locale)
+    return enqueue_email(to, rendered.subject, rendered.text, rendered.html)
+
+
+def queue_templated_emails(name, recipients, locale=None):
+    """
+    Mesmo template para vários destinatários: `recipients` é uma lista de
+    (email, contexto). Um único INSERT para o lote todo.
+    """
+    recipients = list(recipients)
+    rendered = render_email_batch(name, [context for _, context in recipients], locale)
+    return OutgoingEmail.objects.bulk_create([
+        OutgoingEmail(
+            to=to,
+            subject=email.subject,
+            body_text=email.text,
+            body_html=email.html,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+        )
+        for (to, _), email in zip(recipients, rendered)
+    ])
+
+
+def queue_verification_email(user, template='verification', locale=None):
+    """Gera um novo token de verificação e coloca o email na fila."""
+    frontend_url = os.getenv('FRONTEND_URL', 'http://localhost:5173')
+
+    # token e email na mesma transação: não fica token sem email nem o contrário
+    with transaction.atomic():
+        verification_token = EmailVerificationToken.issue(user)
+        context = {
+            'user': user,
+            'verification_url': f"{frontend_url}/verify-email/{verification_token}",
+            'expires_hours': int(VERIFICATION_TOKEN_LIFETIME.total_seconds() // 3600),
+        }
+        return queue_templated_email(template, user.email, context, locale)
@@ -0,0 +1,90 @@
+import os
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.template import engines
+from django.utils import translation
+
+# emails transacionais; cada um tem subject/texto/HTML por idioma em
+# artelie/templates/emails/<idioma>/<nome>.{subject.txt,txt,html}
+EMAIL_TEMPLATE_NAMES = ('verification', 'resend_verification', 'password_changed', 'order_status')
+EMAIL_TEMPLATE_LOCALES = ('pt-br', 'en')
+TEMPLATE_SUFFIXES = {'subject': 'subject.txt', 'text': 'txt', 'html': 'html'}
+
+# templates já compilados, por (nome, idioma)
+_compiled = {}
+
+
+@dataclass(frozen=True)
+class RenderedEmail:
+    subject: str
+    text: str
+    html: str
+
+
+class EmailTemplate:
+    """Subject, texto e HTML compilados uma vez; render() só substitui variáveis."""
+
+    def __init__(self, name, locale):
+        engine = engines['django']
+        self.name = name
+        self.locale = locale
+        self.parts = {
+            part: engine.get_template(f"emails/{locale}/{name}.{suffix}")
+            for part, suffix in TEMPLATE_SUFFIXES.items()
+        }
+
+    def render(self, context):
+        context = {**base_context(), **context}
+        with translation.override(self.locale):
+            subject = self.parts['subject'].render(context)
+            return RenderedEmail(
+                # o subject não pode ter quebras de linha
+                subject=' '.join(subject.split()),
+                text=self.parts['text'].render(context).strip() + '\n',
+                html=self.parts['html'].render(context),
+            )
+
+
+def base_context():
+    return {
+        'site_name': 'Artelie',
+        'frontend_url': os.getenv('FRONTEND_URL', 'http://localhost:5173'),
+    }
+
+
+def load_email_templates():
+    """Compila todos os templates de email (chamado em ArtelieConfig.ready)."""
+    for locale in EMAIL_TEMPLATE_LOCALES:
+        for name in EMAIL_TEMPLATE_NAMES:
+            _compiled[name, locale] = EmailTemplate(name, locale)
+
+
+def resolve_locale(locale=None):
+    """'pt-BR', 'pt_br' e 'pt' caem em 'pt-br'; idioma desconhecido usa LANGUAGE_CODE."""
+    locale = (locale or translation.get_language() or settings.LANGUAGE_CODE).lower().replace('_', '-')
+    if locale in EMAIL_TEMPLATE_LOCALES:
+        return locale
+    language = locale.split('-')[0]
+    for candidate in EMAIL_TEMPLATE_LOCALES:
+        if candidate.split('-')[0] == language:
+            return candidate
+    return settings.LANGUAGE_CODE.lower()
+
+
+def get_email_template(name, locale=None):
+    locale = resolve_locale(locale)
+    key = (name, locale)
+    if key not in _compiled:
+        _compiled[key] = EmailTemplate(name, locale)
+    return _compiled[key]
+
+
+def render_email(name, context, locale=None):
+    return get_email_template(name, locale).render(context)
+
+
+def render_email_batch(name, contexts, locale=None):
+    """Renderiza o mesmo template para vários destinatários, sem recompilar nada."""
+    template = get_email_template(name, locale)
+    return [template.render(context) for context in contexts]
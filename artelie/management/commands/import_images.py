@@ -0,0 +1,61 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from artelie.image_import import ImageImportError, import_images
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa imagens de um diretório ou .zip e as liga aos produtos segundo um manifesto "
+        "CSV/JSON (colunas file, product e description opcional)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("source", help="Diretório ou arquivo .zip com as imagens.")
+        parser.add_argument("manifest", help="Manifesto .csv (com cabeçalho) ou .json (lista de objetos).")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Processos de validação/hash e threads de gravação (padrão: número de CPUs).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Linhas por INSERT/UPDATE em lote (padrão: 500).",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Só valida, sem gravar nada.")
+
+    def handle(self, *args, **options):
+        self.last_reported = {}
+        progress = self.progress if options["verbosity"] >= 1 else None
+        try:
+            report = import_images(
+                options["source"],
+                options["manifest"],
+                workers=max(1, options["workers"]),
+                batch_size=options["batch_size"],
+                dry_run=options["dry_run"],
+                progress=progress,
+            )
+        except ImageImportError as exc:
+            raise CommandError(str(exc)) from exc
+
+        for error in report.errors:
+            self.stderr.write(error)
+        prefix = "Validação concluída" if options["dry_run"] else "Importação concluída"
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}: {report.rows} linha(s), {report.files} arquivo(s), "
+            f"{report.duplicates} duplicado(s), {report.reused} já no storage, "
+            f"{report.images_created} imagem(ns) criada(s), "
+            f"{report.products_linked} produto(s) ligado(s), {len(report.errors)} erro(s)."
+        ))
+
+    def progress(self, stage, done, total):
+        # a cada 10% e no fim, para não inundar a saída em lotes grandes
+        percent = done * 100 // total
+        if done == total or percent // 10 > self.last_reported.get(stage, -1):
+            self.last_reported[stage] = percent // 10
+            self.stdout.write(f"{stage}: {done}/{total} ({percent}%)")
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+
+class Command(BaseCommand):
+    help = "Apaga em lote os refresh tokens vencidos (outstanding e blacklist)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Tokens apagados por DELETE (padrão: 5000).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        expired = OutstandingToken.objects.filter(expires_at__lte=timezone.now())
+
+        # DELETEs curtos pelo índice de expires_at (migração 0015), sem travar
+        # as tabelas inteiras; a blacklist sai antes de cada lote
+        deleted = blacklisted = 0
+        while True:
+            ids = list(expired.order_by("expires_at").values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                break
+            blacklisted += BlacklistedToken.objects.filter(token_id__in=ids).delete()[0]
+            deleted += OutstandingToken.objects.filter(pk__in=ids).delete()[0]
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Refresh tokens removidos: {deleted} (na blacklist: {blacklisted})."
+        ))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from artelie.models import EmailVerificationToken
+
+
+class Command(BaseCommand):
+    help = "Apaga em lote os tokens de verificação de email vencidos."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Tokens apagados por DELETE (padrão: 5000).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        now = timezone.now()
+        expired = EmailVerificationToken.objects.filter(expires_at__lte=now)
+
+        # DELETEs curtos pelo índice de expires_at, sem travar a tabela inteira
+        deleted = 0
+        while True:
+            ids = list(expired.order_by("expires_at").values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                break
+            deleted += EmailVerificationToken.objects.filter(pk__in=ids).delete()[0]
+
+        self.stdout.write(self.style.SUCCESS(f"Tokens de verificação removidos: {deleted}."))
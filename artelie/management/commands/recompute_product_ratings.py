@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from artelie.cache import bump_catalog_version
+from artelie.models import Product, Review
+from artelie.models.review import rating_aggregates
+
+
+class Command(BaseCommand):
+    help = "Recalcula rating_avg, rating_count e o histograma de estrelas de todos os produtos."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Quantidade de produtos atualizados por UPDATE em lote (padrão: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        aggregates = rating_aggregates()
+        fields = list(aggregates) + ["updated_at"]
+
+        # uma única query agrupada para todas as avaliações
+        stats = {
+            row.pop("product_id"): row
+            for row in Review.objects.order_by().values("product_id").annotate(**aggregates)
+        }
+        empty = {name: 0 for name in aggregates}
+
+        now = timezone.now()
+        updated = 0
+        batch = []
+        products = Product.objects.only("id", *aggregates).order_by("pk").iterator(chunk_size=batch_size)
+        with transaction.atomic():
+            for product in products:
+                values = stats.get(product.pk, empty)
+                changed = False
+                for name in aggregates:
+                    # to_python arredonda a média para as casas do DecimalField
+                    value = Product._meta.get_field(name).to_python(values[name] or 0)
+                    if getattr(product, name) != value:
+                        setattr(product, name, value)
+                        changed = True
+                if not changed:
+                    continue
+                product.updated_at = now
+                batch.append(product)
+                if len(batch) >= batch_size:
+                    updated += Product.objects.bulk_update(batch, fields)
+                    batch = []
+            if batch:
+                updated += Product.objects.bulk_update(batch, fields)
+            if updated:
+                bump_catalog_version(Product)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Avaliações recalculadas: {updated} produto(s) atualizado(s), "
+            f"{len(stats)} com avaliações."
+        ))
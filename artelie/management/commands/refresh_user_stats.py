@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from artelie.stats import refresh_user_stats
+
+
+class Command(BaseCommand):
+    help = "Recalcula o snapshot de estatísticas de usuários do painel de admin."
+
+    def handle(self, *args, **options):
+        snapshot = refresh_user_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f"Estatísticas atualizadas: {snapshot.total_users} usuário(s), "
+            f"{snapshot.users_today} cadastrado(s) hoje."
+        ))
@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from artelie.mail import drain_outbox
+
+
+class Command(BaseCommand):
+    help = "Envia os emails da caixa de saída em lotes, com retentativas e backoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50,
+            help="Emails enviados por conexão SMTP (padrão: 50).",
+        )
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=None,
+            help="Tentativas antes de marcar o email como falho (padrão: EMAIL_OUTBOX_MAX_ATTEMPTS).",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Continua rodando e verifica a fila a cada --interval segundos.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Intervalo entre verificações da fila com --loop (padrão: 5).",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, retried, failed = drain_outbox(options["batch_size"], options["max_attempts"])
+            if sent or retried or failed or not options["loop"]:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Caixa de saída: {sent} enviado(s), {retried} reagendado(s), {failed} falho(s)."
+                ))
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:52
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# A busca full-text só existe no PostgreSQL. Em outros bancos (SQLite no
+# desenvolvimento e nos testes) a coluna é criada mas fica sempre vazia.
+FORWARD_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'portuguese_unaccent') THEN
+            CREATE TEXT SEARCH CONFIGURATION portuguese_unaccent (COPY = portuguese);
+            ALTER TEXT SEARCH CONFIGURATION portuguese_unaccent
+                ALTER MAPPING FOR hword, hword_part, word WITH unaccent, portuguese_stem;
+        END IF;
+    END
+    $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION artelie_product_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('portuguese_unaccent', coalesce(NEW.name, '')), 'A') ||
+            setweight(to_tsvector('portuguese_unaccent', coalesce(NEW.description, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER artelie_product_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF name, description ON artelie_product
+        FOR EACH ROW EXECUTE FUNCTION artelie_product_search_vector_update()
+    """,
+    # preenche as linhas existentes (o trigger dispara no UPDATE de name)
+    "UPDATE artelie_product SET name = name",
+    "CREATE INDEX artelie_product_search_vector_gin ON artelie_product USING gin (search_vector)",
+]
+
+REVERSE_SQL = [
+    "DROP INDEX IF EXISTS artelie_product_search_vector_gin",
+    "DROP TRIGGER IF EXISTS artelie_product_search_vector_trigger ON artelie_product",
+    "DROP FUNCTION IF EXISTS artelie_product_search_vector_update()",
+]
+
+
+def create_search_infrastructure(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for statement in FORWARD_SQL:
+        schema_editor.execute(statement)
+
+
+def drop_search_infrastructure(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for statement in REVERSE_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artelie', '0005_brand_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_infrastructure, drop_search_infrastructure),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:55
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def snapshot_current_prices(apps, schema_editor):
+    """Grava nos itens existentes o preço atual do produto."""
+    OrderItem = apps.get_model('artelie', 'OrderItem')
+    Product = apps.get_model('artelie', 'Product')
+    price = Product.objects.filter(pk=OuterRef('product_id')).values('price')[:1]
+    OrderItem.objects.filter(unit_price__isnull=True).update(unit_price=Subquery(price))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artelie', '0008_product_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orderitem',
+            name='unit_price',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.RunPython(snapshot_current_prices, migrations.RunPython.noop),
+    ]
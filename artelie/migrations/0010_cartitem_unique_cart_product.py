@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:59
+
+from django.db import migrations, models
+from django.db.models import Count, Min, Sum
+
+
+def merge_duplicate_items(apps, schema_editor):
+    """Junta linhas repetidas do mesmo produto no carrinho somando as quantidades."""
+    CartItem = apps.get_model('artelie', 'CartItem')
+    duplicates = (
+        CartItem.objects.order_by()
+        .values('cart_id', 'product_id')
+        .annotate(rows=Count('id'), keep=Min('id'), total=Sum('quantity'))
+        .filter(rows__gt=1)
+    )
+    for row in duplicates:
+        items = CartItem.objects.filter(cart_id=row['cart_id'], product_id=row['product_id'])
+        items.exclude(pk=row['keep']).delete()
+        items.filter(pk=row['keep']).update(quantity=row['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artelie', '0009_orderitem_unit_price'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_items, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='cartitem',
+            constraint=models.UniqueConstraint(fields=('cart', 'product'), name='unique_cart_product'),
+        ),
+    ]
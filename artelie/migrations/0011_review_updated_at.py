@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:04
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def copy_created_at(apps, schema_editor):
+    """Avaliações existentes: a última alteração conhecida é a criação."""
+    Review = apps.get_model('artelie', 'Review')
+    Review.objects.update(updated_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artelie', '0010_cartitem_unique_cart_product'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(copy_created_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:09
+
+import hashlib
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def move_pending_tokens(apps, schema_editor):
+    """Leva os tokens ainda válidos de User para a tabela nova, já com hash."""
+    User = apps.get_model('artelie', 'User')
+    EmailVerificationToken = apps.get_model('artelie', 'EmailVerificationToken')
+    cutoff = timezone.now() - timedelta(hours=24)
+    pending = User.objects.filter(
+        verification_token__isnull=False,
+        verification_token_created_at__gt=cutoff,
+    ).values_list('pk', 'verification_token', 'verification_token_created_at')
+    EmailVerificationToken.objects.bulk_create([
+        EmailVerificationToken(
+            user_id=user_id,
+            token_hash=hashlib.sha256(token.encode()).hexdigest(),
+            expires_at=created_at + timedelta(hours=24),
+        )
+        for user_id, token, created_at in pending.iterator()
+        if token
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artelie', '0012_outgoing_email'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailVerificationToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token_hash', models.CharField(max_length=64, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='verification_tokens', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.RunPython(move_pending_tokens, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='user',
+            name='verification_token',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='verification_token_created_at',
+        ),
+    ]
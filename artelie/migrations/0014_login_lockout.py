@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artelie', '0013_email_verification_token'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='user',
+            name='failed_login_attempts',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='locked_until',
+        ),
+        migrations.CreateModel(
+            name='LoginFailure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=80)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['key', 'created_at'], name='artelie_log_key_f618de_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Índice em expires_at da tabela do token_blacklist (simplejwt), para o
+    prune_tokens apagar os vencidos em lote sem varrer a tabela.
+    """
+
+    dependencies = [
+        ('artelie', '0014_login_lockout'),
+        ('token_blacklist', '0013_alter_blacklistedtoken_options_and_more'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX IF NOT EXISTS artelie_outstandingtoken_expires_idx '
+            'ON token_blacklist_outstandingtoken (expires_at)',
+            'DROP INDEX IF EXISTS artelie_outstandingtoken_expires_idx',
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artelie', '0015_outstanding_token_expires_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStatsSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_users', models.PositiveIntegerField(default=0)),
+                ('active_users', models.PositiveIntegerField(default=0)),
+                ('verified_users', models.PositiveIntegerField(default=0)),
+                ('staff_users', models.PositiveIntegerField(default=0)),
+                ('users_today', models.PositiveIntegerField(default=0)),
+                ('daily_signups', models.JSONField(default=list)),
+                ('weekly_signups', models.JSONField(default=list)),
+                ('computed_at', models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:19
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artelie', '0016_user_stats_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.CharField(max_length=50)),
+                ('actor_id', models.UUIDField(blank=True, null=True)),
+                ('target_type', models.CharField(max_length=50)),
+                ('target_id', models.CharField(max_length=64)),
+                ('changes', models.JSONField(blank=True, default=dict)),
+                ('ip', models.CharField(blank=True, max_length=45)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['target_type', 'target_id', 'created_at'], name='artelie_aud_target__202afa_idx'), models.Index(fields=['action', 'created_at'], name='artelie_aud_action_739569_idx')],
+            },
+        ),
+    ]
@@ -11,4 +11,9 @@ from .supplier import Supplier
 from .product import Product
 from .order import Order, OrderItem
 from .cart import Cart, CartItem
-from .review import Review
\ No newline at end of file
+from .review import Review
+from .email import OutgoingEmail
+from .verification_token import EmailVerificationToken
+from .login_failure import LoginFailure
+from .user_stats import UserStatsSnapshot
+from .audit_event import AuditEvent
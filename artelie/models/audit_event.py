@@ -0,0 +1,26 @@
+from django.db import models
+from django.utils import timezone
+
+
+class AuditEvent(models.Model):
+    """
+    Evento de auditoria (criação, alteração, desativação de conta...),
+    gravado em lote por artelie.audit. `changes` guarda {campo: [antes, depois]}.
+    """
+    action = models.CharField(max_length=50)
+    actor_id = models.UUIDField(null=True, blank=True)
+    target_type = models.CharField(max_length=50)
+    target_id = models.CharField(max_length=64)
+    changes = models.JSONField(default=dict, blank=True)
+    ip = models.CharField(max_length=45, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['target_type', 'target_id', 'created_at']),
+            models.Index(fields=['action', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.action} {self.target_type}:{self.target_id} em {self.created_at:%d/%m/%Y %H:%M:%S}"
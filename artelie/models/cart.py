@@ -1,5 +1,21 @@
-from django.db import models
-from artelie.models import User, Product
+from collections import Counter
+
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
+from artelie.cache import bump_catalog_version
+from artelie.models import User, Product, Order, OrderItem
+
+
+class CheckoutError(Exception):
+    """Carrinho não pode virar pedido (vazio ou sem estoque)."""
+
+
+class OutOfStockError(CheckoutError):
+    def __init__(self, product):
+        self.product = product
+        super().__init__(f"Estoque insuficiente para {product.name}.")
+
 
 class Cart(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='cart')
@@ -8,10 +24,69 @@ class Cart(models.Model):
     def __str__(self):
         return f"Carrinho de {self.user.username}"
 
+    def checkout(self):
+        """
+        Converte o carrinho em um pedido numa única transação.
+
+        - trava o carrinho (evita finalizar o mesmo carrinho duas vezes) e
+          depois os produtos em ordem de id, para que compras concorrentes
+          sempre travem na mesma ordem e nunca entrem em deadlock;
+        - baixa o estoque com UPDATE condicional (stock >= quantidade), então
+          o estoque nunca fica negativo;
+        - cria os itens com bulk_create, gravando o preço atual, e esvazia o
+          carrinho.
+
+        Levanta CheckoutError/OutOfStockError; nesse caso nada é alterado.
+        """
+        with transaction.atomic():
+            Cart.objects.select_for_update().filter(pk=self.pk).values_list('pk').get()
+            quantities = Counter()
+            for product_id, quantity in self.items.values_list('product_id', 'quantity'):
+                quantities[product_id] += quantity
+            if not quantities:
+                raise CheckoutError("Carrinho vazio.")
+
+            products = Product.objects.select_for_update().filter(pk__in=quantities).order_by('pk')
+            products = {product.pk: product for product in products.only('id', 'name', 'price', 'stock')}
+
+            now = timezone.now()
+            for product_id in sorted(quantities):
+                updated = Product.objects.filter(
+                    pk=product_id, stock__gte=quantities[product_id]
+                ).update(stock=F('stock') - quantities[product_id], updated_at=now)
+                if not updated:
+                    raise OutOfStockError(products[product_id])
+
+            order = Order.objects.create(user=self.user)
+            OrderItem.objects.bulk_create([
+                OrderItem(
+                    order=order,
+                    product_id=product_id,
+                    quantity=quantity,
+                    unit_price=products[product_id].price,
+                )
+                for product_id, quantity in sorted(quantities.items())
+            ])
+            self.items.all().delete()
+            # a baixa de estoque usa update(), que não dispara signals
+            bump_catalog_version(Product)
+
+        order.total_amount = sum(
+            products[product_id].price * quantity for product_id, quantity in quantities.items()
+        )
+        return order
+
+
 class CartItem(models.Model):
     cart = models.ForeignKey(Cart, related_name='items', on_delete=models.CASCADE)
     product = models.ForeignKey(Product, on_delete=models.PROTECT)
     quantity = models.PositiveIntegerField(default=1)
 
+    class Meta:
+        constraints = [
+            # uma linha por produto no carrinho; permite upsert em lote
+            models.UniqueConstraint(fields=['cart', 'product'], name='unique_cart_product'),
+        ]
+
     def __str__(self):
-        return f"{self.quantity} x {self.product.name} (Carrinho de {self.cart.user.username})"
\ No newline at end of file
+        return f"{self.quantity} x {self.product.name} (Carrinho de {self.cart.user.username})"
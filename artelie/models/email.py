@@ -0,0 +1,43 @@
+from django.db import models
+from django.utils import timezone
+
+
+class OutgoingEmail(models.Model):
+    """
+    Caixa de saída: emails gravados na mesma transação da requisição e
+    enviados depois pelo comando send_queued_emails (ver artelie.mail).
+    """
+    PENDING = 'PENDENTE'
+    SENDING = 'ENVIANDO'
+    SENT = 'ENVIADO'
+    FAILED = 'FALHOU'
+
+    to = models.EmailField(max_length=254)
+    from_email = models.CharField(max_length=254, blank=True)
+    subject = models.CharField(max_length=255)
+    body_text = models.TextField()
+    body_html = models.TextField(blank=True)
+    status = models.CharField(
+        max_length=10,
+        choices=[
+            (PENDING, 'Pendente'),
+            (SENDING, 'Enviando'),
+            (SENT, 'Enviado'),
+            (FAILED, 'Falhou'),
+        ],
+        default=PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # próxima tentativa; enquanto ENVIANDO, é o fim do lease do worker
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} → {self.to} ({self.status})"
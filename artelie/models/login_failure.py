@@ -0,0 +1,20 @@
+from django.db import models
+from django.utils import timezone
+
+
+class LoginFailure(models.Model):
+    """
+    Falhas de login recentes, usadas só quando o cache está fora do ar
+    (ver artelie.lockout). Cada falha é um INSERT: nenhuma linha é
+    disputada por requisições concorrentes.
+    """
+    key = models.CharField(max_length=80)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['key', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.key} em {self.created_at:%d/%m/%Y %H:%M:%S}"
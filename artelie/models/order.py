@@ -1,6 +1,36 @@
+from decimal import Decimal
+
 from django.db import models
+from django.db.models import DEFERRED
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from artelie.models import User, Product
 
+TOTAL_FIELD = DecimalField(max_digits=12, decimal_places=2)
+
+
+def line_total():
+    """quantidade x preço do item: usa o preço gravado e cai no preço atual se não houver."""
+    return F('quantity') * Coalesce(F('unit_price'), F('product__price'))
+
+
+class OrderQuerySet(models.QuerySet):
+    def with_total(self):
+        """
+        Anota total_amount calculado no banco (um subselect por pedido),
+        sem carregar itens nem produtos em Python.
+        """
+        totals = (
+            OrderItem.objects.filter(order=OuterRef('pk'))
+            .order_by()
+            .values('order')
+            .annotate(total=Sum(line_total(), output_field=TOTAL_FIELD))
+            .values('total')
+        )
+        return self.annotate(
+            total_amount=Coalesce(Subquery(totals, output_field=TOTAL_FIELD), Value(Decimal('0.00')))
+        )
+
 
 class Order(models.Model):
     user = models.ForeignKey(User, on_delete=models.PROTECT)
@@ -18,19 +48,50 @@ class Order(models.Model):
         default='PENDENTE'
     )
 
+    objects = OrderQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', 'id']),
+        ]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # status carregado do banco, para avisar o cliente quando ele mudar;
+        # lido do __dict__: num .only() sem status, ler o campo faria uma query
+        # por instância (o signal busca o valor só se o status for salvo)
+        self._loaded_status = self.__dict__.get('status', DEFERRED)
+
     def __str__(self):
         return f"Order {self.id} by {self.user.username}"
 
     @property
     def total_amount(self):
-        """Soma o preço total dos itens do pedido"""
-        return sum(item.product.price * item.quantity for item in self.items.all())
+        """
+        Soma o preço total dos itens do pedido.
+        Vem pronto de Order.objects.with_total(); fora dele custa uma agregação.
+        """
+        if getattr(self, '_total_amount', None) is None:
+            total = self.items.aggregate(total=Sum(line_total(), output_field=TOTAL_FIELD))['total']
+            self._total_amount = total or Decimal('0.00')
+        return self._total_amount
+
+    @total_amount.setter
+    def total_amount(self, value):
+        self._total_amount = value
 
 
 class OrderItem(models.Model):
     order = models.ForeignKey(Order, related_name='items', on_delete=models.CASCADE)
     product = models.ForeignKey(Product, on_delete=models.PROTECT)
     quantity = models.PositiveIntegerField()
+    # preço do produto no momento da compra; o total não muda se o preço mudar depois
+    unit_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
 
     def __str__(self):
         return f"{self.quantity} x {self.product.name} (Order {self.order.id})"
+
+    def save(self, *args, **kwargs):
+        if self.unit_price is None and self.product_id:
+            self.unit_price = self.product.price
+        super().save(*args, **kwargs)
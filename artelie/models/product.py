@@ -1,3 +1,4 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from artelie.models import Category, Brand, Supplier
 from uploader.models import Image
@@ -20,6 +21,19 @@ class Product(models.Model):
         blank=True,
         default=None,
     )
+    # mantido por trigger no PostgreSQL (nome peso A, descrição peso B);
+    # fica vazio em outros bancos, onde a busca cai no ILIKE
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    # agregados de avaliação mantidos pelas escritas em Review (artelie.signals);
+    # recalcule em massa com `manage.py recompute_product_ratings`
+    rating_avg = models.DecimalField(max_digits=3, decimal_places=2, default=0, editable=False)
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_1_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_2_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_3_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_4_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_5_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.name
@@ -27,7 +41,8 @@ class Product(models.Model):
     class Meta:
         ordering = ['name']
         indexes = [
-            models.Index(fields=['name']),
+            models.Index(fields=['name', 'id']),
             models.Index(fields=['category']),
             models.Index(fields=['brand']),
+            models.Index(fields=['-rating_avg', 'id']),
         ]
@@ -1,15 +1,65 @@
-from django.db import models
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models, transaction
+from django.db.models import DEFERRED, Avg, Count, Q
+from django.utils import timezone
+from artelie.cache import bump_catalog_version
 from artelie.models import Product, User
 
+RATING_VALUES = range(1, 6)
+
+
+def rating_aggregates():
+    """Agregações que alimentam os campos desnormalizados de avaliação do Product."""
+    aggregates = {
+        'rating_count': Count('id'),
+        'rating_avg': Avg('rating'),
+    }
+    for stars in RATING_VALUES:
+        aggregates[f'rating_{stars}_count'] = Count('id', filter=Q(rating=stars))
+    return aggregates
+
+
+def update_product_rating(product_id):
+    """
+    Recalcula média, total e histograma de avaliações de um produto.
+
+    Trava a linha do produto antes de agregar: escritas concorrentes no mesmo
+    produto são serializadas e a última sempre enxerga todas as avaliações.
+    Deve rodar dentro da transação da escrita da avaliação.
+    """
+    list(Product.objects.select_for_update().filter(pk=product_id).values_list('pk'))
+    values = Review.objects.filter(product_id=product_id).aggregate(**rating_aggregates())
+    values['rating_avg'] = values['rating_avg'] or 0
+    Product.objects.filter(pk=product_id).update(updated_at=timezone.now(), **values)
+    # update() não dispara signals: invalida o cache do catálogo aqui
+    bump_catalog_version(Product)
+
+
 class Review(models.Model):
     product = models.ForeignKey(Product, related_name='reviews', on_delete=models.CASCADE)
     user = models.ForeignKey(User, related_name='reviews', on_delete=models.CASCADE)
-    rating = models.PositiveIntegerField()
+    rating = models.PositiveIntegerField(validators=[MinValueValidator(1), MaxValueValidator(5)])
     comment = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ('product', 'user')  #um usuário só pode avaliar um produto uma vez
+        indexes = [
+            models.Index(fields=['-created_at', 'id']),
+        ]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # produto original, para recalcular os dois lados se a avaliação mudar de produto;
+        # lido do __dict__ para não custar uma query por linha num .only() sem o produto
+        self._loaded_product_id = self.__dict__.get('product_id', DEFERRED)
 
     def __str__(self):
-        return f"{self.user.username} avaliou {self.product.name} ({self.rating} estrelas)"
\ No newline at end of file
+        return f"{self.user.username} avaliou {self.product.name} ({self.rating} estrelas)"
+
+    def save(self, *args, **kwargs):
+        """Salva e atualiza os agregados do produto na mesma transação (ver artelie.signals)."""
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+        self._loaded_product_id = self.__dict__.get('product_id', DEFERRED)
@@ -1,8 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
 from django.core.validators import RegexValidator
-from django.utils import timezone
-from datetime import timedelta
 import uuid
 from .address import Address
 from uploader.models import Image
@@ -77,14 +75,6 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_verified = models.BooleanField(default=False, help_text="Indica se o email do usuário foi verificado.")
 
 
-    #campo de verificação de email
-    verification_token = models.CharField(max_length=100, blank=True, null=True, help_text="Token para verificação de email.")
-    verification_token_created_at = models.DateTimeField(null=True, blank=True, help_text="Data e hora de criação do token de verificação.")
-
-    #segurança
-    failed_login_attempts = models.PositiveIntegerField(default=0, help_text="Número de tentativas de login falhas.")
-    locked_until = models.DateTimeField(null=True, blank=True, help_text="Data e hora até a qual o usuário está bloqueado.")
-
     #relacionamento com endereço
     address = models.OneToOneField(Address, on_delete=models.PROTECT, null=True, blank=True, related_name='user')
 
@@ -130,35 +120,20 @@ class User(AbstractBaseUser, PermissionsMixin):
         self.clean()
         super().save(*args, **kwargs)
 
-    def is_verification_token_valid(self):
-        """Vereifica se o token de verificação ainda é válido (24 horas)"""
-        if not self.verification_token_created_at:
-            return False
-        expiration_time = self.verification_token_created_at + timedelta(hours=24)
-        return timezone.now() < expiration_time
-    
-
     def is_account_locked(self):
-        """Verifica se a conta está bloqueada por tentativas excessivas de login"""
-        if self.locked_until:
-            return timezone.now() < self.locked_until
-        return False
+        """Verifica se a conta está bloqueada por tentativas excessivas de login (artelie.lockout)"""
+        from artelie.lockout import login_lockout
+        return login_lockout.is_account_locked(self.email)
     
     def reset_failed_logins(self):
-        """Reseta o contador de tentativas falhas de login"""
-        self.failed_login_attempts = 0
-        self.locked_until = None
-        self.save(update_fields=['failed_login_attempts', 'locked_until'])
+        """Zera as tentativas falhas de login, sem escrever na linha do usuário"""
+        from artelie.lockout import login_lockout
+        login_lockout.reset(self.email)
 
     def increment_failed_attempts(self):
-        """contador de tentativas falhas de login e bloqueia a conta se necessário"""
-        self.failed_login_attempts += 1
-
-        #bloqueia a conta por 15 minutos após 5 tentativas falhas
-        if self.failed_login_attempts >= 5:
-            self.locked_until = timezone.now() + timedelta(minutes=15)
-
-        self.save(update_fields=['failed_login_attempts', 'locked_until'])
+        """Registra uma tentativa falha de login; o bloqueio vem da janela em artelie.lockout"""
+        from artelie.lockout import login_lockout
+        login_lockout.register_failure(self.email)
 
     def get_full_name(self):
         """Retorna o nome completo do usuário."""
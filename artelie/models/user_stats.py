@@ -0,0 +1,21 @@
+from django.db import models
+
+
+class UserStatsSnapshot(models.Model):
+    """
+    Estatísticas de usuários pré-calculadas para o painel de admin (uma
+    linha só, pk=1). Atualizada por refresh_user_stats ou pelo próprio
+    endpoint quando passa de USER_STATS_MAX_AGE (ver artelie.stats).
+    """
+    total_users = models.PositiveIntegerField(default=0)
+    active_users = models.PositiveIntegerField(default=0)
+    verified_users = models.PositiveIntegerField(default=0)
+    staff_users = models.PositiveIntegerField(default=0)
+    users_today = models.PositiveIntegerField(default=0)
+    # [{'date': 'AAAA-MM-DD', 'count': n}, ...], do mais antigo ao mais recente
+    daily_signups = models.JSONField(default=list)
+    weekly_signups = models.JSONField(default=list)
+    computed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"Estatísticas de usuários em {self.computed_at:%d/%m/%Y %H:%M}"
@@ -0,0 +1,48 @@
+import hashlib
+import secrets
+from datetime import timedelta
+
+from django.db import models, transaction
+from django.utils import timezone
+from artelie.models import User
+
+# validade do link de verificação
+VERIFICATION_TOKEN_LIFETIME = timedelta(hours=24)
+
+
+def hash_token(token):
+    """Só o SHA-256 vai para o banco: um dump da tabela não ativa contas."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class EmailVerificationToken(models.Model):
+    """
+    Token de verificação de email. A busca é pelo hash num índice único
+    (O(log n) e sem comparar o token em si); tokens vencidos são apagados em
+    lote por purge_verification_tokens.
+    """
+    user = models.ForeignKey(User, related_name='verification_tokens', on_delete=models.CASCADE)
+    token_hash = models.CharField(max_length=64, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"Token de {self.user_id} (expira em {self.expires_at:%d/%m/%Y %H:%M})"
+
+    @property
+    def is_expired(self):
+        return self.expires_at <= timezone.now()
+
+    @classmethod
+    def issue(cls, user, lifetime=VERIFICATION_TOKEN_LIFETIME):
+        """Cria um token novo para o usuário, invalida os anteriores e devolve o token em texto."""
+        token = secrets.token_urlsafe(32)
+        with transaction.atomic():
+            cls.objects.filter(user=user).delete()
+            cls.objects.create(user=user, token_hash=hash_token(token), expires_at=timezone.now() + lifetime)
+        return token
+
+    @classmethod
+    def lookup(cls, token):
+        """Token correspondente (com o usuário) ou DoesNotExist."""
+        return cls.objects.select_related('user').get(token_hash=hash_token(token))
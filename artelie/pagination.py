@@ -1,4 +1,100 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginação por cursor (keyset): a próxima página é buscada com
+    WHERE (chave) > (última chave vista), sem COUNT(*) e sem OFFSET, então o
+    custo é o mesmo na primeira e na milésima página.
+
+    A ordenação vem de `keyset_ordering` da view, ex. ('name', 'id') ou
+    ('-created_at', 'id'); o último campo precisa ser único. Só avança
+    (ideal para scroll infinito e exportações) e ignora ?ordering=.
+    """
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Cursor inválido."
+
+    def __init__(self, page_size, ordering):
+        self.page_size = page_size
+        self.keys = [(name.lstrip("-"), name.startswith("-")) for name in ordering]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.model = queryset.model
+        ordering = [f"-{name}" if descending else name for name, descending in self.keys]
+        queryset = queryset.order_by(*ordering)
+        loaded_fields, defer = queryset.query.deferred_loading
+        if loaded_fields and not defer:
+            # querysets com .only() precisam carregar as chaves do cursor
+            queryset = queryset.only(*loaded_fields, *self.key_names)
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded:
+            queryset = queryset.filter(self.after(self.decode_cursor(encoded)))
+
+        # um registro a mais indica se existe próxima página
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def after(self, values):
+        """(a, b) > (va, vb) expandido em OR/AND respeitando a direção de cada campo."""
+        condition = Q()
+        for index, (name, descending) in enumerate(self.keys):
+            clause = Q(**{f"{name}__{'lt' if descending else 'gt'}": values[index]})
+            for previous_index, (previous_name, _) in enumerate(self.keys[:index]):
+                clause &= Q(**{previous_name: values[previous_index]})
+            condition |= clause
+        return condition
+
+    @property
+    def key_names(self):
+        return [name for name, _ in self.keys]
+
+    def encode_cursor(self, instance):
+        values = [self.model._meta.get_field(name).value_to_string(instance) for name in self.key_names]
+        token = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, token)
+
+    def decode_cursor(self, encoded):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            if not isinstance(values, list) or len(values) != len(self.keys):
+                raise ValueError
+            return [
+                self.model._meta.get_field(name).to_python(value)
+                for name, value in zip(self.key_names, values)
+            ]
+        except (TypeError, ValueError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.page[-1])
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
 
 
 class DefaultPagination(PageNumberPagination):
@@ -8,3 +104,37 @@ class DefaultPagination(PageNumberPagination):
     page_size_query_param = "page_size"
     # limite máximo para não sobrecarregar o servidor
     max_page_size = 150
+    # ?pagination=cursor (ou ?cursor=...) troca para KeysetPagination nas
+    # views que definem keyset_ordering
+    pagination_query_param = "pagination"
+
+    keyset = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        ordering = getattr(view, "keyset_ordering", None)
+        wants_keyset = (
+            request.query_params.get(self.pagination_query_param) == "cursor"
+            or KeysetPagination.cursor_query_param in request.query_params
+        )
+        if ordering and wants_keyset:
+            page_size = self.get_page_size(request)
+            if not page_size:
+                return None
+            self.keyset = KeysetPagination(page_size, ordering)
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_next_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_next_link()
+        return super().get_next_link()
+
+    def get_previous_link(self):
+        if self.keyset is not None:
+            return None
+        return super().get_previous_link()
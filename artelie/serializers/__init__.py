@@ -4,7 +4,7 @@ from .user import UserSerializer
 from .register import RegisterSerializer
 from .address import AddressSerializer
 from .supplier import SupplierSerializer
-from .product import ProductSerializer
+from .product import ProductSerializer, ProductListSerializer
 from .order import OrderSerializer
 from .cart import CartSerializer, CartItemSerializer
 from .review import ReviewSerializer
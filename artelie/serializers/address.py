@@ -1,7 +1,8 @@
 from rest_framework import serializers
 from artelie.models import Address
+from artelie.serializers.mixins import SparseFieldsetsMixin
 
-class AddressSerializer(serializers.ModelSerializer):
+class AddressSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     class Meta:
         model = Address
         fields = '__all__'
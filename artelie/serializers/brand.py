@@ -1,10 +1,11 @@
 from rest_framework import serializers
 from rest_framework.serializers import SlugRelatedField
 from artelie.models import Brand
+from artelie.serializers.mixins import SparseFieldsetsMixin
 from uploader.models import Image
 from uploader.serializers import ImageSerializer
 
-class BrandSerializer(serializers.ModelSerializer):
+class BrandSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     image_attachment_key = SlugRelatedField(
         source="image",
         queryset=Image.objects.all(),
@@ -1,18 +1,46 @@
+from collections import Counter
+
 from rest_framework import serializers
 from artelie.models.cart import Cart, CartItem
 from artelie.models import Product
+from artelie.serializers.mixins import SparseFieldsetsMixin
 
-class CartItemSerializer(serializers.ModelSerializer):
+class CartItemSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     product = serializers.PrimaryKeyRelatedField(queryset=Product.objects.all())
 
     class Meta:
         model = CartItem
         fields = ['id', 'product', 'quantity']
 
-class CartSerializer(serializers.ModelSerializer):
+class CartSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     items = CartItemSerializer(many=True, read_only=True)
 
     class Meta:
         model = Cart
         fields = ['id', 'user', 'created_at', 'items']
-        read_only_fields = ['id', 'created_at', 'user', 'items']
\ No newline at end of file
+        read_only_fields = ['id', 'created_at', 'user', 'items']
+
+
+class CartBulkItemSerializer(serializers.Serializer):
+    product = serializers.IntegerField(min_value=1)
+    quantity = serializers.IntegerField(min_value=1, default=1)
+
+
+class CartBulkSerializer(serializers.Serializer):
+    """
+    Lista de itens para sincronizar o carrinho de uma vez.
+    Produtos repetidos têm as quantidades somadas; todos os produtos são
+    validados com uma única query.
+    """
+    items = CartBulkItemSerializer(many=True, allow_empty=True, max_length=200)
+
+    def validate_items(self, items):
+        quantities = Counter()
+        for item in items:
+            quantities[item['product']] += item['quantity']
+
+        existing = set(Product.objects.filter(pk__in=quantities).values_list('pk', flat=True))
+        missing = sorted(set(quantities) - existing)
+        if missing:
+            raise serializers.ValidationError(f"Produtos inexistentes: {', '.join(map(str, missing))}.")
+        return dict(quantities)
@@ -1,14 +1,18 @@
 from rest_framework import serializers
 from artelie.models import Category
-from artelie.serializers.product import ProductSerializer
+from artelie.serializers.mixins import SparseFieldsetsMixin
+from artelie.serializers.product import ProductListSerializer
 
 
-class CategorySerializer(serializers.ModelSerializer):
-    products = ProductSerializer(many=True, read_only=True, source='product_set')
+class CategorySerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
+    # anotado pelo CategoryViewSet com um COUNT agregado
+    product_count = serializers.IntegerField(read_only=True, default=0)
+    # prévia dos primeiros produtos; só aparece com ?products=N
+    products = ProductListSerializer(many=True, read_only=True, source='preview_products')
 
     class Meta:
         model = Category
-        fields = ['id', 'name', 'created_at', 'updated_at', 'products']
+        fields = ['id', 'name', 'created_at', 'updated_at', 'product_count', 'products']
         read_only_fields = ['id', 'created_at', 'updated_at']
         extra_kwargs = {
             'name': {'required': True, 'max_length': 255},
@@ -0,0 +1,42 @@
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.serializers import ListSerializer
+
+
+def parse_field_list(value):
+    """Converte 'a, b,c' em {'a', 'b', 'c'}; retorna None se o parâmetro não veio."""
+    if value is None:
+        return None
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+class SparseFieldsetsMixin:
+    """
+    Permite ao cliente escolher os campos da resposta (sparse fieldsets).
+
+    - ?fields=id,name,price mantém apenas os campos listados
+    - ?omit=description remove os campos listados
+
+    Vale só para leituras (GET/HEAD/OPTIONS) e só para o serializer raiz da
+    resposta: serializers aninhados continuam com todos os seus campos.
+    Nomes desconhecidos são ignorados.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS or not self._is_response_root():
+            return fields
+
+        requested = parse_field_list(request.query_params.get('fields'))
+        omitted = parse_field_list(request.query_params.get('omit')) or set()
+        for name in list(fields):
+            if (requested is not None and name not in requested) or name in omitted:
+                fields.pop(name)
+        return fields
+
+    def _is_response_root(self):
+        root = self.root
+        if root is self:
+            return True
+        # many=True: o serializer fica dentro de um ListSerializer raiz
+        return isinstance(root, ListSerializer) and root.child is self
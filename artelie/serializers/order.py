@@ -1,9 +1,12 @@
-from rest_framework.serializers import ModelSerializer, CharField
+from rest_framework.serializers import ModelSerializer, CharField, DecimalField
 from artelie.models import Order
+from artelie.serializers.mixins import SparseFieldsetsMixin
 
-class OrderSerializer(ModelSerializer):
+class OrderSerializer(SparseFieldsetsMixin, ModelSerializer):
     user = CharField(source='user.email', read_only=True)
+    # anotado por Order.objects.with_total() no OrderViewSet
+    total_amount = DecimalField(max_digits=12, decimal_places=2, read_only=True)
     class Meta:
         model = Order
         fields = '__all__'
-        read_only_fields = ('ordered_at',)
\ No newline at end of file
+        read_only_fields = ('ordered_at',)
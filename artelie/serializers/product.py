@@ -1,10 +1,11 @@
 from rest_framework import serializers
 from artelie.models import Product
 from rest_framework.serializers import ModelSerializer, SlugRelatedField
+from artelie.serializers.mixins import SparseFieldsetsMixin
 from uploader.models import Image
 from uploader.serializers import ImageSerializer
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     image_attachment_key = SlugRelatedField(
         source="image",
         queryset=Image.objects.all(),
@@ -16,5 +17,14 @@ class ProductSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Product
-        fields = '__all__'
+        exclude = ['search_vector']
         read_only_fields = ('created_at', 'updated_at')
+
+
+class ProductListSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
+    """Representação compacta para grades de produtos (?compact=true)."""
+    image_url = serializers.CharField(source="image.url", read_only=True, allow_null=True)
+
+    class Meta:
+        model = Product
+        fields = ['id', 'name', 'price', 'image_url', 'rating_avg', 'rating_count']
@@ -1,7 +1,8 @@
 from rest_framework import serializers
 from artelie.models.review import Review
+from artelie.serializers.mixins import SparseFieldsetsMixin
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     user = serializers.StringRelatedField(read_only=True)
 
     class Meta:
@@ -1,7 +1,8 @@
 from rest_framework import serializers
 from artelie.models import Supplier
+from artelie.serializers.mixins import SparseFieldsetsMixin
 
-class SupplierSerializer(serializers.ModelSerializer):
+class SupplierSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     class Meta:
         model = Supplier
         fields = '__all__'
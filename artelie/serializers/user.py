@@ -4,13 +4,14 @@ from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework.serializers import ModelSerializer, SlugRelatedField
 from uploader.models import Image
+from artelie.serializers.mixins import SparseFieldsetsMixin
 from uploader.serializers import ImageSerializer
 import re
 
 User = get_user_model()
 
 
-class BaseUserSerializer(serializers.ModelSerializer):
+class BaseUserSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     """Serializer base com validações comuns."""
     
     def validate_email(self, value):
@@ -54,19 +55,20 @@ class UserSerializer(BaseUserSerializer):
     """Serializer para CRUD e usado pelo adm"""
     full_name = serializers.CharField(required=False, allow_blank=True, max_length=150)
     perfil_attachment_key = SlugRelatedField(
-        source='perfil',
+        source='profile_image',
         queryset=Image.objects.all(),
         slug_field='attachment_key',
         required=False,
         write_only=True,
     )
-    perfil = ImageSerializer(required=False, read_only=True)
+    perfil = ImageSerializer(source='profile_image', required=False, read_only=True)
     class Meta:
         model = User
         fields = [
             'id', 'username', 'email', 'full_name', 
             'is_active', 'is_verified', 'is_staff',
-            'created_at', 'updated_at', 'last_login'
+            'created_at', 'updated_at', 'last_login',
+            'perfil', 'perfil_attachment_key'
         ]
         read_only_fields = [
             'id', 'created_at', 'updated_at', 'last_login',
@@ -252,7 +254,7 @@ class UserPasswordChangeSerializer(serializers.Serializer):
         return user
 
 
-class PublicUserSerializer(serializers.ModelSerializer):
+class PublicUserSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     """Serializer para informações públicas do usuário."""
     full_name_display = serializers.SerializerMethodField()
     
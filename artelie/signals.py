@@ -0,0 +1,74 @@
+from django.db.models import DEFERRED
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from artelie.authentication import invalidate_cached_user
+from artelie.cache import bump_catalog_version
+from artelie.mail import queue_templated_email
+from artelie.models import Brand, Category, Order, Product, Review, User
+from artelie.models.review import update_product_rating
+from uploader.models import Image
+
+
+@receiver(pre_save, sender=Review)
+def review_product_loaded(sender, instance, update_fields=None, **kwargs):
+    """Busca o produto anterior quando ele não veio na query e vai ser gravado."""
+    if instance._loaded_product_id is not DEFERRED or instance.pk is None or 'product_id' not in instance.__dict__:
+        return
+    if update_fields is None or {'product', 'product_id'} & update_fields:
+        instance._loaded_product_id = Review.objects.filter(pk=instance.pk).values_list('product_id', flat=True).first()
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, **kwargs):
+    """Mantém rating_avg/rating_count/histograma do produto em dia."""
+    product_ids = {instance.product_id, instance._loaded_product_id} - {None, DEFERRED}
+    for product_id in sorted(product_ids):
+        update_product_rating(product_id)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    # também dispara em deletes em cascata (ex.: usuário removido), dentro
+    # da transação do Collector
+    update_product_rating(instance.product_id)
+
+
+@receiver([post_save, post_delete], sender=Brand)
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Product)
+@receiver([post_save, post_delete], sender=Image)
+def catalog_changed(sender, **kwargs):
+    """Invalida as respostas cacheadas do catálogo (artelie.cache)."""
+    bump_catalog_version(sender)
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_changed(sender, instance, **kwargs):
+    """
+    Descarta o usuário cacheado pela autenticação JWT: cobre edição,
+    desativação (perform_destroy/deactivate_account) e troca de senha.
+    """
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(pre_save, sender=Order)
+def order_status_loaded(sender, instance, update_fields=None, **kwargs):
+    """Busca o status anterior quando ele não veio na query e vai ser gravado."""
+    if instance._loaded_status is not DEFERRED or instance.pk is None or 'status' not in instance.__dict__:
+        return
+    if update_fields is None or 'status' in update_fields:
+        instance._loaded_status = Order.objects.filter(pk=instance.pk).values_list('status', flat=True).first()
+
+
+@receiver(post_save, sender=Order)
+def order_status_changed(sender, instance, created, **kwargs):
+    """Avisa o cliente por email (via caixa de saída) quando o status muda."""
+    loaded_status = instance._loaded_status
+    if not created and loaded_status is not DEFERRED and instance.status != loaded_status:
+        queue_templated_email('order_status', instance.user.email, {
+            'user': instance.user,
+            'order': instance,
+            'status': instance.get_status_display(),
+        })
+    instance._loaded_status = instance.__dict__.get('status', DEFERRED)
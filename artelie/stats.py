@@ -0,0 +1,93 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate, TruncWeek
+from django.utils import timezone
+
+from artelie.models import User, UserStatsSnapshot
+
+# janelas dos gráficos de cadastros
+DAILY_BUCKETS = 30
+WEEKLY_BUCKETS = 12
+STATS_FIELDS = ('total_users', 'active_users', 'verified_users', 'staff_users', 'users_today')
+
+
+def start_of_day(now):
+    return timezone.localtime(now).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def count_users(now=None):
+    """
+    Todos os contadores num único SELECT com agregação condicional. O
+    "hoje" é um intervalo em created_at (usa o índice), não created_at__date.
+    """
+    today = start_of_day(now or timezone.now())
+    return User.objects.aggregate(
+        total_users=Count('pk'),
+        active_users=Count('pk', filter=Q(is_active=True)),
+        verified_users=Count('pk', filter=Q(is_verified=True)),
+        staff_users=Count('pk', filter=Q(is_staff=True)),
+        users_today=Count('pk', filter=Q(created_at__gte=today)),
+    )
+
+
+def signup_buckets(period='day', buckets=DAILY_BUCKETS, now=None):
+    """
+    Cadastros por dia ('day') ou semana ('week', começando na segunda), os
+    `buckets` mais recentes incluindo o atual, com zero nos vazios.
+    """
+    today = start_of_day(now or timezone.now())
+    if period == 'week':
+        step = timedelta(weeks=1)
+        first = today - timedelta(days=today.weekday()) - step * (buckets - 1)
+        trunc = TruncWeek('created_at')
+    else:
+        step = timedelta(days=1)
+        first = today - step * (buckets - 1)
+        trunc = TruncDate('created_at')
+
+    rows = (
+        User.objects
+        .filter(created_at__gte=first)
+        .annotate(bucket=trunc)
+        .values('bucket')
+        .annotate(count=Count('pk'))
+        .order_by()
+    )
+    counts = {}
+    for row in rows:
+        bucket = row['bucket']
+        # TruncWeek devolve datetime, TruncDate devolve date
+        day = timezone.localtime(bucket).date() if hasattr(bucket, 'hour') else bucket
+        counts[day] = counts.get(day, 0) + row['count']
+
+    return [
+        {'date': (first + step * index).date().isoformat(), 'count': counts.get((first + step * index).date(), 0)}
+        for index in range(buckets)
+    ]
+
+
+def refresh_user_stats(now=None):
+    """Recalcula e grava o snapshot (três SELECTs e um UPSERT)."""
+    now = now or timezone.now()
+    snapshot, _ = UserStatsSnapshot.objects.update_or_create(pk=1, defaults={
+        **count_users(now),
+        'daily_signups': signup_buckets('day', DAILY_BUCKETS, now),
+        'weekly_signups': signup_buckets('week', WEEKLY_BUCKETS, now),
+        'computed_at': now,
+    })
+    return snapshot
+
+
+def get_user_stats(max_age=None, now=None):
+    """
+    Snapshot das estatísticas; recalcula se ele não existir ou tiver mais
+    de `max_age` segundos (padrão USER_STATS_MAX_AGE).
+    """
+    now = now or timezone.now()
+    max_age = settings.USER_STATS_MAX_AGE if max_age is None else max_age
+    snapshot = UserStatsSnapshot.objects.filter(pk=1).first()
+    if snapshot is None or now - snapshot.computed_at > timedelta(seconds=max_age):
+        snapshot = refresh_user_stats(now)
+    return snapshot
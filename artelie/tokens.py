@@ -0,0 +1,172 @@
+import atexit
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+
+from django.db import IntegrityError, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import BlacklistMixin, RefreshToken as BaseRefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from artelie.batching import BatchInsertBuffer
+
+
+class BloomFilter:
+    """Bloom filter simples: `jti in filtro` False é garantido, True pode ser falso positivo."""
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        # double hashing (Kirsch-Mitzenmacher): h1 + i*h2
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        for position in self.positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self.positions(item))
+
+
+class BlacklistFront:
+    """
+    Frente em memória da blacklist de refresh tokens.
+
+    Guarda os jti que este processo viu na blacklist: um LRU para recusar
+    replays sem ir ao banco e um bloom filter para responder "com certeza
+    não está na blacklist" sem o SELECT. Não é a fonte da verdade — outro
+    processo pode ter usado o token —, por isso RefreshToken.blacklist()
+    reivindica o token com um INSERT único que o banco arbitra.
+    """
+
+    def __init__(self, capacity=100_000, recent=10_000):
+        self.capacity = capacity
+        self.recent_size = recent
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            self.bloom = BloomFilter(self.capacity)
+            self.recent = OrderedDict()
+
+    def add(self, jti):
+        with self.lock:
+            if self.bloom.count >= self.capacity:
+                # cheio demais (falsos positivos sobem): recomeça; só custa SELECTs
+                self.bloom = BloomFilter(self.capacity)
+            self.bloom.add(jti)
+            self.recent[jti] = None
+            self.recent.move_to_end(jti)
+            if len(self.recent) > self.recent_size:
+                self.recent.popitem(last=False)
+
+    def is_recent(self, jti):
+        with self.lock:
+            if jti in self.recent:
+                self.recent.move_to_end(jti)
+                return True
+            return False
+
+    def might_contain(self, jti):
+        with self.lock:
+            return jti in self.bloom
+
+
+def outstanding_row(token):
+    return OutstandingToken(
+        user_id=token.payload.get(api_settings.USER_ID_CLAIM),
+        jti=token[api_settings.JTI_CLAIM],
+        token=str(token),
+        created_at=token.current_time,
+        expires_at=datetime_from_epoch(token['exp']),
+    )
+
+
+blacklist_front = BlacklistFront()
+# tokens emitidos: um INSERT por lote em vez de um por login/refresh. Se a
+# linha ainda não foi gravada quando o token entra na blacklist,
+# RefreshToken.blacklist() a cria.
+outstanding_tokens = BatchInsertBuffer(
+    OutstandingToken, 'OUTSTANDING_TOKEN_BATCH_SIZE', 'OUTSTANDING_TOKEN_FLUSH_INTERVAL'
+)
+atexit.register(outstanding_tokens.flush)
+
+
+class RefreshToken(BaseRefreshToken):
+    """
+    RefreshToken da simplejwt com a blacklist acelerada:
+
+    - check_blacklist() consulta a frente em memória e só vai ao banco
+      quando o bloom filter não descarta o jti;
+    - blacklist() é um INSERT em BlacklistedToken; se o token já estava lá
+      (replay, ou dois refresh simultâneos), o unique do banco recusa;
+    - tokens emitidos vão para o lote de outstanding_tokens, sem SELECT do
+      usuário nem INSERT por requisição.
+    """
+
+    def check_blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+        if blacklist_front.is_recent(jti):
+            raise TokenError(_("Token is blacklisted"))
+        rotates = api_settings.ROTATE_REFRESH_TOKENS and api_settings.BLACKLIST_AFTER_ROTATION
+        if rotates and not blacklist_front.might_contain(jti):
+            # todo refresh termina em blacklist(), cujo INSERT confirma no banco
+            return
+        try:
+            super().check_blacklist()
+        except TokenError:
+            blacklist_front.add(jti)
+            raise
+
+    def blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+        try:
+            with transaction.atomic():
+                token, _created = OutstandingToken.objects.get_or_create(
+                    jti=jti,
+                    defaults={
+                        'user_id': self.payload.get(api_settings.USER_ID_CLAIM),
+                        'created_at': self.current_time,
+                        'token': str(self),
+                        'expires_at': datetime_from_epoch(self['exp']),
+                    },
+                )
+                blacklisted = BlacklistedToken.objects.create(token=token)
+        except IntegrityError:
+            blacklist_front.add(jti)
+            raise TokenError(_("Token is blacklisted"))
+        blacklist_front.add(jti)
+        return blacklisted
+
+    def outstand(self):
+        outstanding_tokens.add(outstanding_row(self))
+
+    @classmethod
+    def for_user(cls, user):
+        # pula o OutstandingToken.objects.create() do BlacklistMixin
+        token = super(BlacklistMixin, cls).for_user(user)
+        outstanding_tokens.add(outstanding_row(token))
+        return token
+
+
+class ArtelieTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = RefreshToken
+
+
+class ArtelieTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = RefreshToken
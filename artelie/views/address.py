@@ -2,8 +2,10 @@ from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
 from artelie.models import Address
 from artelie.serializers import AddressSerializer
+from artelie.conditional import ConditionalRequestMixin
+from artelie.views.mixins import SparseQuerysetMixin
 
-class AddressViewSet(viewsets.ModelViewSet):
+class AddressViewSet(ConditionalRequestMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = Address.objects.all()
     serializer_class = AddressSerializer
     permission_classes = [IsAuthenticated]
\ No newline at end of file
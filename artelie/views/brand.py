@@ -1,9 +1,17 @@
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
 from artelie.models import Brand
+from uploader.models import Image
 from artelie.serializers import BrandSerializer
+from artelie.cache import CatalogCacheMixin
+from artelie.conditional import ConditionalRequestMixin
+from artelie.views.mixins import SparseQuerysetMixin
 
-class BrandViewSet(viewsets.ModelViewSet):
-    queryset = Brand.objects.all()
+class BrandViewSet(CatalogCacheMixin, ConditionalRequestMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
+    # respostas anônimas ficam em cache até um destes models mudar
+    cache_models = (Brand, Image)
+    queryset = Brand.objects.select_related('image')
+    # o srcset da imagem muda sem tocar na marca (variantes geradas depois)
+    etag_related = ('image',)
     serializer_class = BrandSerializer
     permission_classes = []
\ No newline at end of file
@@ -1,22 +1,77 @@
+from django.db import transaction
 from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from artelie.models.cart import Cart, CartItem
-from artelie.serializers.cart import CartSerializer, CartItemSerializer
+from artelie.models.cart import Cart, CartItem, CheckoutError, OutOfStockError
+from artelie.serializers import OrderSerializer
+from artelie.serializers.cart import CartSerializer, CartItemSerializer, CartBulkSerializer
+from artelie.conditional import ConditionalRequestMixin
+from artelie.views.mixins import SparseQuerysetMixin
 
-class CartViewSet(viewsets.ModelViewSet):
+class CartViewSet(ConditionalRequestMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     serializer_class = CartSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Cart.objects.filter(user=self.request.user)
+        return Cart.objects.filter(user=self.request.user).prefetch_related('items')
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
-class CartItemViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['post'])
+    def checkout(self, request):
+        """
+        Finaliza o carrinho do usuário: cria o pedido, baixa o estoque e
+        esvazia o carrinho, tudo ou nada.
+        """
+        cart = Cart.objects.select_related('user').filter(user=request.user).first()
+        if cart is None:
+            return Response({'error': 'Carrinho vazio.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            order = cart.checkout()
+        except OutOfStockError as e:
+            return Response(
+                {'error': str(e), 'product': e.product.pk},
+                status=status.HTTP_409_CONFLICT
+            )
+        except CheckoutError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(OrderSerializer(order).data, status=status.HTTP_201_CREATED)
+
+class CartItemViewSet(ConditionalRequestMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     serializer_class = CartItemSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return CartItem.objects.filter(cart__user=self.request.user)
\ No newline at end of file
+        return CartItem.objects.filter(cart__user=self.request.user)
+
+    @action(detail=False, methods=['post', 'put'])
+    def bulk(self, request):
+        """
+        Sincroniza vários itens numa requisição ({"items": [{"product", "quantity"}]}).
+
+        POST faz upsert (define a quantidade dos produtos enviados e mantém os
+        demais); PUT substitui o carrinho inteiro. Devolve o carrinho completo.
+        """
+        serializer = CartBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        quantities = serializer.validated_data['items']
+
+        with transaction.atomic():
+            cart, _ = Cart.objects.get_or_create(user=request.user)
+            if quantities:
+                CartItem.objects.bulk_create(
+                    [
+                        CartItem(cart=cart, product_id=product_id, quantity=quantity)
+                        for product_id, quantity in quantities.items()
+                    ],
+                    update_conflicts=True,
+                    unique_fields=['cart', 'product'],
+                    update_fields=['quantity'],
+                )
+            if request.method == 'PUT':
+                cart.items.exclude(product_id__in=quantities).delete()
+
+        cart = Cart.objects.prefetch_related('items').get(pk=cart.pk)
+        return Response(CartSerializer(cart).data)
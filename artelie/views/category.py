@@ -1,8 +1,60 @@
 # views/category.py
+from django.db.models import Count, Prefetch
 from rest_framework import viewsets
-from artelie.models import Category
-from artelie.serializers import CategorySerializer
+from rest_framework.decorators import action
+from artelie.models import Category, Product
+from uploader.models import Image
+from artelie.serializers import CategorySerializer, ProductSerializer, ProductListSerializer
+from artelie.cache import CatalogCacheMixin
+from artelie.conditional import ConditionalRequestMixin
+from artelie.views.mixins import SparseQuerysetMixin, wants_compact
 
-class CategoryViewSet(viewsets.ModelViewSet):
-    queryset = Category.objects.all()
+class CategoryViewSet(CatalogCacheMixin, ConditionalRequestMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
+    # respostas anônimas ficam em cache até um destes models mudar
+    cache_models = (Category, Product, Image)
     serializer_class = CategorySerializer
+    # limite de produtos na prévia (?products=N)
+    max_product_preview = 12
+
+    def get_queryset(self):
+        # Meta.ordering é ignorado em queries com GROUP BY: ordena explicitamente
+        queryset = Category.objects.annotate(product_count=Count('product')).order_by('name')
+        preview_size = self.get_product_preview_size()
+        if preview_size:
+            # o fatiamento vira um ROW_NUMBER() por categoria: uma única query
+            # traz os N primeiros produtos de todas as categorias da página
+            queryset = queryset.prefetch_related(Prefetch(
+                'product_set',
+                queryset=Product.objects.select_related('image')[:preview_size],
+                to_attr='preview_products',
+            ))
+        return queryset
+
+    def get_etag_stamp(self, instance):
+        # a prévia muda quando um dos produtos (ou a imagem dele) muda, sem
+        # tocar na categoria; a imagem já veio no select_related
+        stamp = super().get_etag_stamp(instance)
+        preview = getattr(instance, 'preview_products', None)
+        if preview is not None:
+            stamp.append([
+                (product.pk, product.updated_at, product.image_id and product.image.updated_at)
+                for product in preview
+            ])
+        return stamp
+
+    def get_product_preview_size(self):
+        try:
+            size = int(self.request.query_params.get('products', 0))
+        except ValueError:
+            return 0
+        return max(0, min(size, self.max_product_preview))
+
+    @action(detail=True, methods=['get'])
+    def products(self, request, pk=None):
+        """Produtos da categoria, paginados (aceita ?compact=true)."""
+        category = self.get_object()
+        queryset = Product.objects.filter(category=category).select_related('image')
+        serializer_class = ProductListSerializer if wants_compact(request) else ProductSerializer
+        page = self.paginate_queryset(queryset)
+        serializer = serializer_class(page, many=True, context=self.get_serializer_context())
+        return self.get_paginated_response(serializer.data)
@@ -3,9 +3,13 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from django.contrib.auth import get_user_model
-from django.utils import timezone
+from django.db import transaction
 import logging
-import uuid
+
+from artelie.audit import audit, field_diff, snapshot
+from artelie.lockout import client_ip
+from artelie.mail import queue_verification_email
+from artelie.models import EmailVerificationToken
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -22,11 +26,12 @@ class EmailVerificationView(APIView):
         Verifica o token e ativa a conta do usuário.
         """
         try:
-            # Buscar usuário pelo token
-            user = User.objects.get(verification_token=token)
+            # Buscar pelo hash do token (índice único)
+            verification = EmailVerificationToken.lookup(token)
+            user = verification.user
             
             # Verificar se token ainda é válido
-            if not user.is_verification_token_valid():
+            if verification.is_expired:
                 logger.warning(
                     f"Token expirado para usuário: {user.email}",
                     extra={'user_id': str(user.id)}
@@ -36,19 +41,18 @@ class EmailVerificationView(APIView):
                     'message': 'Solicite um novo email de verificação.'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            # Ativar usuário
-            user.is_active = True
-            user.is_verified = True
-            user.verification_token = None
-            user.verification_token_created_at = None
-            user.save(update_fields=[
-                'is_active', 'is_verified', 
-                'verification_token', 'verification_token_created_at'
-            ])
+            # Ativar usuário e descartar os tokens dele
+            before = snapshot(user, ['is_active', 'is_verified'])
+            with transaction.atomic():
+                user.is_active = True
+                user.is_verified = True
+                user.save(update_fields=['is_active', 'is_verified'])
+                user.verification_tokens.all().delete()
             
-            logger.info(
-                f"Email verificado com sucesso: {user.email}",
-                extra={'user_id': str(user.id)}
+            audit(
+                'user.email_verified', user, actor=user, ip=client_ip(request),
+                changes=field_diff(before, user, ['is_active', 'is_verified']),
+                message=f"Email verificado com sucesso: {user.email}",
             )
             
             return Response({
@@ -57,11 +61,9 @@ class EmailVerificationView(APIView):
                 'email': user.email
             }, status=status.HTTP_200_OK)
             
-        except User.DoesNotExist:
-            logger.warning(
-                f"Token inválido recebido: {token[:8]}...",
-                extra={'token_prefix': token[:8]}
-            )
+        except EmailVerificationToken.DoesNotExist:
+            # não loga o token: nem um prefixo dele
+            logger.warning("Token de verificação inválido recebido.")
             return Response({
                 'error': 'Token de verificação inválido.'
             }, status=status.HTTP_404_NOT_FOUND)
@@ -103,16 +105,12 @@ class ResendVerificationEmailView(APIView):
                     'message': 'Este email já está verificado.'
                 }, status=status.HTTP_200_OK)
             
-            # Gerar novo token
-            user.verification_token = str(uuid.uuid4())
-            user.verification_token_created_at = timezone.now()
-            user.save(update_fields=['verification_token', 'verification_token_created_at'])
+            # Gerar novo token e enfileirar o email (enviado por send_queued_emails)
+            email = queue_verification_email(user, template='resend_verification')
             
-            # Aqui você chamaria a função de envio de email
-            # Para simplificar, apenas log
             logger.info(
                 f"Email de verificação reenviado para: {user.email}",
-                extra={'user_id': str(user.id)}
+                extra={'user_id': str(user.id), 'outbox_id': email.pk}
             )
             
             return Response({
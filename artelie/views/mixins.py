@@ -0,0 +1,93 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework.permissions import SAFE_METHODS
+
+
+def wants_compact(request):
+    """True quando o cliente pediu a representação compacta (?compact=true)."""
+    return request.query_params.get('compact', '').lower() in ('1', 'true', 'yes')
+
+
+def _select_related_lookups(tree, prefix=''):
+    """Transforma a árvore de query.select_related ({'a': {'b': {}}}) em ['a__b']."""
+    lookups = []
+    for name, children in tree.items():
+        path = f"{prefix}{name}"
+        nested = _select_related_lookups(children, f"{path}__")
+        lookups.extend(nested or [path])
+    return lookups
+
+
+def narrow_queryset(queryset, serializer):
+    """
+    Restringe o SELECT às colunas lidas pelo serializer.
+
+    Usa .only() com as colunas concretas que o serializer lê e descarta
+    select_related/prefetch_related de relações que não vão para a resposta.
+    Se algum campo depende de atributos calculados (SerializerMethodField,
+    properties), o queryset é devolvido intacto, pois não dá para saber
+    quais colunas ele precisa.
+    """
+    model = queryset.model
+    sources = set()
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source == '*':
+            return queryset
+        sources.add(field.source.split('.')[0])
+
+    # atributos que não são colunas do model: relações reversas, anotações
+    # e to_attr de prefetches
+    virtual = {rel.get_accessor_name() for rel in model._meta.related_objects}
+    virtual.update(queryset.query.annotations)
+    virtual.update(
+        lookup.prefetch_to.split('__')[0]
+        for lookup in queryset._prefetch_related_lookups
+        if isinstance(lookup, Prefetch)
+    )
+    columns = {model._meta.pk.name}
+    for source in sources:
+        if source in virtual:
+            continue
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            return queryset
+        if model_field.concrete:
+            columns.add(model_field.name)
+
+    select_related = queryset.query.select_related
+    if isinstance(select_related, dict):
+        kept = [
+            lookup for lookup in _select_related_lookups(select_related)
+            if lookup.split('__')[0] in sources
+        ]
+        queryset = queryset.select_related(None)
+        if kept:
+            queryset = queryset.select_related(*kept)
+
+    prefetches = queryset._prefetch_related_lookups
+    if prefetches:
+        kept = [
+            lookup for lookup in prefetches
+            if (lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup).split('__')[0] in sources
+        ]
+        queryset = queryset.prefetch_related(None)
+        if kept:
+            queryset = queryset.prefetch_related(*kept)
+
+    return queryset.only(*columns)
+
+
+class SparseQuerysetMixin:
+    """
+    Mixin para ModelViewSets: em list/retrieve o queryset lê só as colunas
+    que o serializer da resposta usa (inclusive com ?fields= / ?omit=).
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method in SAFE_METHODS and self.action in ('list', 'retrieve'):
+            queryset = narrow_queryset(queryset, self.get_serializer())
+        return queryset
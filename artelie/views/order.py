@@ -3,8 +3,14 @@ from rest_framework.viewsets import ModelViewSet
 from artelie.models import Order
 from rest_framework.permissions import IsAuthenticated
 from artelie.serializers import OrderSerializer
+from artelie.conditional import ConditionalRequestMixin
+from artelie.views.mixins import SparseQuerysetMixin
 
-class OrderViewSet(ModelViewSet):
-    queryset = Order.objects.all()
+class OrderViewSet(ConditionalRequestMixin, SparseQuerysetMixin, ModelViewSet):
+    queryset = Order.objects.select_related('user').with_total()
     serializer_class = OrderSerializer
-    permission_classes = []
\ No newline at end of file
+    permission_classes = []
+    # ordem da paginação por cursor (?pagination=cursor)
+    keyset_ordering = ('-created_at', 'id')
+    # o e-mail do usuário aparece no pedido
+    etag_related = ('user',)
\ No newline at end of file
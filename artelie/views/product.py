@@ -1,15 +1,42 @@
-from rest_framework import viewsets
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import viewsets, filters
 from rest_framework.permissions import IsAuthenticated
+from artelie.filters import ProductSearchFilter
 from artelie.models import Product
-from artelie.serializers import ProductSerializer
+from uploader.models import Image
+from artelie.serializers import ProductSerializer, ProductListSerializer
+from artelie.cache import CatalogCacheMixin
+from artelie.conditional import ConditionalRequestMixin
+from artelie.views.mixins import SparseQuerysetMixin, wants_compact
 
-class ProductViewSet(viewsets.ModelViewSet):
-    queryset = Product.objects.all()
+class ProductViewSet(CatalogCacheMixin, ConditionalRequestMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
+    # respostas anônimas ficam em cache até um destes models mudar
+    cache_models = (Product, Image)
+    # select_related carrega a imagem no mesmo SELECT (evita N+1 por produto)
+    queryset = Product.objects.select_related("image")
+    # o srcset da imagem muda sem tocar no produto (variantes geradas depois)
+    etag_related = ("image",)
     serializer_class = ProductSerializer
     permission_classes = []
-    # Habilita filtros simples por categoria, marca e fornecedor
-    filterset_fields = ["category", "brand", "supplier"]
-    # Permite busca por nome e descrição (?search=texto)
+    filter_backends = [DjangoFilterBackend, ProductSearchFilter, filters.OrderingFilter]
+    # Habilita filtros simples por categoria, marca e fornecedor, e por nota
+    # mínima (?rating_avg__gte=4)
+    filterset_fields = {
+        "category": ["exact"],
+        "brand": ["exact"],
+        "supplier": ["exact"],
+        "rating_avg": ["gte"],
+    }
+    # Permite busca por nome e descrição (?search=texto): full-text no
+    # PostgreSQL, ILIKE nestes campos nos demais bancos
     search_fields = ["name", "description"]
-    # Permite ordenação por nome, preço e data de criação (?ordering=price ou -price)
-    ordering_fields = ["name", "price", "created_at"]
\ No newline at end of file
+    # Permite ordenação por nome, preço, data de criação e avaliação (?ordering=price ou -rating_avg)
+    ordering_fields = ["name", "price", "created_at", "rating_avg", "rating_count"]
+    # ordem da paginação por cursor (?pagination=cursor)
+    keyset_ordering = ("name", "id")
+
+    def get_serializer_class(self):
+        # ?compact=true devolve só id/nome/preço/url da imagem na listagem
+        if self.action == "list" and wants_compact(self.request):
+            return ProductListSerializer
+        return super().get_serializer_class()
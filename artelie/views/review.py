@@ -2,11 +2,17 @@ from rest_framework import viewsets, permissions
 from rest_framework.permissions import IsAuthenticated
 from artelie.models.review import Review
 from artelie.serializers.review import ReviewSerializer
+from artelie.conditional import ConditionalRequestMixin
+from artelie.views.mixins import SparseQuerysetMixin
 
-class ReviewViewSet(viewsets.ModelViewSet):
-    queryset = Review.objects.all()
+class ReviewViewSet(ConditionalRequestMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
+    queryset = Review.objects.select_related('user')
+    # o autor aparece como texto (username e email) na resposta
+    etag_related = ('user',)
     serializer_class = ReviewSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    # ordem da paginação por cursor (?pagination=cursor)
+    keyset_ordering = ('-created_at', 'id')
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
\ No newline at end of file
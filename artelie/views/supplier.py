@@ -2,8 +2,10 @@ from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
 from artelie.models import Supplier
 from artelie.serializers import SupplierSerializer
+from artelie.conditional import ConditionalRequestMixin
+from artelie.views.mixins import SparseQuerysetMixin
 
-class SupplierViewSet(viewsets.ModelViewSet):
+class SupplierViewSet(ConditionalRequestMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = Supplier.objects.all()
     depth = 1
     serializer_class = SupplierSerializer
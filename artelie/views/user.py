@@ -14,17 +14,26 @@ from artelie.serializers.user import (
     UserUpdateSerializer, UserPasswordChangeSerializer, PublicUserSerializer
 )
 from artelie.permissions import IsOwnerOrAdmin  # Criar esta permission
+from artelie.audit import audit, field_diff, snapshot
+from artelie.conditional import ConditionalRequestMixin
+from artelie.lockout import client_ip
+from artelie.mail import queue_templated_email
+from artelie.stats import STATS_FIELDS, get_user_stats
+from artelie.views.mixins import SparseQuerysetMixin
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
+# campos cujas alterações entram na auditoria
+AUDITED_USER_FIELDS = ['username', 'email', 'full_name', 'is_active', 'is_staff']
+
 
 class UserRateThrottle(UserRateThrottle):
     """Throttling personalizado para operações de usuário."""
     scope = 'user_operations'
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ConditionalRequestMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     """
     ViewSet completo para gerenciamento de usuários.
     
@@ -47,12 +56,15 @@ class UserViewSet(viewsets.ModelViewSet):
     search_fields = ['username', 'email', 'full_name']
     ordering_fields = ['created_at', 'username', 'email', 'last_login']
     ordering = ['-created_at']
+    keyset_ordering = ('-created_at', 'id')
+    # o detalhe traz o endereço e a foto de perfil (url/srcset) aninhados
+    etag_related = ('address', 'profile_image')
     
     def get_queryset(self):
         """
         Queryset com filtros de segurança e otimizações.
         """
-        queryset = User.objects.select_related('address')
+        queryset = User.objects.select_related('address', 'profile_image')
         
         # Filtros baseados no usuário atual
         user = self.request.user
@@ -70,9 +82,13 @@ class UserViewSet(viewsets.ModelViewSet):
         
         # Otimização: prefetch relacionamentos se necessário
         if self.action == 'list':
+            # inclui os campos lidos pelos serializers de listagem e as FKs do
+            # select_related, senão cada linha dispara uma query extra
             queryset = queryset.only(
-                'id', 'username', 'email', 'full_name', 
-                'is_active', 'is_verified', 'created_at'
+                'id', 'username', 'email', 'full_name',
+                'is_active', 'is_verified', 'is_staff',
+                'created_at', 'updated_at', 'last_login',
+                'address', 'profile_image'
             )
         
         return queryset
@@ -93,6 +109,8 @@ class UserViewSet(viewsets.ModelViewSet):
         elif self.action in ['change_password', 'deactivate_account']:
             # Apenas o próprio usuário ou admin
             permission_classes = [IsOwnerOrAdmin]
+        elif self.action == 'user_stats':
+            permission_classes = [IsAdminUser]
         else:
             permission_classes = [IsAuthenticated]
         
@@ -122,37 +140,22 @@ class UserViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         """Auditoria e logging na criação."""
         user = serializer.save()
-        logger.info(
-            f"User created: {user.username} ({user.email}) by {self.request.user}",
-            extra={
-                'user_id': str(user.id),
-                'created_by': str(self.request.user.id),
-                'ip': self.get_client_ip()
-            }
+        audit(
+            'user.created', user, actor=self.request.user, ip=client_ip(self.request),
+            message=f"User created: {user.username} by {self.request.user}",
         )
     
     def perform_update(self, serializer):
         """Auditoria e logging na atualização."""
-        old_instance = self.get_object()
+        # o diff sai da instância que get_object() já carregou, sem outra query
+        before = snapshot(serializer.instance, AUDITED_USER_FIELDS)
         user = serializer.save()
         
-        # Log das alterações específicas
-        changes = []
-        for field in ['username', 'email', 'full_name', 'is_active', 'is_staff']:
-            old_value = getattr(old_instance, field, None)
-            new_value = getattr(user, field, None)
-            if old_value != new_value:
-                changes.append(f"{field}: {old_value} → {new_value}")
-        
+        changes = field_diff(before, user, AUDITED_USER_FIELDS)
         if changes:
-            logger.info(
-                f"User updated: {user.username} - Changes: {', '.join(changes)} by {self.request.user}",
-                extra={
-                    'user_id': str(user.id),
-                    'updated_by': str(self.request.user.id),
-                    'changes': changes,
-                    'ip': self.get_client_ip()
-                }
+            audit(
+                'user.updated', user, actor=self.request.user, changes=changes, ip=client_ip(self.request),
+                message=f"User updated: {user.username} by {self.request.user}",
             )
     
     def perform_destroy(self, instance):
@@ -162,13 +165,10 @@ class UserViewSet(viewsets.ModelViewSet):
         instance.is_active = False
         instance.save(update_fields=['is_active'])
         
-        logger.warning(
-            f"User deactivated: {instance.username} by {self.request.user}",
-            extra={
-                'user_id': str(instance.id),
-                'deactivated_by': str(self.request.user.id),
-                'ip': self.get_client_ip()
-            }
+        audit(
+            'user.deactivated', instance, actor=self.request.user, ip=client_ip(self.request),
+            changes={'is_active': [True, False]}, level=logging.WARNING,
+            message=f"User deactivated: {instance.username} by {self.request.user}",
         )
     
     @action(detail=True, methods=['post'], url_path='change-password')
@@ -187,16 +187,15 @@ class UserViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        serializer.save()
+        changed = serializer.save()
+        queue_templated_email('password_changed', changed.email, {
+            'user': changed,
+            'changed_at': timezone.localtime(),
+        })
         
-        # Log da troca de senha
-        logger.info(
-            f"Password changed for user: {user.username} by {request.user}",
-            extra={
-                'user_id': str(user.id),
-                'changed_by': str(request.user.id),
-                'ip': self.get_client_ip()
-            }
+        audit(
+            'user.password_changed', user, actor=request.user, ip=client_ip(request),
+            message=f"Password changed for user: {user.username} by {request.user}",
         )
         
         return Response({
@@ -228,12 +227,10 @@ class UserViewSet(viewsets.ModelViewSet):
         user.is_active = False
         user.save(update_fields=['is_active'])
         
-        logger.warning(
-            f"Account self-deactivated: {user.username}",
-            extra={
-                'user_id': str(user.id),
-                'ip': self.get_client_ip()
-            }
+        audit(
+            'user.self_deactivated', user, actor=request.user, ip=client_ip(request),
+            changes={'is_active': [True, False]}, level=logging.WARNING,
+            message=f"Account self-deactivated: {user.username}",
         )
         
         return Response({
@@ -252,25 +249,16 @@ class UserViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], url_path='stats', permission_classes=[IsAdminUser])
     def user_stats(self, request):
         """
-        Estatísticas de usuários (apenas para admins).
+        Estatísticas de usuários (apenas para admins), lidas do snapshot em
+        artelie.stats. ?fresh=true força o recálculo.
         """
-        stats = {
-            'total_users': User.objects.count(),
-            'active_users': User.objects.filter(is_active=True).count(),
-            'verified_users': User.objects.filter(is_verified=True).count(),
-            'staff_users': User.objects.filter(is_staff=True).count(),
-            'users_today': User.objects.filter(created_at__date=timezone.now().date()).count(),
+        fresh = request.query_params.get('fresh', '').lower() in ('1', 'true')
+        snapshot = get_user_stats(max_age=0 if fresh else None)
+
+        stats = {field: getattr(snapshot, field) for field in STATS_FIELDS}
+        stats['signups'] = {
+            'daily': snapshot.daily_signups,
+            'weekly': snapshot.weekly_signups,
         }
-        
+        stats['computed_at'] = snapshot.computed_at
         return Response(stats)
-    
-    def get_client_ip(self):
-        """
-        Obtém IP do cliente para logging.
-        """
-        x_forwarded_for = self.request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = self.request.META.get('REMOTE_ADDR')
-        return ip
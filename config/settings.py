@@ -84,6 +84,49 @@ DATABASES = {
     )
 }
 
+# Cache compartilhado entre workers quando REDIS_URL está definido
+# (requer o pacote redis); senão, memória local do processo.
+REDIS_URL = os.getenv("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "artelie",
+        }
+    }
+# Todos os workers enxergam o mesmo cache? Verdadeiro com REDIS_URL. Sem isso
+# uma invalidação só alcança o processo que a fez, então os caches que
+# dependem dela (catálogo, snapshot de usuário do JWT) ficam desligados e o
+# bloqueio de login conta as falhas no banco. Para a
+# memória local, defina CACHE_SHARED=true só se houver um único processo.
+CACHE_SHARED = bool(REDIS_URL) or str(os.getenv("CACHE_SHARED", "False")).lower() in ("1", "true", "yes")
+# tempo máximo (s) de uma resposta do catálogo no cache; edições invalidam antes
+CATALOG_CACHE_TIMEOUT = int(os.getenv("CATALOG_CACHE_TIMEOUT", 300))
+
+# bloqueio de login (artelie.lockout): falhas toleradas por conta e por IP
+# dentro da janela deslizante (s)
+LOGIN_LOCKOUT_ACCOUNT_LIMIT = int(os.getenv("LOGIN_LOCKOUT_ACCOUNT_LIMIT", 5))
+LOGIN_LOCKOUT_IP_LIMIT = int(os.getenv("LOGIN_LOCKOUT_IP_LIMIT", 20))
+LOGIN_LOCKOUT_WINDOW = int(os.getenv("LOGIN_LOCKOUT_WINDOW", 900))
+# proxies reversos confiáveis na frente da aplicação: o IP do cliente é a
+# entrada do X-Forwarded-For a essa profundidade, contada da direita (0 usa
+# REMOTE_ADDR; o cliente controla o resto do cabeçalho). Vale também para o
+# throttling do DRF.
+NUM_PROXIES = int(os.getenv("NUM_PROXIES", 0))
+# refresh tokens emitidos (artelie.tokens): gravados em lote a cada N tokens
+# ou a cada intervalo (s)
+OUTSTANDING_TOKEN_BATCH_SIZE = int(os.getenv("OUTSTANDING_TOKEN_BATCH_SIZE", 100))
+OUTSTANDING_TOKEN_FLUSH_INTERVAL = int(os.getenv("OUTSTANDING_TOKEN_FLUSH_INTERVAL", 30))
+# idade máxima (s) do snapshot de /api/users/stats/ antes de recalcular
+USER_STATS_MAX_AGE = int(os.getenv("USER_STATS_MAX_AGE", 300))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=15),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
@@ -97,7 +140,7 @@ SIMPLE_JWT = {
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "artelie.authentication.CachedJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.AllowAny",
@@ -106,6 +149,7 @@ REST_FRAMEWORK = {
         "rest_framework.throttling.AnonRateThrottle",
         "rest_framework.throttling.UserRateThrottle",
     ],
+    "NUM_PROXIES": NUM_PROXIES,
     "DEFAULT_THROTTLE_RATES": {
         "anon": "100/day",
         "user": "1000/day",
@@ -137,19 +181,34 @@ EMAIL_USE_TLS = True
 EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "artelieonlineweb@gmail.com")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
+# caixa de saída (artelie.mail): tentativas por email e atraso base (s) do backoff
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", 5))
+EMAIL_OUTBOX_RETRY_DELAY = int(os.getenv("EMAIL_OUTBOX_RETRY_DELAY", 60))
+
+# rotação de logs/auth.log: por tamanho (bytes) ou à meia-noite, mantendo N arquivos
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", 10 * 1024 * 1024))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", 14))
+# auditoria (artelie.audit): eventos gravados em lote a cada N ou a cada intervalo (s)
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", 50))
+AUDIT_FLUSH_INTERVAL = int(os.getenv("AUDIT_FLUSH_INTERVAL", 10))
 
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
     "formatters": {
-        "verbose": {"format": "{levelname} {asctime} {module} {message}", "style": "{"}
+        "verbose": {"format": "{levelname} {asctime} {module} {message}", "style": "{"},
+        "json": {"()": "artelie.log_handlers.JsonFormatter"},
     },
     "handlers": {
+        # JSON em logs/auth.log, escrito por uma thread (artelie.log_handlers)
         "file": {
             "level": "INFO",
-            "class": "logging.FileHandler",
+            "class": "artelie.log_handlers.QueuedFileHandler",
             "filename": str(LOG_DIR / "auth.log"),
-            "formatter": "verbose",
+            "max_bytes": LOG_MAX_BYTES,
+            "when": "midnight",
+            "backup_count": LOG_BACKUP_COUNT,
+            "formatter": "json",
         },
         "console": {
             "level": "INFO",
@@ -168,6 +227,11 @@ LOGGING = {
             "level": "INFO",
             "propagate": False,
         },
+        "artelie.audit": {
+            "handlers": ["file", "console"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
 }
 
@@ -180,11 +244,45 @@ STATIC_URL = "static/"
 MEDIA_ENDPOINT = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media/")
 FILE_UPLOAD_PERMISSIONS = 0o640
+# uploads: requisições até este tamanho ficam em memória, acima vão para um
+# arquivo temporário em blocos (uploader.handlers); o tipo é detectado pelo
+# cabeçalho capturado durante o recebimento
+FILE_UPLOAD_MAX_MEMORY_SIZE = int(os.getenv("FILE_UPLOAD_MAX_MEMORY_SIZE", 1024 * 1024))
+FILE_UPLOAD_HANDLERS = [
+    "uploader.handlers.MemoryFileUploadHandler",
+    "uploader.handlers.TemporaryFileUploadHandler",
+]
+# arquivos maiores que isto vão para o Cloudinary em partes (mínimo de 5 MB da API)
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", 6 * 1024 * 1024))
+# uploads retomáveis de documentos (uploader.sessions): os blocos ficam em disco,
+# fora do MEDIA_ROOT, até o finalize; sessões paradas por UPLOAD_SESSION_TTL
+# segundos são apagadas por `manage.py purge_upload_sessions`
+UPLOAD_SESSION_DIR = os.getenv("UPLOAD_SESSION_DIR", os.path.join(BASE_DIR, "upload_sessions"))
+UPLOAD_SESSION_CHUNK_SIZE = int(os.getenv("UPLOAD_SESSION_CHUNK_SIZE", 8 * 1024 * 1024))
+UPLOAD_SESSION_MAX_SIZE = int(os.getenv("UPLOAD_SESSION_MAX_SIZE", 200 * 1024 * 1024))
+UPLOAD_SESSION_TTL = int(os.getenv("UPLOAD_SESSION_TTL", 24 * 60 * 60))
+# variantes responsivas das imagens (uploader.variants): geradas após o commit
+# do upload em um pool de threads; IMAGE_VARIANTS_ASYNC=false gera na hora
+IMAGE_VARIANT_FORMATS = os.getenv("IMAGE_VARIANT_FORMATS", "jpeg,webp").split(",")
+IMAGE_VARIANT_WORKERS = int(os.getenv("IMAGE_VARIANT_WORKERS", 2))
+IMAGE_VARIANTS_ASYNC = str(os.getenv("IMAGE_VARIANTS_ASYNC", "True")).lower() in ("1", "true", "yes")
 MEDIA_URL = "/media/"
 CLOUDINARY_URL = os.getenv("CLOUDINARY_URL")
 STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
+# backend de mídia: "cloudinary" (padrão) ou "local" (uploader.local_storage.LocalStorage
+# em MEDIA_ROOT, servido pela própria aplicação), para desenvolvimento offline
+# e testes de carga sem rede
+MEDIA_STORAGE_BACKENDS = {
+    "cloudinary": "uploader.storage.ChunkedCloudinaryStorage",
+    "local": "uploader.local_storage.LocalStorage",
+}
+MEDIA_STORAGE = os.getenv("MEDIA_STORAGE", "cloudinary")
+# com MEDIA_STORAGE=local, entrega os arquivos pelo servidor web: "X-Accel-Redirect"
+# (nginx, com uma location internal em MEDIA_SENDFILE_PREFIX) ou "X-Sendfile" (Apache)
+MEDIA_SENDFILE_HEADER = os.getenv("MEDIA_SENDFILE_HEADER", "")
+MEDIA_SENDFILE_PREFIX = os.getenv("MEDIA_SENDFILE_PREFIX", "/protected-media/")
 STORAGES = {
-    "default": {"BACKEND": "cloudinary_storage.storage.MediaCloudinaryStorage"},
+    "default": {"BACKEND": MEDIA_STORAGE_BACKENDS[MEDIA_STORAGE]},
     "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
 }
 
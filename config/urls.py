@@ -1,7 +1,8 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf.urls.static import static
 from uploader.router import router as uploader_router
+from uploader.views import serve_media
 from rest_framework.routers import DefaultRouter
 from artelie.views import (
     BrandViewSet, CategoryViewSet, UserViewSet, AddressViewSet,
@@ -43,5 +44,8 @@ urlpatterns = [
 ]
 
 
-if settings.DEBUG:
+if settings.MEDIA_STORAGE == 'local':
+    # storage local: a aplicação serve a mídia, inclusive fora do DEBUG
+    urlpatterns += [re_path(rf'^{settings.MEDIA_URL.lstrip("/")}(?P<name>.+)$', serve_media, name='media')]
+elif settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
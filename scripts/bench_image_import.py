@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark de vazão da importação em massa de imagens (artelie.image_import).
+
+Compara o caminho atual (um POST por imagem no ImageUploadViewSet) com o
+comando import_images em vários números de workers, gravando em
+FileSystemStorage num diretório temporário e num banco de teste descartável.
+Cada rodada roda numa transação desfeita no fim, então a geração de
+variantes (agendada no commit) fica fora da medição. Uso:
+
+    python scripts/bench_image_import.py --images 400 --size-kb 256 --workers 1 2 4
+"""
+
+import argparse
+import csv
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from io import StringIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.test import override_settings  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from PIL import Image as PILImage  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from artelie.models import Brand, Category, Product, Supplier  # noqa: E402
+from uploader.views import ImageUploadViewSet  # noqa: E402
+
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+
+def noise_jpeg(size_kb):
+    """JPEG de ruído (não comprime muito) com aproximadamente `size_kb` KB."""
+    side = int((size_kb * 1024 / 1.5) ** 0.5)
+    buffer = io.BytesIO()
+    PILImage.frombytes("RGB", (side, side), os.urandom(side * side * 3)).save(buffer, "JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def build_source(directory, products, size_kb, duplicate_every=10):
+    """Uma imagem por produto; uma a cada `duplicate_every` repete o conteúdo da anterior."""
+    source = os.path.join(directory, "imagens")
+    os.mkdir(source)
+    manifest = os.path.join(directory, "manifesto.csv")
+    content = b""
+    with open(manifest, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["file", "product", "description"])
+        for index, product in enumerate(products):
+            if index % duplicate_every or not content:
+                content = noise_jpeg(size_kb)
+            name = f"{index:05d}.jpg"
+            with open(os.path.join(source, name), "wb") as image:
+                image.write(content)
+            writer.writerow([name, product.pk, f"imagem {index}"])
+    return source, manifest
+
+
+def rolled_back(operation):
+    """Tempo de `operation` numa transação desfeita no fim."""
+    with transaction.atomic():
+        started = time.perf_counter()
+        operation()
+        elapsed = time.perf_counter() - started
+        transaction.set_rollback(True)
+    return elapsed
+
+
+def upload_one_by_one(source):
+    # sem throttling: mede o upload, não o limite de requisições
+    view = ImageUploadViewSet.as_view({"post": "create"}, throttle_classes=[])
+    factory = APIRequestFactory()
+    for name in sorted(os.listdir(source)):
+        with open(os.path.join(source, name), "rb") as file:
+            response = view(factory.post("/api/media/images/", {"file": file}, format="multipart"))
+        assert response.status_code == 201, response.data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--images", type=int, default=400)
+    parser.add_argument("--size-kb", type=int, default=256)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, keepdb=False)
+    directory = tempfile.mkdtemp(prefix="artelie-bench-")
+    try:
+        category = Category.objects.create(name="Pintura")
+        brand = Brand.objects.create(name="Acrilex")
+        supplier = Supplier.objects.create(name="Fornecedor", contact_email="contato@fornecedor.test")
+        products = Product.objects.bulk_create([
+            Product(name=f"produto {index}", price=10, stock=1, category=category, brand=brand, supplier=supplier)
+            for index in range(args.images)
+        ])
+        source, manifest = build_source(directory, products, args.size_kb)
+        total_mb = sum(os.path.getsize(os.path.join(source, name)) for name in os.listdir(source)) / 1024 / 1024
+        print(f"{args.images} imagens, {total_mb:.1f} MB (uma em cada 10 duplicada)")
+
+        scenarios = [("POST um a um (sem ligar produtos)", lambda: upload_one_by_one(source))]
+        for workers in args.workers:
+            scenarios.append((
+                f"import_images --workers {workers}",
+                lambda workers=workers: call_command("import_images", source, manifest, workers=workers,
+                                                     verbosity=0, stdout=StringIO(), stderr=StringIO()),
+            ))
+        for label, operation in scenarios:
+            media_root = tempfile.mkdtemp(dir=directory)
+            with override_settings(STORAGES=STORAGES, MEDIA_ROOT=media_root):
+                elapsed = rolled_back(operation)
+            print(f"  {label:<36} {elapsed:7.2f} s  {args.images / elapsed:8.1f} imagens/s")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark do bloqueio de login (artelie.lockout) com falhas concorrentes.
+
+Compara o contador em cache com o fallback no banco e com o modelo antigo
+(UPDATE na linha do usuário a cada falha), usando um banco de teste
+descartável. Uso:
+
+    python scripts/bench_login_lockout.py --threads 16 --attempts 200
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import OperationalError, close_old_connections, connection  # noqa: E402
+from django.db.models import F  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+
+from artelie.lockout import CacheCounterStore, DatabaseCounterStore, counter_key  # noqa: E402
+from artelie.models import User  # noqa: E402
+
+
+def run_concurrently(threads, attempts, operation):
+    def worker():
+        for _ in range(attempts):
+            while True:
+                try:
+                    operation()
+                    break
+                except OperationalError:
+                    # SQLite: "database is locked" sob disputa, tenta de novo
+                    time.sleep(0.001)
+        close_old_connections()
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--attempts", type=int, default=100, help="falhas por thread")
+    args = parser.parse_args()
+    total = args.threads * args.attempts
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, keepdb=False)
+    try:
+        user = User.objects.create_user("bench", "bench@artelie.test", "SenhaForte#2025")
+        key = counter_key("account", user.email)
+        window = 900
+
+        cache_store = CacheCounterStore(window)
+        database_store = DatabaseCounterStore(window)
+        scenarios = {
+            "cache (incr por bucket)": lambda: cache_store.hit(key, time.time()),
+            "banco (INSERT em LoginFailure)": lambda: database_store.hit(key, time.time()),
+            # o que User.increment_failed_attempts fazia: UPDATE na mesma linha
+            "antigo (UPDATE em artelie_user)": lambda: User.objects.filter(pk=user.pk).update(
+                updated_at=F("updated_at")
+            ),
+        }
+        print(f"{args.threads} threads × {args.attempts} falhas = {total} falhas por cenário")
+        for name, operation in scenarios.items():
+            elapsed = run_concurrently(args.threads, args.attempts, operation)
+            print(f"  {name:<34} {elapsed:8.3f}s  {total / elapsed:10.0f} falhas/s")
+
+        counted = sum(count for _, count in cache_store.events(key, time.time()))
+        print(f"falhas contadas no cache: {counted} de {total}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos backends de mídia locais (uploader.local_storage).
+
+Mede a vazão de gravação do FileSystemStorage do Django e do LocalStorage
+(com e sem fsync) em várias threads, e a vazão do upload de imagens pela
+API (ImageUploadViewSet) com o LocalStorage, tudo offline, num diretório
+temporário e num banco de teste descartável. Uso:
+
+    python scripts/bench_storage.py --files 2000 --size-kb 64 --threads 1 4 --uploads 300
+"""
+
+import argparse
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.files.base import ContentFile  # noqa: E402
+from django.core.files.storage import FileSystemStorage  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.test import override_settings  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from PIL import Image as PILImage  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from uploader.local_storage import LocalStorage  # noqa: E402
+from uploader.views import ImageUploadViewSet  # noqa: E402
+
+
+class LocalStorageWithoutFsync(LocalStorage):
+    fsync = False
+
+
+def save_all(storage, files, size_kb, threads):
+    payload = os.urandom(size_kb * 1024)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        # nomes repetidos a cada 100 arquivos: exercita as colisões
+        list(executor.map(lambda index: storage.save(f"images/{index % 100}.bin", ContentFile(payload)), range(files)))
+    return time.perf_counter() - started
+
+
+def noise_jpeg(side=512):
+    buffer = io.BytesIO()
+    PILImage.frombytes("RGB", (side, side), os.urandom(side * side * 3)).save(buffer, "JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def upload_all(uploads):
+    # sem throttling: mede o upload, não o limite de requisições
+    view = ImageUploadViewSet.as_view({"post": "create"}, throttle_classes=[])
+    factory = APIRequestFactory()
+    payloads = [noise_jpeg() for _ in range(uploads)]
+    started = time.perf_counter()
+    # transação desfeita no fim: a geração de variantes (no commit) fica de fora
+    with transaction.atomic():
+        for content in payloads:
+            file = io.BytesIO(content)
+            file.name = "foto.jpg"
+            response = view(factory.post("/api/media/images/", {"file": file}, format="multipart"))
+            assert response.status_code == 201, response.data
+        elapsed = time.perf_counter() - started
+        transaction.set_rollback(True)
+    return elapsed, sum(len(content) for content in payloads)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--size-kb", type=int, default=64)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--uploads", type=int, default=300)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="artelie-bench-")
+    backends = {
+        "FileSystemStorage": FileSystemStorage,
+        "LocalStorage": LocalStorage,
+        "LocalStorage sem fsync": LocalStorageWithoutFsync,
+    }
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, keepdb=False)
+    try:
+        print(f"gravação: {args.files} arquivos de {args.size_kb} KB")
+        for threads in args.threads:
+            for label, backend in backends.items():
+                storage = backend(location=tempfile.mkdtemp(dir=directory))
+                elapsed = save_all(storage, args.files, args.size_kb, threads)
+                print(f"  {label:<24} {threads:>2} thread(s)  {args.files / elapsed:9.1f} arquivos/s"
+                      f"  {args.files * args.size_kb / 1024 / elapsed:8.1f} MB/s")
+
+        storages = {"default": {"BACKEND": "uploader.local_storage.LocalStorage"}}
+        with override_settings(STORAGES=storages, MEDIA_ROOT=tempfile.mkdtemp(dir=directory)):
+            elapsed, total = upload_all(args.uploads)
+        print(f"upload pela API (LocalStorage): {args.uploads} imagens, {total / 1024 / 1024:.1f} MB")
+        print(f"  {args.uploads / elapsed:9.1f} imagens/s  {total / 1024 / 1024 / elapsed:8.1f} MB/s")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark do refresh de tokens (artelie.tokens) com a blacklist crescendo.
+
+Mede o refresh com rotação + blacklist da simplejwt e o do artelie.tokens
+com as tabelas do token_blacklist pré-carregadas em vários tamanhos, usando
+um banco de teste descartável. Uso:
+
+    python scripts/bench_token_refresh.py --sizes 0 10000 100000 --refreshes 300
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection, reset_queries  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer  # noqa: E402
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken  # noqa: E402
+from rest_framework_simplejwt.tokens import RefreshToken as SimpleJWTRefreshToken  # noqa: E402
+
+from artelie.models import User  # noqa: E402
+from artelie.tokens import ArtelieTokenRefreshSerializer, RefreshToken, outstanding_tokens  # noqa: E402
+
+
+def grow_tables(user, target, batch=5000):
+    """Completa as tabelas até `target` tokens, todos na blacklist."""
+    expires_at = timezone.now() + timedelta(days=7)
+    while OutstandingToken.objects.count() < target:
+        missing = min(batch, target - OutstandingToken.objects.count())
+        tokens = OutstandingToken.objects.bulk_create([
+            OutstandingToken(user=user, jti=uuid.uuid4().hex, token="x", expires_at=expires_at)
+            for _ in range(missing)
+        ])
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(token=token) for token in tokens])
+
+
+def run(serializer_class, token_class, user, refreshes):
+    raw = str(token_class.for_user(user))
+    queries = 0
+    started = time.perf_counter()
+    for _ in range(refreshes):
+        reset_queries()
+        serializer = serializer_class(data={"refresh": raw})
+        serializer.is_valid(raise_exception=True)
+        raw = serializer.validated_data["refresh"]
+        queries += len(connection.queries)
+    elapsed = time.perf_counter() - started
+    outstanding_tokens.flush()
+    return elapsed / refreshes * 1000, queries / refreshes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 10000, 100000])
+    parser.add_argument("--refreshes", type=int, default=300)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, keepdb=False)
+    connection.force_debug_cursor = True
+    try:
+        user = User.objects.create_user("bench", "bench@artelie.test", "SenhaForte#2025", is_active=True)
+        scenarios = {
+            "simplejwt": (TokenRefreshSerializer, SimpleJWTRefreshToken),
+            "artelie.tokens": (ArtelieTokenRefreshSerializer, RefreshToken),
+        }
+        print(f"{args.refreshes} refreshes por cenário")
+        for size in sorted(args.sizes):
+            grow_tables(user, size)
+            for name, (serializer_class, token_class) in scenarios.items():
+                per_refresh, queries = run(serializer_class, token_class, user, args.refreshes)
+                print(f"  {size:>8} tokens  {name:<16} {per_refresh:7.3f} ms/refresh  {queries:5.1f} queries")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memória do upload de imagens (uploader).
+
+Mede, com tracemalloc, o pico de memória alocado pela view de upload para
+imagens de vários tamanhos e limites de FILE_UPLOAD_MAX_MEMORY_SIZE, além
+da detecção de tipo antiga (magic.from_buffer(file.read())) contra a nova
+(cabeçalho limitado). O corpo da requisição é montado antes da medição,
+como se já estivesse no socket. Uso:
+
+    python scripts/bench_upload_memory.py --sizes-mb 0.25 2 16 --thresholds-mb 2.5 1
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+import magic  # noqa: E402
+from django.core.files.uploadedfile import InMemoryUploadedFile  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import override_settings  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from PIL import Image as PILImage  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from uploader.helpers.files import get_content_type  # noqa: E402
+from uploader.views import ImageUploadViewSet  # noqa: E402
+
+MB = 1024 * 1024
+
+
+def noise_png(size_mb):
+    """PNG de ruído (não comprime) com aproximadamente `size_mb` MB."""
+    side = int((size_mb * MB / 3) ** 0.5)
+    buffer = io.BytesIO()
+    PILImage.frombytes("RGB", (side, side), os.urandom(side * side * 3)).save(buffer, "PNG", compress_level=0)
+    return buffer.getvalue()
+
+
+def measure(operation):
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    operation()
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes-mb", type=float, nargs="+", default=[0.25, 2, 16])
+    parser.add_argument("--thresholds-mb", type=float, nargs="+", default=[2.5, 1])
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, keepdb=False)
+    media_root = tempfile.mkdtemp(prefix="artelie-bench-")
+    storages = {
+        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    }
+    view = ImageUploadViewSet.as_view({"post": "create"})
+    try:
+        payloads = {size: noise_png(size) for size in args.sizes_mb}
+
+        print("detecção de tipo (pico de memória):")
+        for size, content in payloads.items():
+            peaks = []
+            for sniff in (lambda file: magic.from_buffer(file.read(), mime=True), get_content_type):
+                buffer = io.BytesIO()
+                buffer.write(content)
+                file = InMemoryUploadedFile(buffer, "file", "f.png", "image/png", len(content), None)
+                file.seek(0)
+                peaks.append(measure(lambda: sniff(file)))
+            print(f"  {len(content) / MB:7.2f} MB  antiga {peaks[0] / MB:8.2f} MB  nova {peaks[1] / MB:8.2f} MB")
+
+        def post(content):
+            file = io.BytesIO(content)
+            file.name = "foto.png"
+            return APIRequestFactory().post("/api/media/images/", {"file": file, "description": "bench"}, format="multipart")
+
+        with override_settings(STORAGES=storages, MEDIA_ROOT=media_root):
+            # aquecimento: imports e caches da primeira requisição não entram na conta
+            view(post(payloads[min(payloads)]))
+
+        print("upload completo (pico de memória acima do corpo da requisição):")
+        for threshold in args.thresholds_mb:
+            settings = {"FILE_UPLOAD_MAX_MEMORY_SIZE": int(threshold * MB), "STORAGES": storages, "MEDIA_ROOT": media_root}
+            with override_settings(**settings):
+                for size, content in payloads.items():
+                    request = post(content)
+                    responses = []
+                    peak = measure(lambda: responses.append(view(request)))
+                    status = responses[0].status_code
+                    for upload in request.FILES.values():
+                        upload.close()
+                    print(f"  limite {threshold:5.2f} MB  arquivo {len(content) / MB:7.2f} MB"
+                          f"  pico {peak / MB:8.2f} MB  (HTTP {status})")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import shutil
+import tempfile
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from artelie.models import Brand, Category, Product, Supplier, User
+from artelie.batching import BatchInsertBuffer
+from artelie.tokens import blacklist_front
+from uploader.models import Image
+
+MEDIA_ROOT = tempfile.mkdtemp(prefix="artelie-tests-")
+
+# os testes não podem depender do Cloudinary: usa o storage local (MEDIA_STORAGE=local)
+# em um diretório temporário
+TEST_STORAGES = {
+    "default": {"BACKEND": "uploader.local_storage.LocalStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+# hash rápido: criar usuários não deve dominar o tempo dos testes
+TEST_PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+# variantes de imagem geradas na própria thread, dentro da transação do teste
+TEST_SETTINGS = {
+    "STORAGES": TEST_STORAGES,
+    "MEDIA_ROOT": MEDIA_ROOT,
+    "PASSWORD_HASHERS": TEST_PASSWORD_HASHERS,
+    "IMAGE_VARIANTS_ASYNC": False,
+    # um processo só: a memória local vale como cache compartilhado
+    "CACHE_SHARED": True,
+}
+
+
+class CatalogFactoryMixin:
+    """Helpers para montar usuários e o catálogo nos testes."""
+
+    def setUp(self):
+        super().setUp()
+        # o cache do catálogo (LocMemCache) sobrevive entre testes
+        cache.clear()
+        # idem para o estado em memória dos refresh tokens e dos lotes
+        blacklist_front.clear()
+        self.clear_batches()
+
+    def tearDown(self):
+        # lotes pendentes não podem ser gravados no atexit, com o banco de teste já destruído
+        self.clear_batches()
+        super().tearDown()
+
+    @staticmethod
+    def clear_batches():
+        for buffer in BatchInsertBuffer.instances:
+            buffer.clear()
+
+    @classmethod
+    def create_user(cls, username="cliente", **extra_fields):
+        extra_fields.setdefault("is_active", True)
+        return User.objects.create_user(
+            username=username,
+            email=f"{username}@artelie.test",
+            password="SenhaForte#2025",
+            **extra_fields,
+        )
+
+    @classmethod
+    def create_staff(cls, username="gerente"):
+        return cls.create_user(username=username, is_staff=True)
+
+    @classmethod
+    def create_image(cls, name="foto"):
+        return Image.objects.create(file=f"images/{name}.png", description=name)
+
+    @classmethod
+    def create_catalog(cls, size, prefix="produto"):
+        """Cria `size` produtos, cada um com sua imagem, categoria, marca e fornecedor."""
+        category, _ = Category.objects.get_or_create(name="Pintura")
+        brand, _ = Brand.objects.get_or_create(name="Acrilex", defaults={"image": cls.create_image("acrilex")})
+        supplier, _ = Supplier.objects.get_or_create(
+            name="Fornecedor Central", defaults={"contact_email": "contato@fornecedor.test"}
+        )
+        return [
+            Product.objects.create(
+                name=f"{prefix} {index:03d}",
+                description="Tinta acrílica de alta pigmentação.",
+                price=Decimal("19.90") + index,
+                stock=10,
+                category=category,
+                brand=brand,
+                supplier=supplier,
+                image=cls.create_image(f"{prefix}-{index}"),
+            )
+            for index in range(size)
+        ]
+
+
+@override_settings(**TEST_SETTINGS)
+class ArtelieAPITestCase(CatalogFactoryMixin, APITestCase):
+    """Base dos testes da API."""
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+
+@override_settings(**TEST_SETTINGS)
+class ArtelieTransactionTestCase(CatalogFactoryMixin, APITransactionTestCase):
+    """Base para testes com várias conexões/threads (commits reais)."""
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
@@ -0,0 +1,98 @@
+import io
+import threading
+import uuid
+
+from django.core.files.base import ContentFile, File
+from django.core.files.uploadedfile import TemporaryUploadedFile
+
+
+class StorageConformanceMixin:
+    """
+    Comportamento que todo backend de mídia precisa ter para o uploader
+    (uploader.models.blob, uploader.variants, artelie.image_import).
+
+    Subclasses implementam make_storage(); cada teste grava sob um prefixo
+    próprio para poder rodar contra um backend remoto compartilhado.
+    """
+
+    def make_storage(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        super().setUp()
+        self.storage = self.make_storage()
+        self.prefix = f"conformance/{uuid.uuid4().hex}"
+        self.saved = []
+
+    def tearDown(self):
+        for name in self.saved:
+            self.storage.delete(name)
+        super().tearDown()
+
+    def save(self, name, content):
+        name = self.storage.save(f"{self.prefix}/{name}", content)
+        self.saved.append(name)
+        return name
+
+    def read(self, name):
+        with self.storage.open(name, "rb") as file:
+            return file.read()
+
+    def test_saved_content_reads_back(self):
+        name = self.save("foto.jpg", ContentFile(b"conteudo" * 100))
+        self.assertTrue(self.storage.exists(name))
+        self.assertEqual(self.read(name), b"conteudo" * 100)
+        self.assertEqual(self.storage.size(name), 800)
+
+    def test_multi_chunk_content(self):
+        content = bytes(range(256)) * (3 * 1024 * 1024 // 256 + 7)
+        name = self.save("grande.bin", File(io.BytesIO(content), name="grande.bin"))
+        self.assertEqual(self.read(name), content)
+
+    def test_temporary_uploaded_file(self):
+        upload = TemporaryUploadedFile("foto.png", "image/png", 5, None)
+        upload.write(b"\x89PNG\r")
+        upload.seek(0)
+        try:
+            name = self.save("foto.png", upload)
+        finally:
+            upload.close()
+        self.assertEqual(self.read(name), b"\x89PNG\r")
+
+    def test_existing_names_are_never_overwritten(self):
+        first = self.save("foto.jpg", ContentFile(b"primeira"))
+        second = self.save("foto.jpg", ContentFile(b"segunda"))
+        self.assertNotEqual(first, second)
+        self.assertEqual(self.read(first), b"primeira")
+        self.assertEqual(self.read(second), b"segunda")
+
+    def test_concurrent_saves_of_one_name(self):
+        names, errors = [], []
+
+        def save(index):
+            try:
+                names.append(self.save("mesmo.bin", ContentFile(f"arquivo {index}".encode() * 1000)))
+            except Exception as exc:  # pylint: disable=broad-except
+                errors.append(exc)
+
+        threads = [threading.Thread(target=save, args=(index,)) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(set(names)), 8)
+        contents = {self.read(name) for name in names}
+        self.assertEqual(contents, {f"arquivo {index}".encode() * 1000 for index in range(8)})
+
+    def test_delete(self):
+        name = self.save("apagar.txt", ContentFile(b"x"))
+        self.storage.delete(name)
+        self.assertFalse(self.storage.exists(name))
+        # apagar um nome inexistente não é erro
+        self.storage.delete(name)
+
+    def test_url_points_at_the_name(self):
+        name = self.save("foto.jpg", ContentFile(b"x"))
+        self.assertIn(name.rsplit("/", 1)[-1].rsplit(".", 1)[0], self.storage.url(name))
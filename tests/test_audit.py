@@ -0,0 +1,173 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+from artelie.audit import audit, audit_events
+from artelie.log_handlers import JsonFormatter, QueuedFileHandler, SizedTimedRotatingFileHandler
+from artelie.models import AuditEvent
+from artelie.tokens import RefreshToken, outstanding_tokens
+from tests.base import ArtelieAPITestCase, ArtelieTransactionTestCase
+
+
+def make_record(message="evento", **extra):
+    record = logging.LogRecord("artelie.audit", logging.INFO, __file__, 1, message, (), None)
+    record.__dict__.update(extra)
+    return record
+
+
+class LogHandlerTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="artelie-logs-")
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.filename = os.path.join(self.directory, "auth.log")
+
+    def test_json_formatter_puts_extra_fields_on_top(self):
+        data = json.loads(JsonFormatter().format(make_record(action="user.created", ip="10.0.0.1")))
+        self.assertEqual(data["message"], "evento")
+        self.assertEqual(data["level"], "INFO")
+        self.assertEqual(data["action"], "user.created")
+        self.assertEqual(data["ip"], "10.0.0.1")
+
+    def test_size_rotation_keeps_every_file_of_the_interval(self):
+        handler = SizedTimedRotatingFileHandler(self.filename, max_bytes=200, when="midnight", backupCount=10)
+        handler.setFormatter(JsonFormatter())
+        for index in range(10):
+            handler.emit(make_record(f"registro {index:02d}"))
+        handler.close()
+
+        files = sorted(os.listdir(self.directory))
+        self.assertGreater(len(files), 2)
+        lines = []
+        for name in files:
+            with open(os.path.join(self.directory, name), encoding="utf-8") as log:
+                lines.extend(json.loads(line)["message"] for line in log)
+        self.assertEqual(sorted(lines), [f"registro {index:02d}" for index in range(10)])
+
+    def test_queued_handler_writes_json_off_thread(self):
+        handler = QueuedFileHandler(self.filename)
+        try:
+            handler.handle(make_record("fila", action="user.updated"))
+            handler.flush()
+        finally:
+            handler.close()
+        with open(self.filename, encoding="utf-8") as log:
+            data = json.loads(log.readline())
+        self.assertEqual(data["message"], "fila")
+        self.assertEqual(data["action"], "user.updated")
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = QueuedFileHandler(self.filename, queue_size=1)
+        handler.listener.stop()
+        try:
+            handler.handle(make_record("primeiro"))
+            handler.handle(make_record("segundo"))
+            self.assertEqual(handler.dropped, 1)
+        finally:
+            handler.close()
+
+
+@override_settings(AUDIT_BATCH_SIZE=2, AUDIT_FLUSH_INTERVAL=3600)
+class AuditEventTests(ArtelieAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = cls.create_staff()
+        cls.customer = cls.create_user("cliente")
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.staff)
+
+    def test_update_diff_comes_from_the_loaded_instance(self):
+        with self.assertLogs("artelie.audit", "INFO"):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.patch(
+                    f"/api/users/{self.customer.pk}/", {"full_name": "Cliente Novo"}, format="json"
+                )
+        self.assertEqual(response.status_code, 200)
+        selects = [
+            q["sql"] for q in context.captured_queries
+            if q["sql"].startswith("SELECT") and 'FROM "artelie_user"' in q["sql"]
+        ]
+        self.assertEqual(len(selects), 1)
+
+        audit_events.flush()
+        event = AuditEvent.objects.get(action="user.updated")
+        self.assertEqual(event.changes, {"full_name": ["", "Cliente Novo"]})
+        self.assertEqual(event.actor_id, self.staff.pk)
+        self.assertEqual(event.target_id, str(self.customer.pk))
+
+    def test_ip_comes_from_the_trusted_address(self):
+        # o X-Forwarded-For é do cliente sem proxy confiável (NUM_PROXIES)
+        with self.assertLogs("artelie.audit", "INFO"):
+            self.client.patch(
+                f"/api/users/{self.customer.pk}/", {"full_name": "Outro Nome"}, format="json",
+                REMOTE_ADDR="10.0.0.7", HTTP_X_FORWARDED_FOR="203.0.113.66",
+            )
+        audit_events.flush()
+        self.assertEqual(AuditEvent.objects.get(action="user.updated").ip, "10.0.0.7")
+
+    def test_events_are_inserted_in_batches(self):
+        with self.assertLogs("artelie.audit", "INFO"):
+            with self.captureOnCommitCallbacks(execute=True):
+                audit("user.created", self.customer, actor=self.staff)
+            self.assertEqual(AuditEvent.objects.count(), 0)
+            with CaptureQueriesContext(connection) as context:
+                with self.captureOnCommitCallbacks(execute=True):
+                    audit("user.updated", self.customer, actor=self.staff)
+        inserts = [q for q in context.captured_queries if q["sql"].startswith("INSERT")]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(AuditEvent.objects.count(), 2)
+
+    def test_destroy_is_audited(self):
+        with self.assertLogs("artelie.audit", "WARNING") as logs:
+            response = self.client.delete(f"/api/users/{self.customer.pk}/")
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(logs.records[0].action, "user.deactivated")
+        audit_events.flush()
+        self.assertEqual(AuditEvent.objects.get().changes, {"is_active": [True, False]})
+
+
+@override_settings(
+    AUDIT_BATCH_SIZE=50, AUDIT_FLUSH_INTERVAL=0.05,
+    OUTSTANDING_TOKEN_BATCH_SIZE=50, OUTSTANDING_TOKEN_FLUSH_INTERVAL=0.05,
+)
+class IdleFlushTests(ArtelieTransactionTestCase):
+    """Lotes incompletos são gravados pelo timer, sem esperar outro evento."""
+
+    def wait_for(self, condition, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return condition()
+
+    def test_idle_batches_are_written_after_the_interval(self):
+        user = self.create_user("ocioso")
+        with self.assertLogs("artelie.audit", "INFO"):
+            audit("user.created", user, actor=user)
+        RefreshToken.for_user(user)
+
+        self.assertTrue(self.wait_for(lambda: AuditEvent.objects.count() == 1))
+        self.assertTrue(self.wait_for(lambda: OutstandingToken.objects.filter(user=user).count() == 1))
+        self.assertEqual(audit_events.rows, [])
+        self.assertEqual(outstanding_tokens.rows, [])
+
+    @override_settings(AUDIT_FLUSH_INTERVAL=3600)
+    def test_flush_cancels_the_timer(self):
+        user = self.create_user("manual")
+        with self.assertLogs("artelie.audit", "INFO"):
+            audit("user.created", user, actor=user)
+        timer = audit_events.timer
+        self.assertTrue(timer.is_alive())
+        self.assertEqual(audit_events.flush(), 1)
+        timer.join(5)
+        self.assertFalse(timer.is_alive())
+        self.assertIsNone(audit_events.timer)
@@ -0,0 +1,165 @@
+import hashlib
+import io
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image as PILImage
+
+from uploader.handlers import TemporaryFileUploadHandler
+from uploader.models import Blob, Document, Image, ImageVariant
+from tests.base import ArtelieAPITestCase
+
+
+def image_bytes(color=(10, 120, 200), size=(640, 480)):
+    buffer = io.BytesIO()
+    PILImage.new("RGB", size, color).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+class BlobDeduplicationTests(ArtelieAPITestCase):
+    def upload(self, data, path="/api/media/images/"):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(path, data, format="multipart")
+        return response
+
+    def upload_image(self, content):
+        response = self.upload({"file": SimpleUploadedFile("foto.jpg", content, content_type="image/jpeg")})
+        self.assertEqual(response.status_code, 201, response.data)
+        return Image.objects.get(attachment_key=response.data["attachment_key"])
+
+    def test_identical_uploads_share_one_blob(self):
+        content = image_bytes()
+        first = self.upload_image(content)
+        second = self.upload_image(content)
+
+        self.assertNotEqual(first.attachment_key, second.attachment_key)
+        self.assertEqual(first.file.name, second.file.name)
+        blob = Blob.objects.get()
+        self.assertEqual(blob.digest, hashlib.sha256(content).hexdigest())
+        self.assertEqual(blob.ref_count, 2)
+        # the storage may shard the directory, the name is the digest
+        self.assertRegex(first.file.name, rf"^images/(\S+/)?{blob.digest}\.jpg$")
+
+        different = self.upload_image(image_bytes(color=(0, 0, 0)))
+        self.assertNotEqual(different.blob_id, blob.pk)
+
+    def test_lost_race_keeps_a_file_named_by_content(self):
+        content = image_bytes()
+        blob = self.upload_image(content).blob
+        image = Image(file=SimpleUploadedFile("foto.jpg", content, content_type="image/jpeg"))
+        storage = image.file.storage
+        acquire = Blob.objects.acquire
+
+        # the winner's row is not visible yet on the first lookup, and the
+        # storage (like Cloudinary) gives the same content the same name
+        with mock.patch.object(Blob.objects, "acquire", side_effect=[None, acquire(blob.digest)]), \
+                mock.patch.object(storage, "save", return_value=blob.file.name), \
+                mock.patch.object(storage, "delete") as delete:
+            claimed = Blob.objects.claim(image.file)
+        delete.assert_not_called()
+        self.assertEqual(claimed.pk, blob.pk)
+        self.assertEqual(Blob.objects.get().ref_count, 2)
+
+        # a distinct copy is still removed
+        with mock.patch.object(Blob.objects, "acquire", side_effect=[None, acquire(blob.digest)]), \
+                mock.patch.object(storage, "save", return_value="images/copia.jpg"), \
+                mock.patch.object(storage, "delete") as delete:
+            Blob.objects.claim(image.file)
+        delete.assert_called_once_with("images/copia.jpg")
+
+    def test_handler_hashes_while_streaming(self):
+        content = image_bytes()
+        handler = TemporaryFileUploadHandler()
+        handler.new_file("file", "foto.jpg", "image/jpeg", len(content))
+        for start in range(0, len(content), 1000):
+            handler.receive_data_chunk(content[start:start + 1000], start)
+        file = handler.file_complete(len(content))
+        self.assertEqual(file.content_digest, hashlib.sha256(content).hexdigest())
+        file.close()
+
+    def test_upload_by_digest_skips_the_transfer(self):
+        content = image_bytes()
+        original = self.upload_image(content)
+        digest = hashlib.sha256(content).hexdigest()
+
+        response = self.upload({"digest": digest, "description": "de novo"})
+        self.assertEqual(response.status_code, 201, response.data)
+        image = Image.objects.get(attachment_key=response.data["attachment_key"])
+        self.assertEqual(image.file.name, original.file.name)
+        self.assertEqual(Blob.objects.get().ref_count, 2)
+
+        response = self.upload({"digest": "0" * 64})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("digest", response.data)
+        self.assertEqual(self.upload({"description": "sem nada"}).status_code, 400)
+
+    def test_known_content_reuses_variants(self):
+        content = image_bytes()
+        first = self.upload_image(content)
+        second = self.upload_image(content)
+
+        first_files = set(ImageVariant.objects.filter(image=first).values_list("file", flat=True))
+        second_files = set(ImageVariant.objects.filter(image=second).values_list("file", flat=True))
+        self.assertEqual(len(first_files), 6)
+        self.assertEqual(first_files, second_files)
+        self.assertEqual(second.variant_files, first.variant_files)
+
+    def test_last_reference_deletes_the_file(self):
+        content = image_bytes()
+        first = self.upload_image(content)
+        second = self.upload_image(content)
+        storage = first.file.storage
+        variant_name = ImageVariant.objects.filter(image=first).values_list("file", flat=True).first()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertEqual(Blob.objects.get().ref_count, 1)
+        self.assertTrue(storage.exists(second.file.name))
+        self.assertTrue(storage.exists(variant_name))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(Blob.objects.exists())
+        self.assertFalse(storage.exists(second.file.name))
+        self.assertFalse(storage.exists(variant_name))
+
+    def test_sparse_rows_release_the_replaced_blob(self):
+        first = self.upload_image(image_bytes())
+        self.upload_image(image_bytes(color=(0, 0, 0)))
+
+        # .only() without the blob column costs no query per row
+        with self.assertNumQueries(1):
+            images = list(Image.objects.only("id", "description"))
+        self.assertEqual(len(images), 2)
+
+        sparse = next(image for image in images if image.pk == first.pk)
+        sparse.file = SimpleUploadedFile("nova.jpg", image_bytes(color=(0, 200, 0)), content_type="image/jpeg")
+        with self.captureOnCommitCallbacks(execute=True):
+            sparse.save()
+        self.assertFalse(Blob.objects.filter(pk=first.blob_id).exists())
+        self.assertEqual(Blob.objects.count(), 2)
+
+    def test_release_keeps_a_file_claimed_again_before_commit(self):
+        content = image_bytes()
+        image = self.upload_image(content)
+        blob = image.blob
+        storage = image.file.storage
+
+        with self.captureOnCommitCallbacks(execute=True):
+            image.delete()
+            # a claim() of the same content, on a storage that names files by
+            # content, lands on the same name before the deletion callback runs
+            Blob.objects.create(
+                digest=blob.digest, file=blob.file.name, content_type=blob.content_type, size=blob.size, ref_count=1
+            )
+        self.assertTrue(storage.exists(blob.file.name))
+
+    def test_documents_are_deduplicated(self):
+        pdf = b"%PDF-1.4\n" + b"1" * 5000 + b"\n%%EOF\n"
+        for _ in range(2):
+            response = self.upload({"file": SimpleUploadedFile("a.pdf", pdf)}, path="/api/media/documents/")
+            self.assertEqual(response.status_code, 201, response.data)
+        names = set(Document.objects.values_list("file", flat=True))
+        self.assertEqual(len(names), 1)
+        self.assertRegex(names.pop(), rf"^documents/(\S+/)?{hashlib.sha256(pdf).hexdigest()}\.pdf$")
+        self.assertEqual(Blob.objects.get().ref_count, 2)
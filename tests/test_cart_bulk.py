@@ -0,0 +1,64 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from artelie.models import Cart, CartItem
+from tests.base import ArtelieAPITestCase
+
+
+class CartBulkTests(ArtelieAPITestCase):
+    url = "/api/cart-items/bulk/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = cls.create_user()
+        cls.products = cls.create_catalog(4)
+
+    def setUp(self):
+        self.client.force_authenticate(self.customer)
+
+    def quantities(self, response):
+        return {item["product"]: item["quantity"] for item in response.data["items"]}
+
+    def test_post_upserts_and_returns_the_cart(self):
+        cart = Cart.objects.create(user=self.customer)
+        CartItem.objects.create(cart=cart, product=self.products[0], quantity=1)
+        CartItem.objects.create(cart=cart, product=self.products[1], quantity=1)
+        payload = {"items": [
+            {"product": self.products[1].pk, "quantity": 3},
+            {"product": self.products[2].pk, "quantity": 2},
+            {"product": self.products[2].pk, "quantity": 1},
+        ]}
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data["id"], cart.pk)
+        self.assertEqual(self.quantities(response), {
+            self.products[0].pk: 1, self.products[1].pk: 3, self.products[2].pk: 3,
+        })
+
+    def test_put_replaces_the_cart(self):
+        cart = Cart.objects.create(user=self.customer)
+        CartItem.objects.create(cart=cart, product=self.products[0], quantity=5)
+        response = self.client.put(self.url, {"items": [{"product": self.products[3].pk}]}, format="json")
+        self.assertEqual(self.quantities(response), {self.products[3].pk: 1})
+
+    def test_cart_is_created_on_first_sync(self):
+        response = self.client.post(self.url, {"items": [{"product": self.products[0].pk}]}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(Cart.objects.filter(user=self.customer).exists())
+
+    def test_unknown_products_reject_the_whole_batch(self):
+        payload = {"items": [{"product": self.products[0].pk}, {"product": 999}]}
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("999", str(response.data["items"]))
+        self.assertFalse(CartItem.objects.exists())
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        def sync(products):
+            items = [{"product": product.pk, "quantity": 2} for product in products]
+            with CaptureQueriesContext(connection) as context:
+                self.client.post(self.url, {"items": items}, format="json")
+            return len(context.captured_queries)
+
+        self.client.post(self.url, {"items": []}, format="json")  # cria o carrinho
+        self.assertEqual(sync(self.products[:1]), sync(self.products))
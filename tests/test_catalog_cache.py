@@ -0,0 +1,89 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from artelie.models import Product
+from tests.base import ArtelieAPITestCase
+
+
+class CatalogCacheTests(ArtelieAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = cls.create_catalog(3)
+        cls.user = cls.create_user()
+
+    def get_query_count(self, url, params=None):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200)
+        return response, len(context.captured_queries)
+
+    def test_repeated_anonymous_request_skips_database(self):
+        for url in ("/api/products/", f"/api/products/{self.products[0].pk}/", "/api/category/", "/api/brands/"):
+            with self.subTest(url=url):
+                first, first_queries = self.get_query_count(url)
+                second, second_queries = self.get_query_count(url)
+                self.assertGreater(first_queries, 0)
+                self.assertEqual(second_queries, 0)
+                self.assertEqual(first.data, second.data)
+
+    @override_settings(CACHE_SHARED=False, DEBUG=False)
+    def test_unshared_cache_is_not_used(self):
+        # cada worker teria a sua versão: uma edição não invalidaria os outros
+        self.get_query_count("/api/products/")
+        _, queries = self.get_query_count("/api/products/")
+        self.assertGreater(queries, 0)
+
+    def test_query_params_are_part_of_the_key(self):
+        self.get_query_count("/api/products/", {"ordering": "price", "page_size": 1})
+        response, queries = self.get_query_count("/api/products/", {"ordering": "-price", "page_size": 1})
+        self.assertGreater(queries, 0)
+        self.assertEqual(response.data["results"][0]["id"], self.products[-1].pk)
+        # mesma consulta com os parâmetros em outra ordem reaproveita a entrada
+        _, queries = self.get_query_count("/api/products/", {"page_size": 1, "ordering": "-price"})
+        self.assertEqual(queries, 0)
+
+    def test_saving_a_product_invalidates_cached_responses(self):
+        product = self.products[0]
+        self.get_query_count(f"/api/products/{product.pk}/")
+        self.get_query_count("/api/category/", {"products": 3})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            product.name = "pincel chato"
+            product.save()
+
+        response, queries = self.get_query_count(f"/api/products/{product.pk}/")
+        self.assertGreater(queries, 0)
+        self.assertEqual(response.data["name"], "pincel chato")
+        response, queries = self.get_query_count("/api/category/", {"products": 3})
+        self.assertGreater(queries, 0)
+        self.assertIn("pincel chato", [item["name"] for item in response.data["results"][0]["products"]])
+
+    def test_queryset_updates_invalidate_through_explicit_bumps(self):
+        product = self.products[0]
+        self.get_query_count(f"/api/products/{product.pk}/")
+        self.client.force_authenticate(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/api/reviews/", {"product": product.pk, "rating": 5, "comment": "Ótima"}, format="json"
+            )
+        self.assertEqual(response.status_code, 201, response.data)
+        self.client.force_authenticate(None)
+
+        response, queries = self.get_query_count(f"/api/products/{product.pk}/")
+        self.assertGreater(queries, 0)
+        self.assertEqual(response.data["rating_count"], 1)
+
+    def test_authenticated_requests_bypass_the_cache(self):
+        self.get_query_count("/api/products/")
+        self.client.force_authenticate(self.user)
+        _, queries = self.get_query_count("/api/products/")
+        self.assertGreater(queries, 0)
+
+    def test_errors_are_not_cached(self):
+        missing = Product.objects.order_by("-pk").first().pk + 1
+        for _ in range(2):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(f"/api/products/{missing}/")
+            self.assertEqual(response.status_code, 404)
+            self.assertGreater(len(context.captured_queries), 0)
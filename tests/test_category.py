@@ -0,0 +1,51 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from artelie.models import Category, Product
+from tests.base import ArtelieAPITestCase
+
+
+class CategoryListingTests(ArtelieAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_catalog(5, prefix="tinta")
+        cls.painting = Category.objects.get(name="Pintura")
+        cls.drawing = Category.objects.create(name="Desenho")
+        for product in Product.objects.all()[:2]:
+            Product.objects.create(
+                name=f"lápis {product.pk}", price=5, stock=1, category=cls.drawing,
+                brand=product.brand, supplier=product.supplier,
+            )
+
+    def get_counting_queries(self, url, params=None):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200)
+        return response, len(context.captured_queries)
+
+    def test_listing_returns_counts_instead_of_products(self):
+        response, _ = self.get_counting_queries("/api/category/")
+        counts = {category["name"]: category["product_count"] for category in response.data["results"]}
+        self.assertEqual(counts, {"Desenho": 2, "Pintura": 5})
+        self.assertNotIn("products", response.data["results"][0])
+
+    def test_product_preview_uses_a_single_query(self):
+        response, queries = self.get_counting_queries("/api/category/", {"products": 3})
+        # COUNT da paginação + categorias + prévia de produtos
+        self.assertEqual(queries, 3)
+        previews = {category["name"]: category["products"] for category in response.data["results"]}
+        self.assertEqual(len(previews["Pintura"]), 3)
+        self.assertEqual(len(previews["Desenho"]), 2)
+        self.assertEqual(previews["Pintura"][0]["name"], "tinta 000")
+
+    def test_product_preview_is_capped(self):
+        response, _ = self.get_counting_queries("/api/category/", {"products": 500})
+        painting = next(item for item in response.data["results"] if item["name"] == "Pintura")
+        self.assertEqual(len(painting["products"]), 5)
+
+    def test_products_action_is_paginated(self):
+        url = f"/api/category/{self.painting.pk}/products/"
+        response, _ = self.get_counting_queries(url, {"page_size": 2, "compact": "true"})
+        self.assertEqual(response.data["count"], 5)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertEqual(set(response.data["results"][0]), {"id", "name", "price", "image_url", "rating_avg", "rating_count"})
@@ -0,0 +1,112 @@
+import threading
+import time
+from decimal import Decimal
+
+from django.db import OperationalError, close_old_connections, connection
+
+from artelie.models import Cart, CartItem, Order, OrderItem, Product
+from artelie.models.cart import CheckoutError, OutOfStockError
+from tests.base import ArtelieAPITestCase, ArtelieTransactionTestCase
+
+
+class CheckoutTests(ArtelieAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = cls.create_user()
+        cls.brush, cls.paint = cls.create_catalog(2)  # 19.90 e 20.90, estoque 10
+        cls.cart = Cart.objects.create(user=cls.customer)
+
+    def setUp(self):
+        self.client.force_authenticate(self.customer)
+
+    def test_checkout_creates_order_and_decrements_stock(self):
+        CartItem.objects.create(cart=self.cart, product=self.brush, quantity=2)
+        CartItem.objects.create(cart=self.cart, product=self.paint, quantity=3)
+        response = self.client.post("/api/carts/checkout/")
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data["total_amount"], "102.50")
+
+        order = Order.objects.get(pk=response.data["id"])
+        self.assertEqual(
+            sorted(order.items.values_list("product_id", "quantity", "unit_price")),
+            [(self.brush.pk, 2, Decimal("19.90")), (self.paint.pk, 3, Decimal("20.90"))],
+        )
+        self.assertEqual(Product.objects.get(pk=self.brush.pk).stock, 8)
+        self.assertEqual(Product.objects.get(pk=self.paint.pk).stock, 7)
+        self.assertFalse(self.cart.items.exists())
+
+    def test_out_of_stock_rolls_everything_back(self):
+        CartItem.objects.create(cart=self.cart, product=self.brush, quantity=1)
+        CartItem.objects.create(cart=self.cart, product=self.paint, quantity=11)
+        response = self.client.post("/api/carts/checkout/")
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data["product"], self.paint.pk)
+        self.assertEqual(Product.objects.get(pk=self.brush.pk).stock, 10)
+        self.assertEqual(self.cart.items.count(), 2)
+        self.assertFalse(Order.objects.exists())
+
+    def test_empty_cart_is_rejected(self):
+        response = self.client.post("/api/carts/checkout/")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(OrderItem.objects.exists())
+
+
+class CheckoutContentionTests(ArtelieTransactionTestCase):
+    """Vários compradores disputando o mesmo produto ao mesmo tempo."""
+
+    buyers = 12
+    stock = 5
+
+    def setUp(self):
+        (self.product,) = self.create_catalog(1)
+        Product.objects.filter(pk=self.product.pk).update(stock=self.stock)
+        self.carts = []
+        for index in range(self.buyers):
+            cart = Cart.objects.create(user=self.create_user(f"comprador{index}"))
+            CartItem.objects.create(cart=cart, product=self.product, quantity=1)
+            self.carts.append(cart)
+
+    def checkout_with_retry(self, cart, results, barrier):
+        barrier.wait()
+        try:
+            for attempt in range(100):
+                try:
+                    cart.checkout()
+                    results.append("ok")
+                    return
+                except OutOfStockError:
+                    results.append("sem estoque")
+                    return
+                except OperationalError:
+                    # o SQLite dos testes trava o banco inteiro em vez de
+                    # linhas; o cliente tenta de novo
+                    time.sleep(0.005 * (attempt + 1))
+            results.append("desistiu")
+        finally:
+            close_old_connections()
+            connection.close()
+
+    def test_parallel_buyers_never_oversell(self):
+        results, barrier = [], threading.Barrier(self.buyers)
+        threads = [
+            threading.Thread(target=self.checkout_with_retry, args=(cart, results, barrier))
+            for cart in self.carts
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results.count("ok"), self.stock)
+        self.assertEqual(results.count("sem estoque"), self.buyers - self.stock)
+        self.assertEqual(Product.objects.get(pk=self.product.pk).stock, 0)
+        self.assertEqual(OrderItem.objects.count(), self.stock)
+        self.assertEqual(CartItem.objects.count(), self.buyers - self.stock)
+
+    def test_same_cart_cannot_be_checked_out_twice(self):
+        cart = self.carts[0]
+        CartItem.objects.filter(cart=cart).update(quantity=2)
+        cart.checkout()
+        with self.assertRaises(CheckoutError):
+            cart.checkout()
+        self.assertEqual(Product.objects.get(pk=self.product.pk).stock, self.stock - 2)
@@ -0,0 +1,155 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
+
+from artelie.models import Product, Review
+from tests.base import ArtelieAPITestCase
+
+
+class ConditionalRequestTests(ArtelieAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = cls.create_catalog(3)
+        cls.staff = cls.create_staff()
+
+    def setUp(self):
+        super().setUp()
+        # autenticado: passa direto pelo cache do catálogo
+        self.client.force_authenticate(self.staff)
+
+    def test_detail_returns_validators_and_304(self):
+        url = f"/api/products/{self.products[0].pk}/"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        self.assertTrue(response.has_header("Last-Modified"))
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(len(context.captured_queries), 1)
+
+        product = self.products[0]
+        product.price = 1
+        product.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_if_modified_since_on_detail(self):
+        product = self.products[0]
+        future = http_date(product.updated_at.timestamp() + 60)
+        response = self.client.get(f"/api/products/{product.pk}/", HTTP_IF_MODIFIED_SINCE=future)
+        self.assertEqual(response.status_code, 304)
+
+    def test_list_etag_changes_with_rows_and_representation(self):
+        response = self.client.get("/api/products/")
+        etag = response["ETag"]
+        self.assertFalse(response.has_header("Last-Modified"))
+        self.assertEqual(self.client.get("/api/products/", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # outra representação, outro ETag
+        compact = self.client.get("/api/products/", {"compact": "true"})
+        self.assertNotEqual(compact["ETag"], etag)
+
+        # remoção não altera o maior updated_at, mas muda o ETag
+        self.products[-1].delete()
+        self.assertEqual(self.client.get("/api/products/", HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_sparse_list_still_reads_updated_at(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get("/api/products/", {"fields": "id,name"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.has_header("ETag"))
+        self.assertEqual(len(context.captured_queries), 2)
+
+    def test_category_preview_change_changes_etag(self):
+        params = {"products": 3}
+        etag = self.client.get("/api/category/", params)["ETag"]
+        product = self.products[0]
+        product.name = "pincel redondo"
+        product.save()
+        response = self.client.get("/api/category/", params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_if_match_guards_writes(self):
+        url = f"/api/products/{self.products[0].pk}/"
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.patch(url, {"stock": 7}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        new_etag = response["ETag"]
+        self.assertNotEqual(new_etag, etag)
+        self.assertEqual(self.client.get(url)["ETag"], new_etag)
+
+        # escrita com a versão antiga perde a corrida
+        response = self.client.patch(url, {"stock": 1}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        self.assertIn("error", response.data)
+        self.assertEqual(Product.objects.get(pk=self.products[0].pk).stock, 7)
+
+        response = self.client.delete(url, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        self.assertTrue(Product.objects.filter(pk=self.products[0].pk).exists())
+
+        response = self.client.delete(url, HTTP_IF_MATCH=new_etag)
+        self.assertEqual(response.status_code, 204)
+
+    def test_if_none_match_on_write_fails_when_current(self):
+        url = f"/api/products/{self.products[0].pk}/"
+        etag = self.client.get(url)["ETag"]
+        response = self.client.patch(url, {"stock": 2}, format="json", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        response = self.client.patch(url, {"stock": 2}, format="json", HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(response.status_code, 412)
+
+    def test_reviews_have_validators_and_carts_do_not(self):
+        review = Review.objects.create(product=self.products[0], user=self.staff, rating=4)
+        response = self.client.get(f"/api/reviews/{review.pk}/")
+        self.assertTrue(response.has_header("ETag"))
+        self.assertFalse(self.client.get("/api/carts/").has_header("ETag"))
+
+    def test_review_etag_follows_the_author(self):
+        review = Review.objects.create(product=self.products[0], user=self.staff, rating=4)
+        url = f"/api/reviews/{review.pk}/"
+        etag = self.client.get(url)["ETag"]
+        self.staff.username = "gerente-novo"
+        self.staff.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("gerente-novo", response.data["user"])
+
+    def test_user_etag_follows_the_profile_image(self):
+        image = self.create_image("perfil")
+        self.staff.profile_image = image
+        self.staff.save()
+        url = f"/api/users/{self.staff.pk}/"
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # variantes geradas depois: muda o srcset sem tocar no usuário
+        image.variant_files = {"webp": [[160, "images/variants/perfil/thumbnail.webp"]]}
+        image.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("webp", response.data["perfil"]["srcset"])
+
+
+class CachedConditionalRequestTests(ArtelieAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = cls.create_catalog(2)
+
+    def test_cached_response_answers_304_without_queries(self):
+        url = f"/api/products/{self.products[0].pk}/"
+        etag = self.client.get(url)["ETag"]
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(context.captured_queries), 0)
+        cached = self.client.get(url)
+        self.assertEqual(cached["ETag"], etag)
+        self.assertTrue(cached.has_header("Last-Modified"))
@@ -0,0 +1,140 @@
+import re
+from datetime import timedelta
+from io import StringIO
+from smtplib import SMTPRecipientsRefused
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from artelie.mail import claim_batch, deliver_batch, enqueue_email
+from artelie.models import EmailVerificationToken, OutgoingEmail
+from tests.base import ArtelieAPITestCase
+
+
+class CountingBackend(EmailBackend):
+    """locmem que conta conexões abertas e recusa destinatários @recusa.test."""
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return True
+
+    def send_messages(self, messages):
+        for message in messages:
+            if any(address.endswith("@recusa.test") for address in message.to):
+                raise SMTPRecipientsRefused({message.to[0]: (550, b"mailbox unavailable")})
+        return super().send_messages(messages)
+
+
+class DownBackend(EmailBackend):
+    def open(self):
+        raise ConnectionRefusedError("smtp fora do ar")
+
+
+class EmailOutboxTests(ArtelieAPITestCase):
+    def setUp(self):
+        super().setUp()
+        CountingBackend.opened = 0
+
+    def drain(self, **options):
+        out = StringIO()
+        call_command("send_queued_emails", stdout=out, **options)
+        return out.getvalue()
+
+    def test_register_enqueues_instead_of_sending(self):
+        response = self.client.post("/api/register/", {
+            "username": "novo_cliente",
+            "email": "novo@artelie.test",
+            "password": "SenhaForte#2025",
+            "password_confirm": "SenhaForte#2025",
+        }, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertTrue(response.data["email_verification_sent"])
+        self.assertEqual(mail.outbox, [])
+
+        queued = OutgoingEmail.objects.get()
+        self.assertEqual(queued.to, "novo@artelie.test")
+        self.assertEqual(queued.status, OutgoingEmail.PENDING)
+        token = re.search(r"/verify-email/(\S+)", queued.body_text).group(1)
+        self.assertIn(token, queued.body_html)
+        self.assertEqual(EmailVerificationToken.lookup(token).user.email, "novo@artelie.test")
+
+        self.assertIn("1 enviado(s)", self.drain())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].alternatives[0][1], "text/html")
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, OutgoingEmail.SENT)
+        self.assertIsNotNone(queued.sent_at)
+
+    def test_resend_verification_enqueues_a_new_token(self):
+        user = self.create_user("pendente", is_active=False)
+        response = self.client.post("/api/resend-verification/", {"email": user.email}, format="json")
+        self.assertEqual(response.status_code, 200)
+        queued = OutgoingEmail.objects.get(to=user.email)
+        token = re.search(r"/verify-email/(\S+)", queued.body_text).group(1)
+        self.assertEqual(EmailVerificationToken.lookup(token).user, user)
+
+    @override_settings(EMAIL_BACKEND="tests.test_email_outbox.CountingBackend")
+    def test_one_connection_per_batch(self):
+        for index in range(5):
+            enqueue_email(f"cliente{index}@artelie.test", "Pedido", "corpo")
+        self.assertIn("5 enviado(s)", self.drain(batch_size=2))
+        self.assertEqual(len(mail.outbox), 5)
+        # 5 emails em lotes de 2: três conexões
+        self.assertEqual(CountingBackend.opened, 3)
+
+    @override_settings(
+        EMAIL_BACKEND="tests.test_email_outbox.CountingBackend",
+        EMAIL_OUTBOX_RETRY_DELAY=60,
+    )
+    def test_failures_are_retried_with_backoff_then_given_up(self):
+        ok = enqueue_email("cliente@artelie.test", "Pedido", "corpo")
+        refused = enqueue_email("cliente@recusa.test", "Pedido", "corpo")
+
+        before = timezone.now()
+        with self.assertLogs("artelie.mail", "WARNING"):
+            self.assertEqual(deliver_batch(claim_batch(10), max_attempts=3), (1, 1, 0))
+        refused.refresh_from_db()
+        self.assertEqual(refused.status, OutgoingEmail.PENDING)
+        self.assertEqual(refused.attempts, 1)
+        self.assertIn("SMTPRecipientsRefused", refused.last_error)
+        self.assertGreaterEqual(refused.next_attempt_at, before + timedelta(seconds=60))
+
+        # ainda não venceu: nada a enviar
+        self.assertEqual(claim_batch(10), [])
+
+        OutgoingEmail.objects.filter(pk=refused.pk).update(next_attempt_at=timezone.now())
+        with self.assertLogs("artelie.mail", "WARNING"):
+            self.assertEqual(deliver_batch(claim_batch(10), max_attempts=3), (0, 1, 0))
+        refused.refresh_from_db()
+        # segundo atraso dobra
+        self.assertGreaterEqual(refused.next_attempt_at - timezone.now(), timedelta(seconds=110))
+
+        OutgoingEmail.objects.filter(pk=refused.pk).update(next_attempt_at=timezone.now())
+        with self.assertLogs("artelie.mail", "WARNING"):
+            self.assertEqual(deliver_batch(claim_batch(10), max_attempts=3), (0, 0, 1))
+        refused.refresh_from_db()
+        self.assertEqual(refused.status, OutgoingEmail.FAILED)
+        ok.refresh_from_db()
+        self.assertEqual(ok.attempts, 1)
+
+    @override_settings(EMAIL_BACKEND="tests.test_email_outbox.DownBackend")
+    def test_unreachable_server_requeues_the_whole_batch(self):
+        for index in range(3):
+            enqueue_email(f"cliente{index}@artelie.test", "Pedido", "corpo")
+        with self.assertLogs("artelie.mail", "WARNING") as logs:
+            self.assertIn("3 reagendado(s)", self.drain())
+        self.assertEqual(len(logs.records), 3)
+        self.assertFalse(OutgoingEmail.objects.exclude(status=OutgoingEmail.PENDING).exists())
+        self.assertTrue(all("smtp fora do ar" in email.last_error for email in OutgoingEmail.objects.all()))
+
+    def test_expired_claims_are_picked_up_again(self):
+        email = enqueue_email("cliente@artelie.test", "Pedido", "corpo")
+        self.assertEqual(len(claim_batch(10)), 1)
+        # worker morreu: o lease segura o email até expirar
+        self.assertEqual(claim_batch(10), [])
+        OutgoingEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(len(claim_batch(10)), 1)
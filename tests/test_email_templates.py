@@ -0,0 +1,84 @@
+from unittest import mock
+
+from django.template.base import Parser
+
+from artelie.mail_templates import get_email_template, render_email, render_email_batch, resolve_locale
+from artelie.models import Order, OutgoingEmail
+from tests.base import ArtelieAPITestCase
+
+
+class EmailTemplateTests(ArtelieAPITestCase):
+    def test_renders_subject_text_and_html(self):
+        user = self.create_user("maria")
+        email = render_email("verification", {
+            "user": user, "verification_url": "https://artelie.test/v/abc", "expires_hours": 24,
+        })
+        self.assertEqual(email.subject, "Confirme seu email - Artelie")
+        self.assertIn("Bem-vindo à Artelie, maria!", email.text)
+        self.assertIn("https://artelie.test/v/abc", email.text)
+        self.assertIn('href="https://artelie.test/v/abc"', email.html)
+
+    def test_html_is_escaped_and_text_is_not(self):
+        user = self.create_user("joao")
+        user.username = "<b>joao</b> & cia"
+        email = render_email("password_changed", {"user": user, "changed_at": None})
+        self.assertIn("&lt;b&gt;joao&lt;/b&gt; &amp; cia", email.html)
+        self.assertIn("<b>joao</b> & cia", email.text)
+
+    def test_locale_resolution_and_fallback(self):
+        self.assertEqual(resolve_locale("en-US"), "en")
+        self.assertEqual(resolve_locale("pt_BR"), "pt-br")
+        self.assertEqual(resolve_locale("de"), "pt-br")
+        user = self.create_user("ana")
+        email = render_email("verification", {"user": user, "verification_url": "x", "expires_hours": 24}, "en-GB")
+        self.assertEqual(email.subject, "Confirm your email - Artelie")
+        self.assertIn("Welcome to Artelie, ana!", email.text)
+
+    def test_templates_are_compiled_once(self):
+        get_email_template("order_status")
+        user = self.create_user("lote")
+        contexts = [{"user": user, "order": {"pk": index}, "status": "Enviado"} for index in range(50)]
+        with mock.patch.object(Parser, "parse", autospec=True, side_effect=Parser.parse) as parse:
+            rendered = render_email_batch("order_status", contexts)
+        parse.assert_not_called()
+        self.assertEqual(len(rendered), 50)
+        self.assertEqual(rendered[7].subject, "Pedido #7: Enviado - Artelie")
+
+    def test_order_status_change_queues_notification(self):
+        user = self.create_user("comprador")
+        order = Order.objects.create(user=user)
+        self.assertFalse(OutgoingEmail.objects.exists())
+
+        order.status = "ENVIADO"
+        order.save()
+        order.save()
+        queued = OutgoingEmail.objects.get()
+        self.assertEqual(queued.to, user.email)
+        self.assertEqual(queued.subject, f"Pedido #{order.pk}: Enviado - Artelie")
+
+    def test_status_change_on_sparse_instance_queues_notification(self):
+        user = self.create_user("parcial")
+        order = Order.objects.create(user=user)
+
+        # carregar sem o status não custa queries; salvar sem mudá-lo não avisa
+        with self.assertNumQueries(1):
+            sparse = Order.objects.only("id").get(pk=order.pk)
+        sparse.save(update_fields=["updated_at"])
+        self.assertFalse(OutgoingEmail.objects.exists())
+
+        sparse.status = "ENVIADO"
+        sparse.save(update_fields=["status"])
+        self.assertEqual(OutgoingEmail.objects.count(), 1)
+
+    def test_password_change_queues_notification(self):
+        user = self.create_user("senha")
+        self.client.force_authenticate(user)
+        response = self.client.post(f"/api/users/{user.pk}/change-password/", {
+            "old_password": "SenhaForte#2025",
+            "new_password": "OutraSenha#2026",
+            "new_password_confirm": "OutraSenha#2026",
+        }, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+        queued = OutgoingEmail.objects.get()
+        self.assertEqual(queued.subject, "Sua senha foi alterada - Artelie")
+        self.assertIn("senha", queued.body_text)
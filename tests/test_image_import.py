@@ -0,0 +1,155 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import IntegrityError
+from PIL import Image as PILImage
+
+from artelie.models import Product
+from uploader.models import Blob, Image
+from tests.base import ArtelieAPITestCase
+
+
+def image_bytes(color, fmt="PNG"):
+    buffer = io.BytesIO()
+    PILImage.new("RGB", (32, 32), color).save(buffer, fmt)
+    return buffer.getvalue()
+
+
+class ImageImportTests(ArtelieAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = cls.create_catalog(3)
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp(prefix="artelie-import-")
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.files = {
+            "vermelho.png": image_bytes((255, 0, 0)),
+            # mesmo conteúdo com outro nome
+            "copia.png": image_bytes((255, 0, 0)),
+            "azul.jpg": image_bytes((0, 0, 255), "JPEG"),
+            "quebrado.png": b"\x89PNG\r\n\x1a\n" + b"\0" * 100,
+        }
+        self.images = os.path.join(self.directory, "imagens")
+        os.mkdir(self.images)
+        for name, content in self.files.items():
+            with open(os.path.join(self.images, name), "wb") as file:
+                file.write(content)
+
+    def write_manifest(self, rows, name="manifesto.csv"):
+        path = os.path.join(self.directory, name)
+        with open(path, "w", encoding="utf-8") as manifest:
+            if name.endswith(".json"):
+                json.dump(rows, manifest)
+            else:
+                manifest.write("file,product,description\n")
+                manifest.writelines(f"{row['file']},{row['product']},{row.get('description', '')}\n" for row in rows)
+        return path
+
+    def run_import(self, *args, **options):
+        out, err = StringIO(), StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("import_images", *args, stdout=out, stderr=err, **options)
+        return out.getvalue(), err.getvalue()
+
+    def test_imports_deduplicates_and_links_products(self):
+        first, second, third = self.products
+        manifest = self.write_manifest([
+            {"file": "vermelho.png", "product": first.pk, "description": "Tinta vermelha"},
+            {"file": "copia.png", "product": second.pk},
+            {"file": "quebrado.png", "product": third.pk},
+            {"file": "azul.jpg", "product": 9999},
+        ])
+        images_before = Image.objects.count()
+
+        out, err = self.run_import(self.images, manifest, workers=1)
+
+        self.assertEqual(Image.objects.count(), images_before + 1)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.image_id, second.image_id)
+        self.assertEqual(first.image.description, "Tinta vermelha")
+        self.assertTrue(first.image.file.name.endswith(".png"))
+        with first.image.file.open("rb") as file:
+            self.assertEqual(file.read(), self.files["vermelho.png"])
+        self.assertIn("1 duplicado(s), 0 já no storage, 1 imagem(ns) criada(s), 2 produto(s) ligado(s), 2 erro(s)", out)
+        self.assertIn("quebrado.png", err)
+        self.assertIn("produto 9999 não existe", err)
+
+    def test_zip_archive_with_json_manifest_in_process_pool(self):
+        archive = os.path.join(self.directory, "imagens.zip")
+        with zipfile.ZipFile(archive, "w") as zipped:
+            for name, content in self.files.items():
+                zipped.writestr(f"lote/{name}", content)
+        manifest = self.write_manifest([
+            {"file": "lote/vermelho.png", "product": self.products[0].pk},
+            {"file": "lote/azul.jpg", "product": self.products[1].pk},
+        ], name="manifesto.json")
+
+        out, err = self.run_import(archive, manifest, workers=2)
+
+        self.assertEqual(err, "")
+        images = Product.objects.filter(pk__in=[p.pk for p in self.products[:2]]).values_list("image__file", flat=True)
+        self.assertEqual(sorted(name.rsplit(".", 1)[1] for name in images), ["jpg", "png"])
+        self.assertIn("validação: 2/2 (100%)", out)
+
+    def test_content_already_stored_is_not_written_again(self):
+        manifest = self.write_manifest([{"file": "vermelho.png", "product": self.products[0].pk}])
+        self.run_import(self.images, manifest, workers=1)
+        blob = Blob.objects.get()
+
+        manifest = self.write_manifest([{"file": "copia.png", "product": self.products[1].pk}])
+        out, _ = self.run_import(self.images, manifest, workers=1)
+
+        self.assertIn("1 já no storage", out)
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 2)
+        self.products[1].refresh_from_db()
+        self.assertEqual(self.products[1].image.blob, blob)
+
+    def test_failed_import_keeps_files_other_blobs_use(self):
+        manifest = self.write_manifest([
+            {"file": "vermelho.png", "product": self.products[0].pk},
+            {"file": "azul.jpg", "product": self.products[1].pk},
+        ])
+
+        def concurrent_upload(by_digest, stored, new_blobs, *args):
+            # um upload do mesmo conteúdo venceu com o mesmo nome (storage que
+            # nomeia pelo conteúdo): o arquivo passou a ser dele
+            winner = new_blobs[0]
+            Blob.objects.create(digest=winner.digest, file=winner.file.name, content_type="image/png", size=1)
+            raise IntegrityError("UNIQUE constraint failed: uploader_blob.digest")
+
+        with mock.patch("artelie.image_import.save_images", side_effect=concurrent_upload) as save_images:
+            with self.assertRaises(IntegrityError):
+                self.run_import(self.images, manifest, workers=1)
+        kept, removed = save_images.call_args.args[2]
+        self.assertTrue(kept.file.storage.exists(kept.file.name))
+        self.assertFalse(removed.file.storage.exists(removed.file.name))
+
+    def test_dry_run_writes_nothing(self):
+        manifest = self.write_manifest([{"file": "vermelho.png", "product": self.products[0].pk}])
+        image_id = self.products[0].image_id
+        out, _ = self.run_import(self.images, manifest, dry_run=True, workers=1)
+        self.assertIn("Validação concluída", out)
+        self.products[0].refresh_from_db()
+        self.assertEqual(self.products[0].image_id, image_id)
+
+    def test_manifest_cannot_escape_the_source_directory(self):
+        manifest = self.write_manifest([{"file": "../manifesto.csv", "product": self.products[0].pk}])
+        _, err = self.run_import(self.images, manifest, workers=1)
+        self.assertIn("arquivo inválido", err)
+
+    def test_invalid_manifest_aborts(self):
+        manifest = self.write_manifest([{"file": "vermelho.png", "product": "abc"}])
+        with self.assertRaises(CommandError):
+            self.run_import(self.images, manifest, workers=1)
@@ -0,0 +1,107 @@
+import io
+from io import StringIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from PIL import Image as PILImage
+
+from uploader.models import Image, ImageVariant
+from uploader.variants import generate_variants
+from tests.base import ArtelieAPITestCase
+
+
+def image_bytes(fmt="JPEG", size=(1600, 900), mode="RGB"):
+    buffer = io.BytesIO()
+    PILImage.new(mode, size, (200, 80, 40, 128)[:len(mode)]).save(buffer, fmt)
+    return buffer.getvalue()
+
+
+@override_settings(IMAGE_VARIANT_FORMATS=["jpeg", "webp"])
+class ImageVariantTests(ArtelieAPITestCase):
+    def upload(self, content, name="foto.jpg"):
+        upload = SimpleUploadedFile(name, content, content_type="image/jpeg")
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/media/images/", {"file": upload, "description": "foto"}, format="multipart")
+        self.assertEqual(response.status_code, 201, response.data)
+        return Image.objects.get(attachment_key=response.data["attachment_key"])
+
+    def test_upload_generates_every_size_and_format(self):
+        image = self.upload(image_bytes())
+
+        variants = {(v.name, v.format): v for v in ImageVariant.objects.filter(image=image)}
+        self.assertEqual(len(variants), 6)
+        self.assertEqual(variants["thumbnail", "webp"].width, 160)
+        self.assertEqual((variants["card", "jpeg"].width, variants["card", "jpeg"].height), (480, 270))
+        self.assertEqual(variants["detail", "jpeg"].width, 1200)
+        with variants["card", "webp"].file.open("rb") as file, PILImage.open(file) as decoded:
+            self.assertEqual(decoded.format, "WEBP")
+        self.assertIsNotNone(image.variants_generated_at)
+        self.assertEqual([width for width, _ in image.variant_files["jpeg"]], [160, 480, 1200])
+
+    def test_small_images_are_never_upscaled(self):
+        image = self.upload(image_bytes("PNG", size=(300, 200), mode="RGBA"), name="foto.png")
+        widths = set(ImageVariant.objects.filter(image=image).values_list("width", flat=True))
+        self.assertEqual(widths, {160, 300})
+        # detail e card têm a mesma largura: uma única entrada no srcset
+        self.assertEqual([width for width, _ in image.variant_files["webp"]], [160, 300])
+
+    def test_product_serializer_exposes_srcset(self):
+        image = self.upload(image_bytes())
+        product = self.create_catalog(1)[0]
+        product.image = image
+        product.save()
+
+        response = self.client.get(f"/api/products/{product.pk}/")
+        srcset = response.data["image"]["srcset"]
+        self.assertEqual(set(srcset), {"jpeg", "webp"})
+        # variant files are named by content; earlier tests may have left the same names taken
+        self.assertRegex(srcset["webp"], r"^\S+/thumbnail\S*\.webp 160w, \S+/card\S*\.webp 480w, \S+/detail\S*\.webp 1200w$")
+
+    def test_catalog_etags_change_when_variants_are_generated(self):
+        image = self.upload(image_bytes())
+        # variants still pending: generated after the upload commits
+        ImageVariant.objects.filter(image=image).delete()
+        Image.objects.filter(pk=image.pk).update(variants_generated_at=None, variant_files={})
+        product = self.create_catalog(1)[0]
+        product.image = image
+        product.save()
+        product.brand.image = image
+        product.brand.save()
+
+        urls = [
+            f"/api/products/{product.pk}/",
+            f"/api/brands/{product.brand_id}/",
+            f"/api/category/{product.category_id}/?products=1",
+        ]
+        etags = {url: self.client.get(url)["ETag"] for url in urls}
+        with self.captureOnCommitCallbacks(execute=True):
+            generate_variants(image.pk)
+
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response["ETag"], etags[url])
+        response = self.client.get(urls[0], HTTP_IF_MODIFIED_SINCE=self.client.get(urls[0])["Last-Modified"])
+        self.assertEqual(response.status_code, 304)
+        self.assertIn("webp", self.client.get(urls[0]).data["image"]["srcset"])
+
+    def test_regeneration_replaces_previous_variants(self):
+        image = self.upload(image_bytes())
+        old = ImageVariant.objects.get(image=image, name="card", format="jpeg").file
+        with self.captureOnCommitCallbacks(execute=True):
+            generate_variants(image.pk)
+        new = ImageVariant.objects.get(image=image, name="card", format="jpeg").file
+        self.assertEqual(ImageVariant.objects.filter(image=image).count(), 6)
+        self.assertNotEqual(new.name, old.name)
+        self.assertFalse(old.storage.exists(old.name))
+
+    def test_backfill_command(self):
+        image = self.upload(image_bytes())
+        Image.objects.filter(pk=image.pk).update(variants_generated_at=None, variant_files={})
+        out = StringIO()
+        call_command("generate_image_variants", stdout=out)
+        image.refresh_from_db()
+        self.assertIn("jpeg", image.variant_files)
+        self.assertIn("1 image(s)", out.getvalue())
@@ -0,0 +1,99 @@
+import time
+from unittest import mock
+
+from django.core.checks import run_checks
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tests.base import ArtelieAPITestCase
+
+
+class CachedJWTAuthenticationTests(ArtelieAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user("cliente")
+
+    def setUp(self):
+        super().setUp()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+
+    def me(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get("/api/users/me/")
+        user_selects = [
+            q["sql"] for q in context.captured_queries
+            if q["sql"].startswith("SELECT") and 'FROM "artelie_user"' in q["sql"]
+        ]
+        return response, user_selects
+
+    def test_second_request_skips_user_query(self):
+        response, selects = self.me()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(selects), 1)
+
+        response, selects = self.me()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(selects, [])
+        self.assertEqual(response.data["email"], self.user.email)
+        self.assertEqual(response.data["username"], self.user.username)
+
+    def test_save_invalidates_snapshot(self):
+        self.me()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.full_name = "Nome Novo"
+            self.user.save()
+
+        response, selects = self.me()
+        self.assertEqual(len(selects), 1)
+        self.assertEqual(response.data["full_name"], "Nome Novo")
+
+    def test_invalidation_ignores_worker_clocks(self):
+        # o worker que gravou o snapshot está 10 minutos adiantado
+        with mock.patch("artelie.authentication.time") as skewed:
+            skewed.time.return_value = time.time() + 600
+            self.me()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+
+        response, _ = self.me()
+        self.assertEqual(response.status_code, 401)
+
+    def test_deactivated_user_is_rejected(self):
+        self.me()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f"/api/users/{self.user.pk}/deactivate-account/")
+        self.assertEqual(response.status_code, 200)
+
+        response, _ = self.me()
+        self.assertEqual(response.status_code, 401)
+
+    def test_password_change_invalidates_snapshot(self):
+        self.me()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f"/api/users/{self.user.pk}/change-password/",
+                {
+                    "old_password": "SenhaForte#2025",
+                    "new_password": "OutraSenha#2026",
+                    "new_password_confirm": "OutraSenha#2026",
+                },
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200, response.data)
+
+        _, selects = self.me()
+        self.assertEqual(len(selects), 1)
+
+    @override_settings(CACHE_SHARED=False)
+    def test_snapshot_needs_a_shared_cache(self):
+        # memória local por worker: a invalidação não alcançaria os outros
+        self.me()
+        _, selects = self.me()
+        self.assertEqual(len(selects), 1)
+
+    @override_settings(CACHE_SHARED=False, DEBUG=False)
+    def test_unshared_cache_raises_a_warning(self):
+        self.assertIn("artelie.W001", [message.id for message in run_checks()])
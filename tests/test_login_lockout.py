@@ -0,0 +1,119 @@
+import threading
+import time
+from unittest import mock
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.test import APIRequestFactory
+
+from artelie.lockout import CacheCounterStore, client_ip, counter_key, login_lockout
+from artelie.models import LoginFailure
+from tests.base import ArtelieAPITestCase
+
+
+@override_settings(LOGIN_LOCKOUT_ACCOUNT_LIMIT=3, LOGIN_LOCKOUT_IP_LIMIT=5, LOGIN_LOCKOUT_WINDOW=900)
+class LoginLockoutTests(ArtelieAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user("cliente")
+
+    def login(self, password, email=None, ip="10.0.0.1", **headers):
+        return self.client.post(
+            "/api/token/",
+            {"email": email or self.user.email, "password": password},
+            format="json",
+            REMOTE_ADDR=ip,
+            **headers,
+        )
+
+    def test_account_is_locked_after_limit_and_without_user_writes(self):
+        with CaptureQueriesContext(connection) as context:
+            for _ in range(3):
+                self.assertEqual(self.login("errada").status_code, 401)
+        writes = [q["sql"] for q in context.captured_queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(writes, [])
+
+        response = self.login("SenhaForte#2025")
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response["Retry-After"]), 0)
+        self.assertTrue(self.user.is_account_locked())
+
+    def test_successful_login_resets_the_account_counter(self):
+        for _ in range(2):
+            self.login("errada")
+        self.assertEqual(self.login("SenhaForte#2025").status_code, 200)
+        for _ in range(2):
+            self.login("errada")
+        self.assertFalse(self.user.is_account_locked())
+
+    def test_ip_is_locked_across_accounts(self):
+        for index in range(5):
+            self.login("errada", email=f"alvo{index}@artelie.test")
+        self.assertEqual(self.login("SenhaForte#2025").status_code, 429)
+        # outro IP continua entrando
+        self.assertEqual(self.login("SenhaForte#2025", ip="10.0.0.2").status_code, 200)
+
+    def test_forwarded_for_does_not_open_new_ip_buckets(self):
+        # sem proxy confiável o X-Forwarded-For é do cliente e não conta
+        for index in range(5):
+            self.login("errada", email=f"alvo{index}@artelie.test", HTTP_X_FORWARDED_FOR=f"203.0.113.{index}")
+        response = self.login("SenhaForte#2025", HTTP_X_FORWARDED_FOR="203.0.113.99")
+        self.assertEqual(response.status_code, 429)
+
+    def test_client_ip_behind_trusted_proxies(self):
+        request = APIRequestFactory().get(
+            "/", REMOTE_ADDR="10.0.0.9", HTTP_X_FORWARDED_FOR="1.1.1.1, 198.51.100.7, 10.0.0.8"
+        )
+        self.assertEqual(client_ip(request), "10.0.0.9")
+        with override_settings(NUM_PROXIES=1):
+            self.assertEqual(client_ip(request), "10.0.0.8")
+        with override_settings(NUM_PROXIES=2):
+            self.assertEqual(client_ip(request), "198.51.100.7")
+        with override_settings(NUM_PROXIES=5):
+            self.assertEqual(client_ip(request), "1.1.1.1")
+
+    @override_settings(CACHE_SHARED=False)
+    def test_unshared_cache_counts_in_the_database(self):
+        # memória por worker multiplicaria o limite pelo número de workers
+        for _ in range(3):
+            self.login("errada")
+        self.assertEqual(LoginFailure.objects.filter(key=counter_key("account", self.user.email)).count(), 3)
+        self.assertEqual(self.login("SenhaForte#2025").status_code, 429)
+
+    def test_window_slides(self):
+        start = 1_000_000.0
+        for offset in (0, 300, 600):
+            login_lockout.register_failure(email=self.user.email, now=start + offset)
+        self.assertTrue(login_lockout.is_account_locked(self.user.email, now=start + 601))
+        # a primeira falha saiu da janela: 2 de 3
+        self.assertFalse(login_lockout.is_account_locked(self.user.email, now=start + 960))
+        self.assertLessEqual(login_lockout.retry_after(self.user.email, now=start + 601), 900)
+
+    def test_database_fallback_when_cache_fails(self):
+        broken = mock.patch.multiple(
+            CacheCounterStore,
+            hit=mock.Mock(side_effect=ConnectionError("redis fora do ar")),
+            events=mock.Mock(side_effect=ConnectionError("redis fora do ar")),
+        )
+        with broken, self.assertLogs("artelie.lockout", "WARNING"):
+            for _ in range(3):
+                self.login("errada")
+            self.assertEqual(self.login("SenhaForte#2025").status_code, 429)
+        self.assertEqual(LoginFailure.objects.filter(key=counter_key("account", self.user.email)).count(), 3)
+
+    def test_concurrent_failures_are_all_counted(self):
+        email = "concorrente@artelie.test"
+
+        def fail():
+            for _ in range(25):
+                login_lockout.register_failure(email=email)
+
+        threads = [threading.Thread(target=fail) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        events = CacheCounterStore(900).events(counter_key("account", email), time.time())
+        self.assertEqual(sum(count for _, count in events), 200)
@@ -0,0 +1,53 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from artelie.models import Order, OrderItem
+from tests.base import ArtelieAPITestCase
+
+
+class OrderTotalTests(ArtelieAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = cls.create_staff()
+        cls.first, cls.second = cls.create_catalog(2)  # 19.90 e 20.90
+        cls.order = Order.objects.create(user=cls.staff)
+        OrderItem.objects.create(order=cls.order, product=cls.first, quantity=2)
+        OrderItem.objects.create(order=cls.order, product=cls.second, quantity=1)
+        cls.empty_order = Order.objects.create(user=cls.staff)
+
+    def test_items_snapshot_the_product_price(self):
+        self.first.price = Decimal("99.00")
+        self.first.save()
+        self.assertEqual(Order.objects.get(pk=self.order.pk).total_amount, Decimal("60.70"))
+
+    def test_items_without_snapshot_use_current_price(self):
+        OrderItem.objects.filter(product=self.second).update(unit_price=None)
+        self.assertEqual(Order.objects.with_total().get(pk=self.order.pk).total_amount, Decimal("60.70"))
+
+    def test_annotation_matches_property(self):
+        totals = {order.pk: order.total_amount for order in Order.objects.with_total()}
+        self.assertEqual(totals, {self.order.pk: Decimal("60.70"), self.empty_order.pk: Decimal("0.00")})
+        self.assertEqual(Order.objects.get(pk=self.empty_order.pk).total_amount, Decimal("0.00"))
+
+    def test_api_exposes_total_without_extra_queries(self):
+        self.client.force_authenticate(self.staff)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get("/api/orders/")
+        totals = {order["id"]: order["total_amount"] for order in response.data["results"]}
+        self.assertEqual(totals[self.order.pk], "60.70")
+        self.assertEqual(len(context.captured_queries), 2)
+
+    def test_admin_changelist_runs_fixed_number_of_queries(self):
+        for _ in range(5):
+            order = Order.objects.create(user=self.staff)
+            OrderItem.objects.create(order=order, product=self.first, quantity=1)
+        admin = self.create_user("admin_root", is_staff=True, is_superuser=True)
+        self.client.force_login(admin)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get("/admin/artelie/order/")
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "60,70")
+        item_queries = [query for query in context.captured_queries if "artelie_orderitem" in query["sql"]]
+        self.assertEqual(len(item_queries), 1)
@@ -0,0 +1,62 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from artelie.models import Order, Product
+from tests.base import ArtelieAPITestCase
+
+
+class KeysetPaginationTests(ArtelieAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_catalog(5)
+        # nomes repetidos: o id desempata a ordem
+        first = Product.objects.first()
+        for _ in range(2):
+            first.pk = None
+            first.save()
+        cls.staff = cls.create_staff()
+        cls.orders = [Order.objects.create(user=cls.staff) for _ in range(3)]
+
+    def walk(self, url, params):
+        seen, pages = [], 0
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("count", response.data)
+            seen.extend(item["id"] for item in response.data["results"])
+            pages += 1
+            if not response.data["next"]:
+                return seen, pages
+            response = self.client.get(response.data["next"])
+
+    def test_products_are_walked_in_name_id_order(self):
+        seen, pages = self.walk("/api/products/", {"pagination": "cursor", "page_size": 2})
+        expected = list(Product.objects.order_by("name", "id").values_list("id", flat=True))
+        self.assertEqual(seen, expected)
+        self.assertEqual(pages, 4)
+
+    def test_orders_are_walked_newest_first(self):
+        self.client.force_authenticate(self.staff)
+        seen, _ = self.walk("/api/orders/", {"pagination": "cursor", "page_size": 1})
+        self.assertEqual(seen, [order.id for order in reversed(self.orders)])
+
+    def test_cursor_pages_skip_count_query(self):
+        first_page = self.client.get("/api/products/", {"pagination": "cursor", "page_size": 2})
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(first_page.data["next"])
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertNotIn("COUNT(", context.captured_queries[0]["sql"].upper())
+
+    def test_sparse_fields_still_produce_cursor(self):
+        response = self.client.get("/api/products/", {"pagination": "cursor", "page_size": 2, "fields": "id"})
+        self.assertIsNotNone(response.data["next"])
+        self.assertEqual(len(self.client.get(response.data["next"]).data["results"]), 2)
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get("/api/products/", {"cursor": "não-é-um-cursor"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_page_number_pagination_is_still_the_default(self):
+        response = self.client.get("/api/products/", {"page_size": 2})
+        self.assertEqual(response.data["count"], 7)
+        self.assertIn("previous", response.data)
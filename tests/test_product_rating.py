@@ -0,0 +1,69 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+
+from artelie.models import Product, Review
+from tests.base import ArtelieAPITestCase
+
+
+class ProductRatingTests(ArtelieAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.product, cls.other = cls.create_catalog(2)
+        cls.customers = [cls.create_user(f"cliente{index}") for index in range(3)]
+
+    def review(self, customer, rating, product=None):
+        self.client.force_authenticate(customer)
+        response = self.client.post(
+            "/api/reviews/", {"product": (product or self.product).pk, "rating": rating}, format="json"
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        return response.data["id"]
+
+    def assertRating(self, product, avg, count, histogram):
+        product.refresh_from_db()
+        self.assertEqual(product.rating_avg, Decimal(avg))
+        self.assertEqual(product.rating_count, count)
+        self.assertEqual([getattr(product, f"rating_{stars}_count") for stars in range(1, 6)], histogram)
+
+    def test_review_writes_keep_aggregates_in_sync(self):
+        first = self.review(self.customers[0], 5)
+        self.review(self.customers[1], 4)
+        self.review(self.customers[2], 4)
+        self.assertRating(self.product, "4.33", 3, [0, 0, 0, 2, 1])
+
+        self.client.force_authenticate(self.customers[0])
+        self.client.patch(f"/api/reviews/{first}/", {"rating": 1}, format="json")
+        self.assertRating(self.product, "3.00", 3, [1, 0, 0, 2, 0])
+
+        self.client.delete(f"/api/reviews/{first}/")
+        self.assertRating(self.product, "4.00", 2, [0, 0, 0, 2, 0])
+
+    def test_moving_a_review_updates_both_products(self):
+        review_id = self.review(self.customers[0], 3)
+        self.client.patch(f"/api/reviews/{review_id}/", {"product": self.other.pk}, format="json")
+        self.assertRating(self.product, "0", 0, [0, 0, 0, 0, 0])
+        self.assertRating(self.other, "3.00", 1, [0, 0, 1, 0, 0])
+
+    def test_rating_must_be_between_one_and_five(self):
+        self.client.force_authenticate(self.customers[0])
+        response = self.client.post("/api/reviews/", {"product": self.product.pk, "rating": 6}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_catalog_can_sort_and_filter_by_rating(self):
+        self.review(self.customers[0], 2)
+        self.review(self.customers[1], 5, product=self.other)
+        response = self.client.get("/api/products/", {"ordering": "-rating_avg", "rating_avg__gte": 2})
+        self.assertEqual([item["id"] for item in response.data["results"]], [self.other.pk, self.product.pk])
+
+    def test_recompute_command_repairs_drift(self):
+        for customer, rating in zip(self.customers, [5, 3, 1]):
+            Review.objects.create(product=self.product, user=customer, rating=rating)
+        Product.objects.update(rating_avg=0, rating_count=0, rating_5_count=0)
+
+        out = StringIO()
+        call_command("recompute_product_ratings", batch_size=1, stdout=out)
+        self.assertIn("1 produto(s) atualizado(s)", out.getvalue())
+        self.assertRating(self.product, "3.00", 3, [1, 0, 1, 0, 1])
+        self.assertRating(self.other, "0", 0, [0, 0, 0, 0, 0])
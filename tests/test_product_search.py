@@ -0,0 +1,35 @@
+from django.test import SimpleTestCase
+
+from artelie.filters import build_prefix_tsquery
+from tests.base import ArtelieAPITestCase
+
+
+class BuildPrefixTsqueryTests(SimpleTestCase):
+    def test_last_term_matches_prefix(self):
+        self.assertEqual(build_prefix_tsquery(["pincel", "chat"]), "pincel & chat:*")
+
+    def test_operators_and_punctuation_are_dropped(self):
+        self.assertEqual(build_prefix_tsquery(["tinta&|!", "(acrílica):*"]), "tinta & acrílica:*")
+
+    def test_empty_terms(self):
+        self.assertEqual(build_prefix_tsquery(["&", " "]), "")
+
+
+class ProductSearchFallbackTests(ArtelieAPITestCase):
+    """No SQLite a busca continua sendo o ILIKE do SearchFilter."""
+
+    @classmethod
+    def setUpTestData(cls):
+        products = cls.create_catalog(2, prefix="tinta")
+        products[1].description = "Pincel de cerda macia."
+        products[1].save()
+
+    def test_search_matches_name_and_description(self):
+        by_name = self.client.get("/api/products/", {"search": "tinta 001"}).data["results"]
+        self.assertEqual([product["name"] for product in by_name], ["tinta 001"])
+        by_description = self.client.get("/api/products/", {"search": "cerda"}).data["results"]
+        self.assertEqual([product["name"] for product in by_description], ["tinta 001"])
+
+    def test_search_vector_is_not_exposed(self):
+        response = self.client.get("/api/products/")
+        self.assertNotIn("search_vector", response.data["results"][0])
@@ -0,0 +1,103 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from artelie.models import Address, Cart, CartItem, Order, OrderItem, Review, Supplier
+from config.urls import router
+from uploader.models import Document
+from uploader.router import router as uploader_router
+from tests.base import ArtelieAPITestCase
+
+# Orçamento máximo de queries por endpoint e ação. Todo endpoint registrado
+# nos routers precisa declarar o seu; a paginação conta como uma query no list.
+QUERY_BUDGETS = {
+    "brand": {"list": 2, "retrieve": 1},
+    "category": {"list": 2, "retrieve": 1},
+    "user": {"list": 2, "retrieve": 1},
+    "address": {"list": 2, "retrieve": 1},
+    "supplier": {"list": 2, "retrieve": 1},
+    "product": {"list": 2, "retrieve": 1},
+    "order": {"list": 2, "retrieve": 1},
+    "cart": {"list": 3, "retrieve": 2},
+    "cartitem": {"list": 2, "retrieve": 1},
+    "review": {"list": 2, "retrieve": 1},
+    "image": {"list": 2},
+    "document": {"list": 2},
+    # sem list: uma sessão de upload só é acessada pelo id que a criou
+    "document-upload-session": {},
+}
+
+ENDPOINTS = [("/api/", entry) for entry in router.registry] + [
+    ("/api/media/", entry) for entry in uploader_router.registry
+]
+
+
+class QueryBudgetTests(ArtelieAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = cls.create_staff()
+        products = cls.create_catalog(6)
+        customers = [cls.create_user(f"cliente{index}") for index in range(4)]
+        for index, customer in enumerate(customers):
+            order = Order.objects.create(user=customer)
+            OrderItem.objects.create(order=order, product=products[index], quantity=2)
+            Review.objects.create(product=products[index], user=customer, rating=5)
+            Supplier.objects.create(
+                name=f"Fornecedor {index}",
+                contact_email=f"fornecedor{index}@artelie.test",
+                address=Address.objects.create(street="Rua A", city="Joinville", state="SC", zip_code="89200"),
+            )
+        cart = Cart.objects.create(user=cls.staff)
+        for product in products:
+            CartItem.objects.create(cart=cart, product=product, quantity=1)
+        Document.objects.create(file="documents/catalogo.pdf", description="catálogo")
+
+    def setUp(self):
+        self.client.force_authenticate(self.staff)
+
+    def get_counting_queries(self, url, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, f"{url}: {response.content[:300]}")
+        return response, len(context.captured_queries)
+
+    def test_every_endpoint_declares_a_budget(self):
+        missing = sorted(basename for _, (_, _, basename) in ENDPOINTS if basename not in QUERY_BUDGETS)
+        self.assertEqual(missing, [], "Declare o orçamento de queries em QUERY_BUDGETS")
+
+    def test_endpoints_stay_within_query_budget(self):
+        for base_url, (prefix, _, basename) in ENDPOINTS:
+            budget = QUERY_BUDGETS.get(basename, {})
+            if "list" not in budget:
+                continue
+            list_url = f"{base_url}{prefix}/"
+            with self.subTest(endpoint=basename, action="list"):
+                response, queries = self.get_counting_queries(list_url)
+                self.assertLessEqual(queries, budget["list"])
+                results = response.data["results"]
+                self.assertTrue(results, f"sem dados para {basename}")
+            if "retrieve" not in budget:
+                continue
+            with self.subTest(endpoint=basename, action="retrieve"):
+                _, queries = self.get_counting_queries(f"{list_url}{results[0]['id']}/")
+                self.assertLessEqual(queries, budget["retrieve"])
+
+    def test_list_queries_do_not_grow_with_page_size(self):
+        for base_url, (prefix, _, basename) in ENDPOINTS:
+            if "list" not in QUERY_BUDGETS.get(basename, {}):
+                continue
+            url = f"{base_url}{prefix}/"
+            with self.subTest(endpoint=basename):
+                _, small_page = self.get_counting_queries(url, page_size=1)
+                _, large_page = self.get_counting_queries(url, page_size=50)
+                self.assertEqual(small_page, large_page)
+
+    def test_sparse_fieldsets_stay_within_query_budget(self):
+        # um .only() não pode virar uma query por linha (ex.: campos lidos no __init__)
+        for base_url, (prefix, _, basename) in ENDPOINTS:
+            budget = QUERY_BUDGETS.get(basename, {})
+            if "list" not in budget:
+                continue
+            with self.subTest(endpoint=basename):
+                response, queries = self.get_counting_queries(f"{base_url}{prefix}/", fields="id")
+                self.assertTrue(response.data["results"], f"sem dados para {basename}")
+                self.assertLessEqual(queries, budget["list"])
@@ -0,0 +1,49 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.base import ArtelieAPITestCase
+
+
+class SparseFieldsetsTests(ArtelieAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = cls.create_catalog(3)
+
+    def get_with_queries(self, url, params=None):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200)
+        return response, [query["sql"] for query in context.captured_queries]
+
+    def test_compact_product_listing(self):
+        response, queries = self.get_with_queries("/api/products/", {"compact": "true"})
+        first = response.data["results"][0]
+        self.assertEqual(set(first), {"id", "name", "price", "image_url", "rating_avg", "rating_count"})
+        self.assertTrue(first["image_url"].endswith(".png"))
+        self.assertNotIn('"artelie_product"."description"', queries[-1])
+
+    def test_fields_parameter_keeps_only_requested_fields(self):
+        response, queries = self.get_with_queries("/api/products/", {"fields": "id,name"})
+        self.assertEqual(set(response.data["results"][0]), {"id", "name"})
+        self.assertNotIn('"artelie_product"."description"', queries[-1])
+        # a imagem não foi pedida: nada de JOIN com uploader_image
+        self.assertNotIn("uploader_image", queries[-1])
+
+    def test_omit_parameter_removes_fields(self):
+        response, _ = self.get_with_queries(f"/api/products/{self.products[0].pk}/", {"omit": "description,stock"})
+        self.assertNotIn("description", response.data)
+        self.assertNotIn("stock", response.data)
+        self.assertIn("attachment_key", response.data["image"])
+
+    def test_nested_serializers_are_not_affected(self):
+        response, _ = self.get_with_queries("/api/category/", {"fields": "name,products", "products": 2})
+        category = response.data["results"][0]
+        self.assertEqual(set(category), {"name", "products"})
+        self.assertEqual(set(category["products"][0]), {"id", "name", "price", "image_url", "rating_avg", "rating_count"})
+
+    def test_writes_ignore_sparse_parameters(self):
+        product = self.products[0]
+        response = self.client.patch(f"/api/products/{product.pk}/?fields=id", {"stock": 3}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["stock"], 3)
+        self.assertIn("name", response.data)
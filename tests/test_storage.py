@@ -0,0 +1,134 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from django.core.files.base import ContentFile, File
+from django.core.files.storage import FileSystemStorage
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from uploader.local_storage import LocalStorage
+from uploader.views import serve_media
+from tests.storage_conformance import StorageConformanceMixin
+
+
+class TemporaryRootMixin:
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix="artelie-storage-")
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        super().setUp()
+
+
+class FileSystemStorageConformanceTests(TemporaryRootMixin, StorageConformanceMixin, SimpleTestCase):
+    """Referência: o FileSystemStorage do Django passa na mesma suíte."""
+
+    def make_storage(self):
+        return FileSystemStorage(location=self.root, base_url="/media/")
+
+
+class LocalStorageConformanceTests(TemporaryRootMixin, StorageConformanceMixin, SimpleTestCase):
+    def make_storage(self):
+        return LocalStorage(location=self.root, base_url="/media/")
+
+
+@unittest.skipUnless(
+    os.getenv("CLOUDINARY_URL") and os.getenv("STORAGE_CONFORMANCE_REMOTE"),
+    "defina CLOUDINARY_URL e STORAGE_CONFORMANCE_REMOTE=1 para rodar contra o Cloudinary",
+)
+class CloudinaryStorageConformanceTests(StorageConformanceMixin, SimpleTestCase):
+    def make_storage(self):
+        from uploader.storage import ChunkedCloudinaryStorage
+
+        return ChunkedCloudinaryStorage()
+
+
+class SlowContent(File):
+    """Conteúdo em blocos que registra o diretório de destino a cada bloco."""
+
+    def __init__(self, directory, chunks):
+        super().__init__(None, name="lento.bin")
+        self.directory = directory
+        self.parts = chunks
+        self.seen = []
+        self.size = sum(len(chunk) for chunk in chunks)
+
+    def chunks(self, chunk_size=None):
+        for chunk in self.parts:
+            self.seen.append(sorted(os.listdir(self.directory)) if os.path.isdir(self.directory) else [])
+            yield chunk
+
+
+class LocalStorageTests(TemporaryRootMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.storage = LocalStorage(location=self.root, base_url="/media/")
+
+    def test_names_are_sharded_once(self):
+        name = self.storage.save("images/abc.jpg", ContentFile(b"x"))
+        directory, basename = name.rsplit("/", 1)
+        self.assertEqual(basename, "abc.jpg")
+        self.assertRegex(directory, r"^images/[0-9a-f]{2}/[0-9a-f]{2}$")
+        self.assertEqual(self.storage.shard(name), name)
+
+        # colisões ficam no mesmo diretório
+        again = self.storage.save("images/abc.jpg", ContentFile(b"y"))
+        self.assertEqual(again.rsplit("/", 1)[0], directory)
+        self.assertNotEqual(again, name)
+
+    def test_partial_writes_are_never_visible(self):
+        directory = os.path.join(self.root, self.storage.shard("docs/lento.bin").rsplit("/", 1)[0])
+        content = SlowContent(directory, [b"a" * 1000, b"b" * 1000, b"c" * 1000])
+
+        name = self.storage.save("docs/lento.bin", content)
+
+        # durante a escrita só existe o arquivo temporário
+        for listing in content.seen[1:]:
+            self.assertEqual(len(listing), 1)
+            self.assertTrue(listing[0].startswith(".tmp-"))
+        self.assertEqual(os.listdir(directory), ["lento.bin"])
+        self.assertEqual(self.storage.size(name), 3000)
+
+    @override_settings(FILE_UPLOAD_PERMISSIONS=0o640)
+    def test_file_permissions_are_applied(self):
+        storage = LocalStorage(location=self.root)
+        name = storage.save("images/perm.jpg", ContentFile(b"x"))
+        self.assertEqual(os.stat(storage.path(name)).st_mode & 0o777, 0o640)
+
+
+class ServeMediaTests(TemporaryRootMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.settings_override = override_settings(
+            STORAGES={"default": {"BACKEND": "uploader.local_storage.LocalStorage"}},
+            MEDIA_ROOT=self.root,
+        )
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        self.name = LocalStorage().save("images/foto.png", ContentFile(b"\x89PNG dados"))
+        self.factory = RequestFactory()
+
+    def get(self, name, **headers):
+        return serve_media(self.factory.get(f"/media/{name}", **headers), name)
+
+    def test_streams_the_file(self):
+        response = self.get(self.name)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertEqual(b"".join(response.streaming_content), b"\x89PNG dados")
+        response.close()
+
+        not_modified = self.get(self.name, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        self.assertEqual(not_modified.status_code, 304)
+
+    @override_settings(MEDIA_SENDFILE_HEADER="X-Accel-Redirect", MEDIA_SENDFILE_PREFIX="/protected-media/")
+    def test_hands_off_to_the_web_server(self):
+        response = self.get(self.name)
+        self.assertEqual(response["X-Accel-Redirect"], f"/protected-media/{self.name}")
+        self.assertEqual(response.content, b"")
+
+    def test_rejects_paths_outside_the_root_and_temporary_files(self):
+        from django.http import Http404
+
+        for name in ("../segredo.txt", "images", "images/.tmp-abc", "images/nada.png"):
+            with self.assertRaises(Http404):
+                self.get(name)
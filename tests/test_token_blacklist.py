@@ -0,0 +1,101 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from artelie.tokens import BloomFilter, RefreshToken, blacklist_front, outstanding_tokens
+from tests.base import ArtelieAPITestCase
+
+
+@override_settings(OUTSTANDING_TOKEN_BATCH_SIZE=1000, OUTSTANDING_TOKEN_FLUSH_INTERVAL=3600)
+class RefreshTokenBlacklistTests(ArtelieAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user("cliente")
+
+    def refresh(self, raw):
+        self.client.cookies["refresh_token"] = raw
+        return self.client.post("/api/token/refresh/")
+
+    def issue(self):
+        return str(RefreshToken.for_user(self.user))
+
+    def test_rotation_rejects_reused_token(self):
+        raw = self.issue()
+        response = self.refresh(raw)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.cookies["refresh_token"].value, raw)
+
+        response = self.refresh(raw)
+        self.assertEqual(response.status_code, 401)
+
+    def test_unique_claim_rejects_replay_unknown_to_the_front(self):
+        raw = self.issue()
+        self.assertEqual(self.refresh(raw).status_code, 200)
+        # outro processo: a frente em memória nunca viu esse jti
+        blacklist_front.clear()
+        self.assertEqual(self.refresh(raw).status_code, 401)
+
+    def test_refresh_skips_blacklist_lookup_and_user_reloads(self):
+        raw = self.issue()
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(self.refresh(raw).status_code, 200)
+        selects = [q["sql"] for q in context.captured_queries if q["sql"].startswith("SELECT")]
+        self.assertFalse([sql for sql in selects if "token_blacklist_blacklistedtoken" in sql])
+        self.assertEqual(len([sql for sql in selects if 'FROM "artelie_user"' in sql]), 1)
+
+    def test_outstanding_tokens_are_written_in_one_batch(self):
+        for _ in range(5):
+            self.issue()
+        self.assertEqual(OutstandingToken.objects.count(), 0)
+
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(outstanding_tokens.flush(), 5)
+        inserts = [q for q in context.captured_queries if q["sql"].startswith("INSERT")]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(OutstandingToken.objects.filter(user=self.user).count(), 5)
+
+    def test_blacklist_creates_outstanding_row_not_yet_flushed(self):
+        token = RefreshToken.for_user(self.user)
+        token.blacklist()
+        self.assertTrue(BlacklistedToken.objects.filter(token__jti=token["jti"]).exists())
+        # o lote depois ignora a linha já criada
+        self.assertEqual(outstanding_tokens.flush(), 1)
+        self.assertEqual(OutstandingToken.objects.filter(jti=token["jti"]).count(), 1)
+
+    def test_logout_blacklists_token(self):
+        raw = self.issue()
+        self.client.cookies["refresh_token"] = raw
+        self.assertEqual(self.client.post("/api/token/logout/").status_code, 204)
+        self.assertEqual(self.refresh(raw).status_code, 401)
+
+    def test_prune_tokens_deletes_expired_in_batches(self):
+        now = timezone.now()
+        tokens = OutstandingToken.objects.bulk_create([
+            OutstandingToken(jti=f"jti-{index}", token="x", user=self.user,
+                             expires_at=now + timedelta(days=-1 if index < 7 else 1))
+            for index in range(10)
+        ])
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(token=token) for token in tokens[:3]])
+
+        out = StringIO()
+        call_command("prune_tokens", "--batch-size", "2", stdout=out)
+
+        self.assertIn("7", out.getvalue())
+        self.assertEqual(OutstandingToken.objects.count(), 3)
+        self.assertEqual(BlacklistedToken.objects.count(), 0)
+
+
+class BloomFilterTests(ArtelieAPITestCase):
+    def test_no_false_negatives_and_few_false_positives(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for index in range(1000):
+            bloom.add(f"presente-{index}")
+        self.assertTrue(all(f"presente-{index}" in bloom for index in range(1000)))
+        false_positives = sum(f"ausente-{index}" in bloom for index in range(10000))
+        self.assertLess(false_positives, 300)
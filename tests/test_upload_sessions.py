@@ -0,0 +1,144 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from uploader.models import Blob, Document, UploadSession
+from uploader.sessions import session_directory
+from tests.base import ArtelieAPITestCase
+
+SESSION_DIR = tempfile.mkdtemp(prefix="artelie-sessions-")
+PDF = b"%PDF-1.4\n" + bytes(range(256)) * 80 + b"\n%%EOF\n"
+
+
+@override_settings(UPLOAD_SESSION_DIR=SESSION_DIR, UPLOAD_SESSION_CHUNK_SIZE=8192)
+class UploadSessionTests(ArtelieAPITestCase):
+    url = "/api/media/documents/uploads/"
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(SESSION_DIR, ignore_errors=True)
+
+    def start(self, size=len(PDF)):
+        response = self.client.post(self.url, {"filename": "catalogo.pdf", "size": size, "description": "Catálogo"},
+                                    format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data["offset"], 0)
+        return response.data["id"]
+
+    def put_chunk(self, session_id, offset, data):
+        return self.client.generic("PUT", f"{self.url}{session_id}/chunk/", data,
+                                   content_type="application/octet-stream", HTTP_UPLOAD_OFFSET=str(offset))
+
+    def send(self, session_id, content=PDF, chunk_size=4096):
+        for offset in range(0, len(content), chunk_size):
+            response = self.put_chunk(session_id, offset, content[offset:offset + chunk_size])
+            self.assertEqual(response.status_code, 200, response.data)
+        return response
+
+    def finalize(self, session_id):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(f"{self.url}{session_id}/finalize/")
+
+    def test_chunks_are_assembled_into_a_document(self):
+        session_id = self.start()
+        response = self.send(session_id)
+        self.assertEqual(response.data["offset"], len(PDF))
+        self.assertEqual(response["Upload-Offset"], str(len(PDF)))
+
+        response = self.finalize(session_id)
+        self.assertEqual(response.status_code, 201, response.data)
+        document = Document.objects.get(attachment_key=response.data["attachment_key"])
+        self.assertEqual(document.description, "Catálogo")
+        self.assertTrue(document.file.name.endswith(".pdf"))
+        with document.file.open("rb") as file:
+            self.assertEqual(file.read(), PDF)
+        self.assertEqual(document.blob.digest, hashlib.sha256(PDF).hexdigest())
+        self.assertFalse(os.path.exists(session_directory(session_id)))
+
+        # repetir o finalize devolve o mesmo documento
+        again = self.finalize(session_id)
+        self.assertEqual(again.data["attachment_key"], response.data["attachment_key"])
+        self.assertEqual(Blob.objects.get().ref_count, 1)
+
+    def test_resume_from_the_server_offset(self):
+        session_id = self.start()
+        self.put_chunk(session_id, 0, PDF[:4096])
+
+        # conexão caiu: o cliente pergunta onde parou
+        self.assertEqual(self.client.get(f"{self.url}{session_id}/").data["offset"], 4096)
+        response = self.put_chunk(session_id, 0, PDF[:4096])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data["offset"], 4096)
+        self.assertEqual(UploadSession.objects.get(pk=session_id).received, 4096)
+
+    def test_upload_continues_after_a_rejected_chunk(self):
+        session_id = self.start()
+        self.put_chunk(session_id, 0, PDF[:4096])
+        response = self.put_chunk(session_id, 4096, PDF[4096:])
+        self.assertEqual(response.status_code, 413)
+        for offset in range(4096, len(PDF), 8192):
+            self.assertEqual(self.put_chunk(session_id, offset, PDF[offset:offset + 8192]).status_code, 200)
+        self.assertEqual(self.finalize(session_id).status_code, 201)
+
+    def test_first_chunk_must_be_a_pdf(self):
+        session_id = self.start()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.put_chunk(session_id, 0, b"GIF89a" + b"\0" * 4000)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["error"], "Invalid or corrupted document.")
+        self.assertFalse(UploadSession.objects.filter(pk=session_id).exists())
+        self.assertFalse(os.path.exists(session_directory(session_id)))
+
+    def test_chunks_cannot_pass_the_declared_size(self):
+        session_id = self.start(size=100)
+        response = self.put_chunk(session_id, 0, PDF[:200])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["offset"], 0)
+
+    def test_incomplete_upload_cannot_be_finalized(self):
+        session_id = self.start()
+        self.put_chunk(session_id, 0, PDF[:4096])
+        response = self.finalize(session_id)
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(Document.objects.exists())
+
+    @override_settings(UPLOAD_SESSION_MAX_SIZE=1000)
+    def test_declared_size_is_limited(self):
+        response = self.client.post(self.url, {"filename": "a.pdf", "size": 1001}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("size", response.data)
+
+    def test_abort(self):
+        session_id = self.start()
+        self.put_chunk(session_id, 0, PDF[:4096])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.delete(f"{self.url}{session_id}/").status_code, 204)
+        self.assertFalse(os.path.exists(session_directory(session_id)))
+
+    def test_abandoned_sessions_are_purged(self):
+        stale = self.start()
+        self.put_chunk(stale, 0, PDF[:4096])
+        active = self.start()
+        self.put_chunk(active, 0, PDF[:4096])
+        UploadSession.objects.filter(pk=stale).update(updated_at=timezone.now() - timedelta(days=2))
+        orphan = os.path.join(SESSION_DIR, "sem-sessao")
+        os.makedirs(orphan)
+        old = (timezone.now() - timedelta(days=2)).timestamp()
+        os.utime(orphan, (old, old))
+
+        out = StringIO()
+        call_command("purge_upload_sessions", stdout=out)
+
+        self.assertEqual(str(UploadSession.objects.get().pk), str(active))
+        self.assertFalse(os.path.exists(session_directory(stale)))
+        self.assertTrue(os.path.exists(session_directory(active)))
+        self.assertFalse(os.path.exists(orphan))
+        self.assertIn("Upload sessions removed: 1 (orphaned chunk directories: 1)", out.getvalue())
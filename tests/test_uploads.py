@@ -0,0 +1,75 @@
+import io
+
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
+from django.test import override_settings
+from PIL import Image as PILImage
+
+from uploader.handlers import TemporaryFileUploadHandler
+from uploader.helpers.files import SNIFF_BYTES, get_content_type
+from uploader.models import Document, Image
+from tests.base import ArtelieAPITestCase
+
+
+def image_bytes(fmt="PNG", size=(64, 64)):
+    buffer = io.BytesIO()
+    PILImage.new("RGB", size, (200, 80, 40)).save(buffer, fmt)
+    return buffer.getvalue()
+
+
+class CountingBytesIO(io.BytesIO):
+    bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+class UploadPipelineTests(ArtelieAPITestCase):
+    def upload_image(self, content, name="foto.png", content_type="image/png"):
+        upload = SimpleUploadedFile(name, content, content_type=content_type)
+        return self.client.post("/api/media/images/", {"file": upload, "description": "foto"}, format="multipart")
+
+    def test_extension_comes_from_sniffed_type_not_client(self):
+        response = self.upload_image(image_bytes("JPEG"), name="foto.png", content_type="image/png")
+        self.assertEqual(response.status_code, 201, response.data)
+        image = Image.objects.get(attachment_key=response.data["attachment_key"])
+        self.assertTrue(image.file.name.endswith(".jpg"))
+
+    def test_client_content_type_is_not_trusted(self):
+        response = self.upload_image(image_bytes("GIF"), name="foto.png", content_type="image/png")
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=1024)
+    def test_large_upload_spills_to_disk(self):
+        response = self.upload_image(image_bytes("PNG", size=(256, 256)))
+        self.assertEqual(response.status_code, 201, response.data)
+        image = Image.objects.get(attachment_key=response.data["attachment_key"])
+        self.assertTrue(image.file.name.endswith(".png"))
+
+    def test_document_upload_sniffs_pdf(self):
+        pdf = b"%PDF-1.4\n" + b"0" * 50_000 + b"\n%%EOF\n"
+        upload = SimpleUploadedFile("catalogo.bin", pdf, content_type="application/octet-stream")
+        response = self.client.post("/api/media/documents/", {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, 201, response.data)
+        document = Document.objects.get(attachment_key=response.data["attachment_key"])
+        self.assertTrue(document.file.name.endswith(".pdf"))
+
+    def test_sniffing_reads_only_a_bounded_prefix(self):
+        file = CountingBytesIO(image_bytes("PNG") + b"\0" * 1_000_000)
+        self.assertEqual(get_content_type(file), "image/png")
+        self.assertLessEqual(file.bytes_read, SNIFF_BYTES)
+        self.assertEqual(file.tell(), 0)
+
+    def test_handler_captures_header_while_streaming(self):
+        content = image_bytes("PNG", size=(256, 256))
+        handler = TemporaryFileUploadHandler()
+        handler.new_file("file", "foto.png", "image/png", len(content))
+        for start in range(0, len(content), 1000):
+            handler.receive_data_chunk(content[start:start + 1000], start)
+        file = handler.file_complete(len(content))
+
+        self.assertIsInstance(file, TemporaryUploadedFile)
+        self.assertEqual(file.content_header, content[:SNIFF_BYTES])
+        self.assertEqual(get_content_type(file), "image/png")
+        file.close()
@@ -0,0 +1,86 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from artelie.models import User, UserStatsSnapshot
+from artelie.stats import count_users, signup_buckets
+from tests.base import ArtelieAPITestCase
+
+
+class UserStatsTests(ArtelieAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = cls.create_staff()
+        cls.customer = cls.create_user("cliente", is_verified=True)
+        cls.inactive = cls.create_user("inativo", is_active=False)
+        # cadastrados há 3 e há 10 dias
+        now = timezone.now()
+        User.objects.filter(pk=cls.customer.pk).update(created_at=now - timedelta(days=3))
+        User.objects.filter(pk=cls.inactive.pk).update(created_at=now - timedelta(days=10))
+
+    def stats_queries(self, path="/api/users/stats/"):
+        self.client.force_authenticate(self.staff)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        scans = [q["sql"] for q in context.captured_queries if 'FROM "artelie_user"' in q["sql"]]
+        return response, scans
+
+    def test_counts_come_from_a_single_query(self):
+        with self.assertNumQueries(1):
+            stats = count_users()
+        self.assertEqual(stats, {
+            "total_users": 3,
+            "active_users": 2,
+            "verified_users": 1,
+            "staff_users": 1,
+            "users_today": 1,
+        })
+
+    def test_signup_buckets_are_zero_filled(self):
+        daily = signup_buckets("day", 7)
+        self.assertEqual(len(daily), 7)
+        self.assertEqual(daily[-1], {"date": timezone.localdate().isoformat(), "count": 1})
+        self.assertEqual(sum(bucket["count"] for bucket in daily), 2)
+
+        weekly = signup_buckets("week", 4)
+        self.assertEqual(len(weekly), 4)
+        self.assertEqual(sum(bucket["count"] for bucket in weekly), 3)
+        monday = timezone.localdate() - timedelta(days=timezone.localdate().weekday())
+        self.assertEqual(weekly[-1]["date"], monday.isoformat())
+
+    def test_endpoint_reads_snapshot_without_scanning_users(self):
+        response, scans = self.stats_queries()
+        self.assertEqual(response.data["total_users"], 3)
+        self.assertEqual(len(response.data["signups"]["daily"]), 30)
+        self.assertEqual(len(response.data["signups"]["weekly"]), 12)
+        self.assertEqual(len(scans), 3)
+
+        self.create_user("novo")
+        response, scans = self.stats_queries()
+        self.assertEqual(scans, [])
+        self.assertEqual(response.data["total_users"], 3)
+
+        response, scans = self.stats_queries("/api/users/stats/?fresh=true")
+        self.assertEqual(response.data["total_users"], 4)
+
+    def test_stale_snapshot_is_recomputed(self):
+        self.stats_queries()
+        UserStatsSnapshot.objects.update(computed_at=timezone.now() - timedelta(hours=1))
+        self.create_user("novo")
+        response, _ = self.stats_queries()
+        self.assertEqual(response.data["total_users"], 4)
+
+    def test_stats_require_staff(self):
+        self.client.force_authenticate(self.customer)
+        self.assertEqual(self.client.get("/api/users/stats/").status_code, 403)
+
+    def test_refresh_command(self):
+        out = StringIO()
+        call_command("refresh_user_stats", stdout=out)
+        self.assertEqual(UserStatsSnapshot.objects.get().total_users, 3)
+        self.assertIn("3 usuário(s)", out.getvalue())
@@ -0,0 +1,68 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from artelie.models import EmailVerificationToken
+from artelie.models.verification_token import hash_token
+from tests.base import ArtelieAPITestCase
+
+
+class VerificationTokenTests(ArtelieAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user("pendente", is_active=False)
+
+    def test_only_the_hash_is_stored(self):
+        token = EmailVerificationToken.issue(self.user)
+        stored = EmailVerificationToken.objects.get(user=self.user)
+        self.assertNotEqual(stored.token_hash, token)
+        self.assertEqual(stored.token_hash, hash_token(token))
+
+    def test_lookup_uses_the_unique_hash_index(self):
+        token = EmailVerificationToken.issue(self.user)
+        with CaptureQueriesContext(connection) as context:
+            EmailVerificationToken.lookup(token)
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertIn('"token_hash" =', context.captured_queries[0]["sql"])
+        self.assertNotIn(token, context.captured_queries[0]["sql"])
+
+    def test_verification_activates_and_consumes_the_token(self):
+        token = EmailVerificationToken.issue(self.user)
+        response = self.client.get(f"/api/verify-email/{token}/")
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.is_active)
+        self.assertTrue(self.user.is_verified)
+        self.assertFalse(EmailVerificationToken.objects.exists())
+        self.assertEqual(self.client.get(f"/api/verify-email/{token}/").status_code, 404)
+
+    def test_new_token_invalidates_previous_ones(self):
+        first = EmailVerificationToken.issue(self.user)
+        second = EmailVerificationToken.issue(self.user)
+        self.assertEqual(self.client.get(f"/api/verify-email/{first}/").status_code, 404)
+        self.assertEqual(self.client.get(f"/api/verify-email/{second}/").status_code, 200)
+
+    def test_expired_token_is_rejected(self):
+        token = EmailVerificationToken.issue(self.user, lifetime=timedelta(seconds=-1))
+        response = self.client.get(f"/api/verify-email/{token}/")
+        self.assertEqual(response.status_code, 400)
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+
+    def test_purge_removes_only_expired_tokens_in_batches(self):
+        others = [self.create_user(f"outro{index}", is_active=False) for index in range(5)]
+        for user in others:
+            EmailVerificationToken.issue(user, lifetime=timedelta(hours=-1))
+        valid = EmailVerificationToken.issue(self.user)
+
+        out = StringIO()
+        call_command("purge_verification_tokens", batch_size=2, stdout=out)
+        self.assertIn("removidos: 5", out.getvalue())
+        self.assertEqual(
+            list(EmailVerificationToken.objects.values_list("token_hash", flat=True)), [hash_token(valid)]
+        )
+        self.assertTrue(EmailVerificationToken.objects.get().expires_at > timezone.now())
@@ -1,6 +1,8 @@
 from django.contrib import admin
 
-from uploader.models import Document, Image
+from uploader.models import Blob, Document, Image, ImageVariant
 
 admin.site.register(Image)
+admin.site.register(ImageVariant)
 admin.site.register(Document)
+admin.site.register(Blob)
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class MediaConfig(AppConfig):
     name = "uploader"
+
+    def ready(self):
+        from uploader import signals  # noqa: F401
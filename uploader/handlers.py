@@ -0,0 +1,43 @@
+import hashlib
+
+from django.core.files.uploadhandler import (
+    MemoryFileUploadHandler as BaseMemoryFileUploadHandler,
+    TemporaryFileUploadHandler as BaseTemporaryFileUploadHandler,
+)
+
+from uploader.helpers.files import SNIFF_BYTES
+
+
+class HeaderCaptureMixin:
+    """
+    Keeps the first SNIFF_BYTES of each upload on `file.content_header` and
+    its SHA-256 on `file.content_digest` as the chunks stream through, so
+    the content type and the blob digest never need the file read back.
+    """
+
+    def new_file(self, *args, **kwargs):
+        self.content_header = b""
+        self.content_hasher = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        missing = SNIFF_BYTES - len(self.content_header)
+        if missing > 0:
+            self.content_header += raw_data[:missing]
+        self.content_hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        if file is not None:
+            file.content_header = self.content_header
+            file.content_digest = self.content_hasher.hexdigest()
+        return file
+
+
+class MemoryFileUploadHandler(HeaderCaptureMixin, BaseMemoryFileUploadHandler):
+    """Requests up to FILE_UPLOAD_MAX_MEMORY_SIZE stay in memory."""
+
+
+class TemporaryFileUploadHandler(HeaderCaptureMixin, BaseTemporaryFileUploadHandler):
+    """Larger requests are written to a temporary file chunk by chunk."""
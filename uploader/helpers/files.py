@@ -1,3 +1,6 @@
+import hashlib
+import mimetypes
+
 import magic
 
 CONTENT_TYPE_ICO = "image/x-icon"
@@ -6,14 +9,50 @@ CONTENT_TYPE_PNG = "image/png"
 
 CONTENT_TYPE_PDF = "application/pdf"
 
+# libmagic only needs the leading bytes to identify images and PDFs
+SNIFF_BYTES = 2048
+DIGEST_CHUNK_SIZE = 64 * 1024
+
+
+def read_header(file, size=SNIFF_BYTES):
+    """First `size` bytes of the file, without loading the rest of it."""
+    header = getattr(file, "content_header", None)
+    if header is not None:
+        # captured by uploader.handlers while the upload was streamed in
+        return header[:size]
+
+    file.seek(0)
+    header = file.read(size)
+    file.seek(0)
+    return header
+
 
 def get_content_type(file):
-    if hasattr(file, "temporary_file_path"):
-        content_type = magic.from_file(file.temporary_file_path(), mime=True)
-    else:
-        content_type = magic.from_buffer(file.read(), mime=True)
+    """MIME type sniffed from the file header; cached on the file object."""
+    content_type = getattr(file, "sniffed_content_type", None)
+    if content_type is None:
+        content_type = magic.from_buffer(read_header(file), mime=True)
+        file.sniffed_content_type = content_type
+    return content_type
+
 
-    if hasattr(file, "seek") and callable(file.seek):
+def get_content_digest(file):
+    """SHA-256 (hex) of the whole file; cached on the file object."""
+    digest = getattr(file, "content_digest", None)
+    if digest is None:
+        # computed by uploader.handlers while the upload was streamed in;
+        # otherwise read back in chunks, never whole
+        hasher = hashlib.sha256()
+        file.seek(0)
+        for chunk in iter(lambda: file.read(DIGEST_CHUNK_SIZE), b""):
+            hasher.update(chunk)
         file.seek(0)
+        digest = file.content_digest = hasher.hexdigest()
+    return digest
 
-    return content_type
+
+def guess_extension(content_type):
+    extension = mimetypes.guess_extension(content_type)
+    if extension == ".jpe":
+        extension = ".jpg"
+    return extension or ""
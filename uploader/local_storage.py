@@ -0,0 +1,124 @@
+"""
+Local filesystem media storage (MEDIA_STORAGE=local).
+
+Kept apart from uploader.storage: importing cloudinary_storage requires
+Cloudinary credentials, which offline setups don't have.
+"""
+
+import errno
+import hashlib
+import os
+import posixpath
+import string
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+
+
+class LocalStorage(FileSystemStorage):
+    """
+    Filesystem storage under MEDIA_ROOT for development and load tests
+    (MEDIA_STORAGE=local), served by uploader.views.serve_media.
+
+    Files are sharded into SHARD_LEVELS subdirectories derived from a hash
+    of the file name (images/3f/a2/<name>), so no directory grows without
+    bound. Writes go to a temporary file in the destination directory and
+    are published with os.link(), which is atomic and never replaces an
+    existing file: readers see either nothing or the complete file.
+    """
+
+    SHARD_LEVELS = 2
+    SHARD_WIDTH = 2
+    # fsync before publishing, so a crash cannot leave a published empty file
+    fsync = True
+
+    def is_sharded(self, directory):
+        parts = directory.split("/")[-self.SHARD_LEVELS:]
+        return len(parts) == self.SHARD_LEVELS and all(
+            len(part) == self.SHARD_WIDTH and all(char in string.hexdigits for char in part) for part in parts
+        )
+
+    def shard(self, name):
+        """images/<name> -> images/3f/a2/<name>; names already sharded are kept."""
+        directory, basename = posixpath.split(name)
+        if self.is_sharded(directory):
+            return name
+        key = hashlib.md5(basename.encode(), usedforsecurity=False).hexdigest()
+        shards = [key[level * self.SHARD_WIDTH:(level + 1) * self.SHARD_WIDTH] for level in range(self.SHARD_LEVELS)]
+        return posixpath.join(directory, *shards, basename)
+
+    def get_available_name(self, name, max_length=None):
+        # collisions get a suffix inside the same shard directory
+        return super().get_available_name(self.shard(name), max_length)
+
+    def _save(self, name, content):
+        full_path = self.path(name)
+        directory = os.path.dirname(full_path)
+        self.make_directory(directory)
+
+        temporary_path = self.write_temporary(directory, content)
+        try:
+            while True:
+                try:
+                    os.link(temporary_path, full_path)
+                    break
+                except FileExistsError:
+                    # lost a race for the name: pick another one
+                    name = self.get_available_name(name)
+                    full_path = self.path(name)
+                    self.make_directory(os.path.dirname(full_path))
+        finally:
+            os.unlink(temporary_path)
+        return str(name).replace("\\", "/")
+
+    def make_directory(self, directory):
+        if self.directory_permissions_mode is None:
+            os.makedirs(directory, exist_ok=True)
+            return
+        # os.makedirs() doesn't apply `mode` to intermediate directories
+        old_umask = os.umask(0o777 & ~self.directory_permissions_mode)
+        try:
+            os.makedirs(directory, self.directory_permissions_mode, exist_ok=True)
+        finally:
+            os.umask(old_umask)
+
+    def write_temporary(self, directory, content):
+        """Writes the content next to its final path; returns the temporary path."""
+        fd, temporary_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            if hasattr(content, "temporary_file_path"):
+                os.close(fd)
+                # an upload spooled to disk on the same filesystem is linked, not copied
+                try:
+                    os.unlink(temporary_path)
+                    os.link(content.temporary_file_path(), temporary_path)
+                except OSError as exc:
+                    if exc.errno not in (errno.EXDEV, errno.EPERM):
+                        raise
+                    fd = os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                    self.copy_chunks(fd, content)
+            else:
+                self.copy_chunks(fd, content)
+            os.chmod(temporary_path, self.file_mode())
+        except BaseException:
+            try:
+                os.unlink(temporary_path)
+            except FileNotFoundError:
+                pass
+            raise
+        return temporary_path
+
+    def copy_chunks(self, fd, content):
+        with os.fdopen(fd, "wb") as file:
+            for chunk in content.chunks():
+                file.write(chunk.encode() if isinstance(chunk, str) else chunk)
+            if self.fsync:
+                file.flush()
+                os.fsync(file.fileno())
+
+    def file_mode(self):
+        if self.file_permissions_mode is not None:
+            return self.file_permissions_mode
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from uploader.models import Image
+from uploader.variants import generate_variants
+
+
+class Command(BaseCommand):
+    help = "Generates the responsive variants of images that do not have them yet."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Regenerate every image, not only those without variants.",
+        )
+
+    def handle(self, *args, **options):
+        images = Image.objects.order_by("pk")
+        if not options["all"]:
+            images = images.filter(variants_generated_at__isnull=True)
+
+        generated = failed = 0
+        for image_id in images.values_list("pk", flat=True).iterator():
+            try:
+                generate_variants(image_id, reuse=not options["all"])
+            except Exception as exc:  # pylint: disable=broad-except
+                failed += 1
+                self.stderr.write(f"Image {image_id}: {exc}")
+            else:
+                generated += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Variants generated for {generated} image(s), {failed} failed."))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from uploader.sessions import purge_sessions
+
+
+class Command(BaseCommand):
+    help = "Deletes resumable upload sessions idle for longer than UPLOAD_SESSION_TTL, and their chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ttl",
+            type=int,
+            default=None,
+            help="Idle time in seconds after which a session is purged (default: UPLOAD_SESSION_TTL).",
+        )
+
+    def handle(self, *args, **options):
+        sessions, directories = purge_sessions(options["ttl"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Upload sessions removed: {sessions} (orphaned chunk directories: {directories})."
+        ))
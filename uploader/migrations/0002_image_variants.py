@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:33
+
+import django.db.models.deletion
+import uploader.models.image
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('uploader', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='image',
+            name='variant_files',
+            field=models.JSONField(blank=True, default=dict, help_text='Denormalized copy of the variants table: {format: [[width, file name], ...]}. Lets serializers build srcset without querying ImageVariant.'),
+        ),
+        migrations.AddField(
+            model_name='image',
+            name='variants_generated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='ImageVariant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=20)),
+                ('format', models.CharField(max_length=10)),
+                ('width', models.PositiveIntegerField()),
+                ('height', models.PositiveIntegerField()),
+                ('file', models.FileField(upload_to=uploader.models.image.image_variant_file_path)),
+                ('size', models.PositiveIntegerField(help_text='File size in bytes.')),
+                ('image', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='variants', to='uploader.image')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('image', 'name', 'format'), name='unique_image_variant')],
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:38
+
+import django.db.models.deletion
+import uploader.models.image
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('uploader', '0002_image_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Blob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(help_text='SHA-256 of the content, hex encoded.', max_length=64, unique=True)),
+                ('file', models.FileField(max_length=255, upload_to='')),
+                ('content_type', models.CharField(max_length=100)),
+                ('size', models.PositiveBigIntegerField(help_text='File size in bytes.')),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='imagevariant',
+            name='file',
+            field=models.FileField(max_length=255, upload_to=uploader.models.image.image_variant_file_path),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='blob',
+            field=models.ForeignKey(blank=True, help_text='Shared stored content; `file` holds the same name as blob.file.', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='%(class)ss', to='uploader.blob'),
+        ),
+        migrations.AddField(
+            model_name='image',
+            name='blob',
+            field=models.ForeignKey(blank=True, help_text='Shared stored content; `file` holds the same name as blob.file.', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='%(class)ss', to='uploader.blob'),
+        ),
+    ]
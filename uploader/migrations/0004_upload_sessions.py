@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:43
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('uploader', '0003_content_addressed_blobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('filename', models.CharField(max_length=255)),
+                ('description', models.CharField(blank=True, max_length=255)),
+                ('size', models.PositiveBigIntegerField(help_text='Declared total size in bytes.')),
+                ('received', models.PositiveBigIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('document', models.OneToOneField(blank=True, help_text='Set once finalized, so repeating the finalize request is harmless.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='uploader.document')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['updated_at'], name='uploader_up_updated_05a919_idx')],
+            },
+        ),
+    ]
@@ -1,2 +1,4 @@
+from .blob import Blob
 from .document import Document
-from .image import Image
+from .image import Image, ImageVariant
+from .upload_session import UploadSession
@@ -0,0 +1,129 @@
+from django.db import IntegrityError, models, transaction
+from django.db.models import DEFERRED, F
+
+from uploader.helpers.files import get_content_digest, get_content_type
+
+
+class BlobManager(models.Manager):
+    def acquire(self, digest):
+        """Adds a reference to the blob with this digest; None if there is none."""
+        if self.filter(digest=digest).update(ref_count=F("ref_count") + 1):
+            return self.get(digest=digest)
+        return None
+
+    def claim(self, field_file):
+        """
+        Blob holding the content of an uncommitted FieldFile, with one more
+        reference. Content already stored is reused without touching the
+        storage; new content is saved under the field's upload_to name.
+        """
+        content = field_file.file
+        digest = get_content_digest(content)
+        blob = self.acquire(digest)
+        if blob is not None:
+            return blob
+
+        storage = field_file.storage
+        name = field_file.field.generate_filename(field_file.instance, field_file.name)
+        name = storage.save(name, content, max_length=field_file.field.max_length)
+        try:
+            with transaction.atomic():
+                return self.create(
+                    digest=digest,
+                    file=name,
+                    content_type=get_content_type(content),
+                    size=content.size,
+                    ref_count=1,
+                )
+        except IntegrityError:
+            # a concurrent upload stored the same content first
+            blob = self.acquire(digest)
+            if blob is None:
+                # ...and released it already: store it again
+                return self.claim(field_file)
+            # storages that name files by content (Cloudinary public_ids)
+            # gave both uploads the winner's name: only drop a distinct copy
+            if name != blob.file.name:
+                storage.delete(name)
+            return blob
+
+    def release(self, blob_id):
+        """Drops a reference; the last one deletes the row and, after commit, the file."""
+        self.filter(pk=blob_id, ref_count__gt=0).update(ref_count=F("ref_count") - 1)
+        orphan = self.filter(pk=blob_id, ref_count=0).first()
+        if orphan is None:
+            return
+        try:
+            # the ref_count filter loses against a concurrent acquire()
+            deleted, _ = self.filter(pk=blob_id, ref_count=0).delete()
+        except models.ProtectedError:
+            # a row still points here: the count drifted, keep the blob
+            return
+        if deleted:
+            transaction.on_commit(lambda: self._delete_unused_file(orphan.file))
+
+    def _delete_unused_file(self, field_file):
+        # a claim() of the same content may have run since the row was deleted
+        # and, on storages that name files by content, stored it under this name
+        if not self.filter(file=field_file.name).exists():
+            field_file.delete(save=False)
+
+
+class Blob(models.Model):
+    """
+    One stored file per distinct content. Images and documents with the
+    same bytes point at the same Blob; `ref_count` tracks how many rows do,
+    and the file is deleted when it drops to zero.
+    """
+
+    digest = models.CharField(max_length=64, unique=True, help_text="SHA-256 of the content, hex encoded.")
+    file = models.FileField(max_length=255)
+    content_type = models.CharField(max_length=100)
+    size = models.PositiveBigIntegerField(help_text="File size in bytes.")
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = BlobManager()
+
+    def __str__(self) -> str:
+        return f"{self.digest} ({self.ref_count} references)"
+
+
+class BlobFileModel(models.Model):
+    """
+    Base for models whose `file` is content addressed: saving an uploaded
+    file claims a Blob instead of writing a new copy to the storage.
+    References are released by uploader.signals when the row is deleted.
+    """
+
+    blob = models.ForeignKey(
+        Blob,
+        related_name="%(class)ss",
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        help_text="Shared stored content; `file` holds the same name as blob.file.",
+    )
+
+    class Meta:
+        abstract = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # reference to release if the file is replaced; read from __dict__ so
+        # rows loaded with .only() don't query the deferred column one by one
+        self._loaded_blob_id = self.__dict__.get("blob_id", DEFERRED)
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            if self.file and not self.file._committed:  # pylint: disable=protected-access
+                if self._loaded_blob_id is DEFERRED and self.pk is not None:
+                    self._loaded_blob_id = (
+                        type(self)._default_manager.filter(pk=self.pk).values_list("blob_id", flat=True).first()
+                    )
+                self.blob = Blob.objects.claim(self.file)
+                self.file = self.blob.file.name
+            super().save(*args, **kwargs)
+            if self._loaded_blob_id not in (None, DEFERRED) and self._loaded_blob_id != self.blob_id:
+                Blob.objects.release(self._loaded_blob_id)
+        self._loaded_blob_id = self.__dict__.get("blob_id", DEFERRED)
@@ -1,19 +1,18 @@
-import mimetypes
 import uuid
 
 from django.db import models
 
-from uploader.helpers.files import get_content_type
+from uploader.helpers.files import get_content_digest, get_content_type, guess_extension
+from uploader.models.blob import BlobFileModel
 
 
 def document_file_path(document, _) -> str:
-    content_type = get_content_type(document.file)
-    extension: str = mimetypes.guess_extension(content_type)
+    extension: str = guess_extension(get_content_type(document.file.file))
+    # content addressed: identical uploads share one file (uploader.models.blob)
+    return f"documents/{get_content_digest(document.file.file)}{extension}"
 
-    return f"documents/{document.public_id}{extension or ''}"
 
-
-class Document(models.Model):
+class Document(BlobFileModel):
     attachment_key = models.UUIDField(
         max_length=255,
         default=uuid.uuid4,
@@ -1,17 +1,19 @@
-import mimetypes
 import uuid
 
 from django.db import models
 
+from uploader.helpers.files import get_content_digest, get_content_type, guess_extension
+from uploader.models.blob import BlobFileModel
+
 
 def image_file_path(image, _) -> str:
-    extension: str = mimetypes.guess_extension(image.file.file.content_type)
-    if extension == ".jpe":
-        extension = ".jpg"
-    return f"images/{image.public_id}{extension or ''}"
+    # sniffed from the file header, never the client-supplied content type
+    extension: str = guess_extension(get_content_type(image.file.file))
+    # content addressed: identical uploads share one file (uploader.models.blob)
+    return f"images/{get_content_digest(image.file.file)}{extension}"
 
 
-class Image(models.Model):
+class Image(BlobFileModel):
     attachment_key = models.UUIDField(
         max_length=255,
         default=uuid.uuid4,
@@ -30,6 +32,19 @@ class Image(models.Model):
     file = models.ImageField(upload_to=image_file_path)
     description = models.CharField(max_length=255, blank=True)
     uploaded_on = models.DateTimeField(auto_now_add=True)
+    variant_files = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text=(
+            "Denormalized copy of the variants table: {format: [[width, file name], ...]}. "
+            "Lets serializers build srcset without querying ImageVariant."
+        ),
+    )
+    variants_generated_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text="Changes whenever the serialized image does (e.g. new variants); part of catalog ETags.",
+    )
 
     def __str__(self) -> str:
         return f"{self.description} - {self.attachment_key}"
@@ -37,3 +52,29 @@ class Image(models.Model):
     @property
     def url(self) -> str:
         return self.file.url  # pylint: disable=no-member
+
+
+def image_variant_file_path(variant, _) -> str:
+    # keyed by content, like the original, so identical images share variants
+    key = variant.image.blob.digest if variant.image.blob_id else variant.image.public_id
+    return f"images/variants/{key}/{variant.name}.{variant.format}"
+
+
+class ImageVariant(models.Model):
+    """A resized, re-encoded copy of an Image (see uploader.variants)."""
+
+    image = models.ForeignKey(Image, related_name="variants", on_delete=models.CASCADE)
+    name = models.CharField(max_length=20)
+    format = models.CharField(max_length=10)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    file = models.FileField(upload_to=image_variant_file_path, max_length=255)
+    size = models.PositiveIntegerField(help_text="File size in bytes.")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["image", "name", "format"], name="unique_image_variant"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.image.public_id} {self.name} ({self.format}, {self.width}x{self.height})"
@@ -0,0 +1,39 @@
+import uuid
+
+from django.db import models
+
+from uploader.models.document import Document
+
+
+class UploadSession(models.Model):
+    """
+    A resumable document upload (uploader.sessions). Chunks are kept on
+    disk under UPLOAD_SESSION_DIR until the session is finalized into a
+    Document; `received` is the offset the next chunk must start at.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    filename = models.CharField(max_length=255)
+    description = models.CharField(max_length=255, blank=True)
+    size = models.PositiveBigIntegerField(help_text="Declared total size in bytes.")
+    received = models.PositiveBigIntegerField(default=0)
+    document = models.OneToOneField(
+        Document,
+        related_name="+",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        help_text="Set once finalized, so repeating the finalize request is harmless.",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["updated_at"])]
+
+    def __str__(self) -> str:
+        return f"{self.filename} ({self.received}/{self.size} bytes)"
+
+    @property
+    def is_complete(self) -> bool:
+        return self.received == self.size
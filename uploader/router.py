@@ -6,4 +6,5 @@ app_name = "uploader"
 
 router = DefaultRouter()
 router.register("images", views.ImageUploadViewSet)
+router.register("documents/uploads", views.DocumentUploadSessionViewSet, basename="document-upload-session")
 router.register("documents", views.DocumentUploadViewSet)
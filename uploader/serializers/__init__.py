@@ -1,2 +1,2 @@
-from .document import DocumentSerializer, DocumentUploadSerializer
+from .document import DocumentSerializer, DocumentUploadSerializer, UploadSessionSerializer
 from .image import ImageSerializer, ImageUploadSerializer
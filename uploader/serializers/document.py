@@ -1,7 +1,10 @@
+from datetime import timedelta
+
+from django.conf import settings
 from rest_framework import serializers
 
 from uploader.helpers.files import CONTENT_TYPE_PDF, get_content_type
-from uploader.models import Document
+from uploader.models import Document, UploadSession
 
 
 class DocumentUploadSerializer(serializers.ModelSerializer):
@@ -26,3 +29,27 @@ class DocumentSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         raise NotImplementedError("Use DocumentUploadSerializer to create document files.")
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    offset = serializers.IntegerField(source="received", read_only=True)
+    chunk_size = serializers.SerializerMethodField()
+    expires_at = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UploadSession
+        fields = ["id", "filename", "description", "size", "offset", "chunk_size", "expires_at", "created_at"]
+        read_only_fields = ["id", "created_at"]
+
+    def validate_size(self, value):
+        if not 0 < value <= settings.UPLOAD_SESSION_MAX_SIZE:
+            raise serializers.ValidationError(f"Size must be between 1 and {settings.UPLOAD_SESSION_MAX_SIZE} bytes.")
+        return value
+
+    def get_chunk_size(self, obj):
+        # the largest chunk a single request may carry
+        return settings.UPLOAD_SESSION_CHUNK_SIZE
+
+    def get_expires_at(self, obj):
+        # idle sessions are purged after UPLOAD_SESSION_TTL
+        return obj.updated_at + timedelta(seconds=settings.UPLOAD_SESSION_TTL)
@@ -1,26 +1,60 @@
 from rest_framework import serializers
-from uploader.helpers.files import CONTENT_TYPE_JPG, CONTENT_TYPE_PNG
-from uploader.models import Image
+from uploader.helpers.files import CONTENT_TYPE_JPG, CONTENT_TYPE_PNG, get_content_type
+from uploader.models import Blob, Image
+from uploader.variants import srcset
+
+IMAGE_CONTENT_TYPES = [CONTENT_TYPE_JPG, CONTENT_TYPE_PNG]
+
 
 class ImageUploadSerializer(serializers.ModelSerializer):
+    # SHA-256 of content the server may already store: sent without `file`,
+    # the upload reuses the stored blob and skips the transfer entirely
+    digest = serializers.RegexField(r"^[0-9a-f]{64}$", write_only=True, required=False)
+
     class Meta:
         model = Image
-        fields = ["attachment_key", "file", "description", "uploaded_on", "url"]
+        fields = ["attachment_key", "file", "digest", "description", "uploaded_on", "url"]
         read_only_fields = ["attachment_key", "uploaded_on", "url"]
-        extra_kwargs = {"file": {"write_only": True}}
+        extra_kwargs = {"file": {"write_only": True, "required": False}}
 
     def validate_file(self, value):
-        valid_content_types = [CONTENT_TYPE_JPG, CONTENT_TYPE_PNG]
-        if value.content_type not in valid_content_types:
+        if get_content_type(value) not in IMAGE_CONTENT_TYPES:
             raise serializers.ValidationError("Invalid or corrupted image.")
         return value
 
+    def validate(self, attrs):
+        digest = attrs.pop("digest", None)
+        if "file" in attrs:
+            return attrs
+        if digest is None:
+            raise serializers.ValidationError({"file": "No file was submitted."})
+        if not Blob.objects.filter(digest=digest, content_type__in=IMAGE_CONTENT_TYPES).exists():
+            raise serializers.ValidationError({"digest": "Unknown content, upload the file instead."})
+        attrs["digest"] = digest
+        return attrs
+
+    def create(self, validated_data):
+        digest = validated_data.pop("digest", None)
+        if digest is None:
+            return super().create(validated_data)
+        blob = Blob.objects.acquire(digest)
+        if blob is None:
+            # released between validation and now
+            raise serializers.ValidationError({"digest": "Unknown content, upload the file instead."})
+        return Image.objects.create(blob=blob, file=blob.file.name, **validated_data)
+
 
 class ImageSerializer(serializers.ModelSerializer):
+    # {format: "url 160w, url 480w, ..."}; empty until the variants are generated
+    srcset = serializers.SerializerMethodField()
+
     class Meta:
         model = Image
-        fields = ["attachment_key", "url", "description", "uploaded_on"]
-        read_only_fields = ["attachment_key", "url", "uploaded_on"]
+        fields = ["attachment_key", "url", "srcset", "description", "uploaded_on"]
+        read_only_fields = ["attachment_key", "url", "srcset", "uploaded_on"]
+
+    def get_srcset(self, obj):
+        return srcset(obj)
 
     def create(self, validated_data):
         raise NotImplementedError("Use ImageUploadSerializer to create images.")
@@ -0,0 +1,198 @@
+"""
+Resumable, chunked document uploads.
+
+The protocol (uploader.views.DocumentUploadSessionViewSet):
+
+    POST   documents/uploads/                {filename, size, description} -> session at offset 0
+    GET    documents/uploads/<id>/           current offset, to resume after a dropped connection
+    PUT    documents/uploads/<id>/chunk/     raw bytes; the Upload-Offset header must equal the offset
+    POST   documents/uploads/<id>/finalize/  assembles the chunks into a Document
+    DELETE documents/uploads/<id>/           aborts the upload
+
+Each chunk is streamed to its own file under UPLOAD_SESSION_DIR and only
+counted once it is complete, so a broken request is simply sent again
+from the same offset. The first chunk is content-checked before anything
+else is accepted. Sessions idle for UPLOAD_SESSION_TTL seconds are
+removed by `manage.py purge_upload_sessions`.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from uploader.helpers.files import SNIFF_BYTES, get_content_type
+from uploader.models import Document, UploadSession
+
+COPY_BUFFER_SIZE = 1024 * 1024
+CHUNK_SUFFIX = ".chunk"
+
+
+class ChunkError(Exception):
+    """A chunk or finalize request that cannot be accepted; carries the HTTP status."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class AssembledFile(File):
+    """The concatenated chunks; storages can move or link it instead of copying."""
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def session_directory(session_id):
+    return os.path.join(settings.UPLOAD_SESSION_DIR, str(session_id))
+
+
+def write_chunk(session, offset, stream, length, validate_header):
+    """
+    Stores `length` bytes read from `stream` at `offset`; returns the new
+    offset. `validate_header` gets the first SNIFF_BYTES of the upload and
+    raises to reject it, before the rest of the first chunk is read.
+    """
+    if offset != session.received:
+        raise ChunkError(f"Expected offset {session.received}.", status=409)
+    if length <= 0:
+        raise ChunkError("Send the chunk with a Content-Length.")
+    if length > settings.UPLOAD_SESSION_CHUNK_SIZE:
+        raise ChunkError(f"Chunks are limited to {settings.UPLOAD_SESSION_CHUNK_SIZE} bytes.", status=413)
+    if offset + length > session.size:
+        raise ChunkError("Chunk goes past the declared size.")
+
+    directory = session_directory(session.pk)
+    os.makedirs(directory, exist_ok=True)
+    fd, temporary_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as chunk:
+            header = b""
+            validated = offset > 0
+            remaining = length
+            while remaining:
+                data = stream.read(min(COPY_BUFFER_SIZE, remaining))
+                if not data:
+                    raise ChunkError("Incomplete chunk, send it again from the same offset.")
+                chunk.write(data)
+                remaining -= len(data)
+                if not validated:
+                    header += data[:SNIFF_BYTES - len(header)]
+                    if len(header) >= SNIFF_BYTES or not remaining:
+                        validate_header(header)
+                        validated = True
+
+        # only one of two concurrent requests for the same offset wins
+        new_offset = offset + length
+        advanced = UploadSession.objects.filter(pk=session.pk, received=offset).update(
+            received=new_offset, updated_at=timezone.now()
+        )
+        if not advanced:
+            raise ChunkError("Another request wrote this offset.", status=409)
+        os.replace(temporary_path, os.path.join(directory, f"{offset:020d}{CHUNK_SUFFIX}"))
+    finally:
+        if os.path.exists(temporary_path):
+            os.unlink(temporary_path)
+    session.received = new_offset
+    return new_offset
+
+
+def assemble(session):
+    """
+    Concatenates the chunks, in offset order, into one file with buffered
+    streaming copies, hashing it on the way. Returns an AssembledFile that
+    Document.save() can claim a blob for without reading it again.
+    """
+    directory = session_directory(session.pk)
+    names = sorted(name for name in os.listdir(directory) if name.endswith(CHUNK_SUFFIX))
+    path = os.path.join(directory, "assembled")
+    hasher = hashlib.sha256()
+    header = b""
+    expected = 0
+    with open(path, "wb") as assembled:
+        for name in names:
+            if int(name[:-len(CHUNK_SUFFIX)]) != expected:
+                raise ChunkError(f"Missing data at offset {expected}.", status=409)
+            with open(os.path.join(directory, name), "rb") as chunk:
+                while data := chunk.read(COPY_BUFFER_SIZE):
+                    hasher.update(data)
+                    header += data[:SNIFF_BYTES - len(header)]
+                    assembled.write(data)
+                    expected += len(data)
+    if expected != session.size:
+        raise ChunkError(f"Missing data at offset {expected}.", status=409)
+
+    file = AssembledFile(open(path, "rb"), name=session.filename)  # pylint: disable=consider-using-with
+    file.size = expected
+    # what uploader.handlers records for regular uploads
+    file.content_header = header
+    file.content_digest = hasher.hexdigest()
+    get_content_type(file)
+    return file
+
+
+def finalize(session_id):
+    """Turns a complete session into a Document; repeating it returns the same Document."""
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session_id)
+        if session.document_id:
+            return session.document
+        if session.received != session.size:
+            raise ChunkError(f"Upload incomplete: {session.received} of {session.size} bytes.", status=409)
+
+        file = assemble(session)
+        try:
+            document = Document(description=session.description)
+            document.file = file
+            document.save()
+        finally:
+            file.close()
+        session.document = document
+        session.save(update_fields=["document", "updated_at"])
+    # chunks stay until commit, so a failed finalize can be retried
+    transaction.on_commit(lambda: discard_chunks(session_id))
+    return document
+
+
+def discard_chunks(session_id):
+    shutil.rmtree(session_directory(session_id), ignore_errors=True)
+
+
+def discard(session):
+    """Aborts a session: its row and everything stored for it."""
+    session_id = session.pk
+    session.delete()
+    transaction.on_commit(lambda: discard_chunks(session_id))
+
+
+def purge_sessions(ttl=None):
+    """
+    Removes sessions idle for more than `ttl` seconds (UPLOAD_SESSION_TTL)
+    and chunk directories no session owns. Returns (sessions, directories).
+    """
+    ttl = settings.UPLOAD_SESSION_TTL if ttl is None else ttl
+    cutoff = timezone.now() - timedelta(seconds=ttl)
+    expired = list(UploadSession.objects.filter(updated_at__lt=cutoff).values_list("pk", flat=True))
+    UploadSession.objects.filter(pk__in=expired).delete()
+    for session_id in expired:
+        discard_chunks(session_id)
+
+    orphans = 0
+    root = settings.UPLOAD_SESSION_DIR
+    if os.path.isdir(root):
+        live = {str(pk) for pk in UploadSession.objects.values_list("pk", flat=True)}
+        for name in os.listdir(root):
+            path = os.path.join(root, name)
+            # left by a crash between the row delete and the directory removal;
+            # young directories may belong to a session being created right now
+            if name not in live and os.path.getmtime(path) < time.time() - ttl:
+                shutil.rmtree(path, ignore_errors=True)
+                orphans += 1
+    return len(expired), orphans
@@ -0,0 +1,25 @@
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from uploader.models import Blob, Document, Image, ImageVariant
+
+
+@receiver(post_delete, sender=Document)
+@receiver(post_delete, sender=Image)
+def blob_file_deleted(sender, instance, **kwargs):
+    """Releases the row's reference to its shared content (uploader.models.blob)."""
+    if instance.blob_id:
+        Blob.objects.release(instance.blob_id)
+
+
+@receiver(post_delete, sender=ImageVariant)
+def image_variant_deleted(sender, instance, **kwargs):
+    # variants of images with the same content share files
+    name = instance.file.name
+
+    def delete_unused_file():
+        if not ImageVariant.objects.filter(file=name).exists():
+            instance.file.storage.delete(name)
+
+    transaction.on_commit(delete_unused_file)
@@ -0,0 +1,23 @@
+import os
+
+import cloudinary.uploader
+from cloudinary_storage.storage import MediaCloudinaryStorage
+from django.conf import settings
+
+
+class ChunkedCloudinaryStorage(MediaCloudinaryStorage):
+    """
+    Cloudinary storage that sends files larger than UPLOAD_CHUNK_SIZE with
+    upload_large, one chunk per request, instead of building a single
+    request body with the whole file in memory.
+    """
+
+    def _upload(self, name, content):
+        if content.size <= settings.UPLOAD_CHUNK_SIZE:
+            return super()._upload(name, content)
+
+        options = {"use_filename": True, "resource_type": self._get_resource_type(name), "tags": self.TAG}
+        folder = os.path.dirname(name)
+        if folder:
+            options["folder"] = folder
+        return cloudinary.uploader.upload_large(content, chunk_size=settings.UPLOAD_CHUNK_SIZE, **options)
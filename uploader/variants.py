@@ -0,0 +1,172 @@
+"""
+Responsive image derivatives.
+
+After an Image is uploaded, generate_variants() writes one resized copy per
+VARIANT_WIDTHS entry and per format in IMAGE_VARIANT_FORMATS, records them
+in ImageVariant and mirrors the list on Image.variant_files so serializers
+can build srcset without extra queries. The work runs on a small thread
+pool after the upload transaction commits, never on the request thread.
+"""
+
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from PIL import Image as PILImage
+from PIL import ImageOps
+
+from uploader.models import Image, ImageVariant
+
+logger = logging.getLogger(__name__)
+
+# name -> target width in pixels (never upscaled)
+VARIANT_WIDTHS = {"detail": 1200, "card": 480, "thumbnail": 160}
+
+ENCODERS = {
+    "jpeg": {"format": "JPEG", "quality": 82, "optimize": True, "progressive": True},
+    "webp": {"format": "WEBP", "quality": 80, "method": 4},
+    "avif": {"format": "AVIF", "quality": 60},
+}
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.IMAGE_VARIANT_WORKERS, thread_name_prefix="image-variants"
+        )
+    return _executor
+
+
+def schedule_variants(image):
+    """Queue variant generation for `image` once the current transaction commits."""
+    image_id = image.pk
+    if settings.IMAGE_VARIANTS_ASYNC:
+        transaction.on_commit(lambda: get_executor().submit(run_in_worker, image_id))
+    else:
+        transaction.on_commit(lambda: generate_variants(image_id))
+
+
+def run_in_worker(image_id):
+    try:
+        generate_variants(image_id)
+    except Exception:
+        logger.exception("Failed to generate variants for image %s", image_id)
+    finally:
+        # worker threads keep their own connection; don't leak it
+        close_old_connections()
+
+
+def flatten(image):
+    """RGB copy for JPEG: transparent pixels are composited on white."""
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        rgba = image.convert("RGBA")
+        background = PILImage.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def resize_all(source):
+    """
+    Yields (name, resized image), largest first. Each size is resized from
+    the previous one, so the full-size decode is only scaled down once.
+    """
+    current = source
+    for name, width in sorted(VARIANT_WIDTHS.items(), key=lambda item: -item[1]):
+        if current.width > width:
+            height = max(1, round(current.height * width / current.width))
+            current = current.resize((width, height), PILImage.Resampling.LANCZOS, reducing_gap=3.0)
+        yield name, current
+
+
+def encode(image, fmt):
+    options = dict(ENCODERS[fmt])
+    if fmt == "jpeg":
+        image = flatten(image)
+    elif image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, options.pop("format"), **options)
+    return buffer.getvalue()
+
+
+def generate_variants(image_id, reuse=True):
+    """
+    Render, store and record every variant of the image; returns the
+    ImageVariant rows. With `reuse`, an image whose content was already
+    processed for another Image copies those rows instead of re-rendering.
+    """
+    image = Image.objects.select_related("blob").get(pk=image_id)
+    processed = reuse and image.blob_id and (
+        Image.objects.filter(blob_id=image.blob_id, variants_generated_at__isnull=False)
+        .exclude(pk=image.pk)
+        .first()
+    )
+    if processed:
+        variants = [
+            ImageVariant(
+                image=image, name=variant.name, format=variant.format,
+                width=variant.width, height=variant.height, file=variant.file.name, size=variant.size,
+            )
+            for variant in processed.variants.all()
+        ]
+    else:
+        variants = render_variants(image)
+
+    with transaction.atomic():
+        # old files are removed by uploader.signals once no variant uses them
+        ImageVariant.objects.filter(image=image).delete()
+        ImageVariant.objects.bulk_create(variants)
+        image.variant_files = variant_files(variants)
+        image.variants_generated_at = timezone.now()
+        # save() (not update()) so catalog caches are invalidated
+        image.save(update_fields=["variant_files", "variants_generated_at", "updated_at"])
+    return variants
+
+
+def render_variants(image):
+    formats = settings.IMAGE_VARIANT_FORMATS
+    with image.file.open("rb") as original, PILImage.open(original) as source:
+        # JPEG can decode straight at a reduced scale
+        largest = max(VARIANT_WIDTHS.values())
+        source.draft("RGB", (largest, largest))
+        source = ImageOps.exif_transpose(source)
+        source.load()
+
+        variants = []
+        for name, resized in resize_all(source):
+            for fmt in formats:
+                data = encode(resized, fmt)
+                variant = ImageVariant(
+                    image=image, name=name, format=fmt,
+                    width=resized.width, height=resized.height, size=len(data),
+                )
+                variant.file.save(f"{name}.{fmt}", ContentFile(data), save=False)
+                variants.append(variant)
+    return variants
+
+
+def variant_files(variants):
+    files = {}
+    for variant in sorted(variants, key=lambda variant: variant.width):
+        entries = files.setdefault(variant.format, [])
+        # an image narrower than several targets yields identical copies
+        if not entries or entries[-1][0] != variant.width:
+            entries.append([variant.width, variant.file.name])
+    return files
+
+
+def srcset(image):
+    """{format: "url 160w, url 480w, ..."} from the denormalized variant list."""
+    storage = image.file.storage
+    return {
+        fmt: ", ".join(f"{storage.url(name)} {width}w" for width, name in entries)
+        for fmt, entries in (image.variant_files or {}).items()
+    }
@@ -1,7 +1,23 @@
-from rest_framework import mixins, parsers, viewsets
+import mimetypes
+import os
+import stat
+from urllib.parse import quote
 
-from uploader.models import Document, Image
-from uploader.serializers import DocumentUploadSerializer, ImageUploadSerializer
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+from django.core.files.base import ContentFile
+from rest_framework import mixins, parsers, serializers, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from uploader import sessions
+from uploader.models import Document, Image, UploadSession
+from uploader.serializers import DocumentUploadSerializer, ImageUploadSerializer, UploadSessionSerializer
+from uploader.variants import schedule_variants
 
 
 class CreateViewSet(mixins.ListModelMixin, mixins.CreateModelMixin, viewsets.GenericViewSet):
@@ -14,7 +30,110 @@ class DocumentUploadViewSet(CreateViewSet):
     parser_classes = [parsers.FormParser, parsers.MultiPartParser]
 
 
+class DocumentUploadSessionViewSet(
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    """Resumable document uploads; the protocol is described in uploader.sessions."""
+
+    queryset = UploadSession.objects.all()
+    serializer_class = UploadSessionSerializer
+    parser_classes = [parsers.JSONParser, parsers.FormParser]
+
+    def get_throttles(self):
+        # the session is what gets throttled, not each of its chunks
+        if self.action == "create":
+            return super().get_throttles()
+        return []
+
+    def perform_destroy(self, instance):
+        sessions.discard(instance)
+
+    @action(detail=True, methods=["put"], parser_classes=[])
+    def chunk(self, request, pk=None):
+        session = self.get_object()
+        if session.document_id:
+            return Response({"error": "Upload already finalized."}, status=status.HTTP_409_CONFLICT)
+        try:
+            offset = int(request.headers["Upload-Offset"])
+            length = int(request.headers.get("Content-Length") or 0)
+        except (KeyError, ValueError):
+            return Response({"error": "Upload-Offset header is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            # the body is streamed to disk, never parsed into request.data
+            received = sessions.write_chunk(session, offset, request.stream, length, self.validate_header)
+        except sessions.ChunkError as exc:
+            return Response({"error": str(exc), "offset": session.received}, status=exc.status)
+        except serializers.ValidationError as exc:
+            sessions.discard(session)
+            return Response({"error": exc.detail[0]}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"offset": received, "size": session.size}, headers={"Upload-Offset": str(received)})
+
+    @action(detail=True, methods=["post"])
+    def finalize(self, request, pk=None):
+        session = self.get_object()
+        try:
+            document = sessions.finalize(session.pk)
+        except sessions.ChunkError as exc:
+            return Response({"error": str(exc), "offset": session.received}, status=exc.status)
+        return Response(DocumentUploadSerializer(document).data, status=status.HTTP_201_CREATED)
+
+    @staticmethod
+    def validate_header(header):
+        # the same content check as a single-request upload
+        DocumentUploadSerializer().validate_file(ContentFile(header))
+
+
 class ImageUploadViewSet(CreateViewSet):
     queryset = Image.objects.all() #  pylint: disable=no-member
     serializer_class = ImageUploadSerializer
     parser_classes = [parsers.FormParser, parsers.MultiPartParser]
+
+    def perform_create(self, serializer):
+        image = serializer.save()
+        schedule_variants(image)
+
+
+def serve_media(request, name):
+    """
+    Serves a file from the local media storage (MEDIA_STORAGE=local).
+
+    With MEDIA_SENDFILE_HEADER set, the web server sends the bytes
+    (X-Accel-Redirect or X-Sendfile); otherwise a FileResponse lets the
+    WSGI server use sendfile() through wsgi.file_wrapper.
+    """
+    try:
+        path = default_storage.path(name)
+    except (SuspiciousFileOperation, NotImplementedError) as exc:
+        raise Http404 from exc
+    if os.path.basename(path).startswith(".tmp-"):
+        # a write still in progress (uploader.local_storage.LocalStorage)
+        raise Http404
+    try:
+        stat_result = os.stat(path)
+    except OSError as exc:
+        raise Http404 from exc
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise Http404
+    if not was_modified_since(request.META.get("HTTP_IF_MODIFIED_SINCE"), stat_result.st_mtime):
+        return HttpResponseNotModified()
+
+    content_type, encoding = mimetypes.guess_type(path)
+    content_type = content_type or "application/octet-stream"
+    header = settings.MEDIA_SENDFILE_HEADER
+    if header:
+        response = HttpResponse(content_type=content_type)
+        if header.lower() == "x-sendfile":
+            response[header] = path
+        else:
+            response[header] = settings.MEDIA_SENDFILE_PREFIX + quote(name)
+    else:
+        response = FileResponse(open(path, "rb"), content_type=content_type)
+        response["Content-Length"] = stat_result.st_size
+    if encoding:
+        response["Content-Encoding"] = encoding
+    response["Last-Modified"] = http_date(stat_result.st_mtime)
+    return response